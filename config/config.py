@@ -11,9 +11,105 @@ COOKIE_FILE = "config/cookies.pkl"
 # Browser Settings
 HEADLESS_MODE = False
 USER_AGENT_ROTATION = True
+# Lean mode blocks images, fonts, media and trackers and turns off unused Chrome features
+LEAN_BROWSER = False
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+    "*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*",
+    "*facebook.net*", "*hotjar.com*", "*segment.io*", "*intercom.io*", "*sentry.io*",
+]
+BROWSER_METRICS_FILE = "output/browser_metrics.json"  # Per-mode transfer/load stats for comparing runs
 
 # Scraping Settings
 MAX_PROFILES = 10
 MAX_PAGES = 1  # Maximum number of pages to scrape
 PAGE_LOAD_TIMEOUT = 30
 DELAY_BETWEEN_REQUESTS = 3  # seconds
+# "dom" reads leads from the rendered pages; "api" parses the Sales Navigator JSON
+# responses captured over the DevTools protocol and only visits profiles it didn't see
+LINKEDIN_CAPTURE_MODE = "dom"
+
+# Profile Worker Pool Settings
+PROFILE_WORKERS = 1  # Browser sessions visiting profiles in parallel (1 = use the search browser)
+PROFILE_COOKIE_FILES = []  # Optional per-account cookie files, one per worker; workers without one use COOKIE_FILE
+PROFILE_RATE_PER_MINUTE = 20  # Global cap on profile visits per minute across all workers
+WORKER_PROFILE_DIR = "output/browser_profiles"  # Each worker gets its own Chrome user-data dir here
+
+# Lead Journal Settings
+LEAD_JOURNAL_FILE = "output/linkedin_journal.jsonl"  # Links, pages and leads fsynced as they are scraped (main.py --resume)
+
+# Lead Store Settings
+LEAD_STORE_FILE = "output/leads.db"  # Indexed history of every profile and lead seen, used to skip known leads
+LEAD_STORE_SKIP_ENRICHED = True  # Drop leads delivered by an earlier run when merging sources
+
+# Entity Resolution Settings
+# Merged leads are compared only within blocks (LinkedIn URL, email, company domain + last name)
+ENTITY_NAME_THRESHOLD = 0.85  # Min first-name similarity (0-1) to treat two leads in a block as one person
+ENTITY_MAX_BLOCK_NAMES = 50  # Blocks with more distinct first names than this skip fuzzy name matching
+
+# Email Verification Settings
+VERIFY_CONCURRENCY = 5  # Maximum Hunter.io verifications in flight at once
+
+# Verification Cache Settings
+VERIFICATION_CACHE_FILE = "output/verification_cache.db"
+VERIFICATION_CACHE_TTL_DAYS = 30  # Re-verify emails older than this
+VERIFICATION_CACHE_MAX_ENTRIES = 500000  # Oldest entries are evicted beyond this
+DOMAIN_CLASS_TTL_DAYS = 7  # Re-check catch-all/dead domain classifications after this
+CATCH_ALL_PROBE_MIN_LEADS = 2  # Only probe a domain for catch-all when this many leads need a pattern there
+
+# Enrichment Provider HTTP Settings
+# pool_maxsize should be at least VERIFY_CONCURRENCY so concurrent calls reuse connections
+# rate_per_second/burst feed each provider's token bucket; 429/5xx responses are retried
+# up to max_retries times with jittered exponential backoff (or the Retry-After header)
+PROVIDER_SETTINGS = {
+    "hunter": {"timeout": 15, "pool_connections": 2, "pool_maxsize": 10,
+               "rate_per_second": 5, "burst": 5, "max_retries": 3},
+    "snov": {"timeout": 30, "pool_connections": 2, "pool_maxsize": 4,
+             "rate_per_second": 1, "burst": 1, "max_retries": 3},
+}
+
+# Streaming Enrichment Settings (main.py --stream)
+STREAM_WORKERS = 2  # Threads cleaning/enriching leads while the browser keeps scraping
+STREAM_QUEUE_SIZE = 50  # Scraping pauses when this many leads are waiting
+
+# Stage Cache Settings
+STAGE_CACHE_DIR = "output/stage_cache"  # Enrichment outputs keyed by input row and config fingerprints
+STAGE_CACHE_TTL_DAYS = 7  # Cached rows older than this are recomputed
+
+# Large File Settings
+CSV_CHUNK_SIZE = 100000  # Rows read, cleaned/enriched and written at a time by the CSV stages
+INTERMEDIATE_FORMAT = "auto"  # Stage handoff files: "parquet", "csv", or "auto" (Parquet when pyarrow is installed)
+
+# Browser Wait Settings
+# Scrapers wait for readiness conditions (element present, results settled) instead of fixed sleeps
+READY_TIMEOUT = 15  # Max seconds to wait for a page or element to become ready
+SETTLE_TIMEOUT = 6  # Max seconds to wait for the results list to stop changing after a scroll
+SETTLE_QUIET_PERIOD = 0.75  # Seconds with no new rows/height change before results count as settled
+SETTLE_POLL_INTERVAL = 0.2  # Seconds between settle checks
+
+# Pacing Settings
+# Random human-like pauses, kept separate from load waits; (min, max) seconds per action
+PACING_ENABLED = True
+PACING_SCALE = 1.0  # Multiplier for every pacing delay
+PACING_DELAYS = {
+    "profile": (DELAY_BETWEEN_REQUESTS + 0.5, DELAY_BETWEEN_REQUESTS + 2),  # Between profile visits
+    "page_turn": (1, 3),  # After moving to the next results page
+    "scroll_step": (0.5, 1.5),  # Between small scrolls on a profile
+    "scroll_back": (0.8, 1.5),  # Between steps when scrolling the results back up
+    "login": (1, 3),  # Between login steps
+    "email_reveal": (0.2, 0.6),  # Between "Access email" clicks on Apollo
+}
+
+# Apollo Settings
+# Email reveals are clicked a few at a time and each row is watched until its email shows up
+APOLLO_REVEAL_CONCURRENCY = 4  # Max "Access email" reveals in flight at once
+APOLLO_REVEAL_TIMEOUT = 20  # Max seconds to wait for one row's email to be revealed
+APOLLO_MAX_PAGES = 3  # Results pages read per run (the free plan's limit)
+APOLLO_CURSOR_FILE = "output/apollo_cursor.json"  # Next page per saved search, so a pull resumes where it stopped
+# Apollo keeps a search's filters in its URL, like SALES_NAV_URL does for LinkedIn. Set this to a
+# saved search's URL to skip the filter clicks; otherwise the URL produced by the first click-through
+# is cached per filter configuration and reused
+APOLLO_SEARCH_URL = ""
+APOLLO_SEARCH_CACHE_FILE = "output/apollo_searches.json"  # Search URL per filter configuration
@@ -2,19 +2,29 @@
 LinkedIn Sales Navigator Scraper - Main Entry Point
 """
 from src.scraper import LinkedInScraper
-from src.SalesNav_CSVCleaner import process_csv
+from src.SalesNav_CSVCleaner import clean_dataframe
 from src.ApolloScraper import ApolloScraper
 import logging
 import sys
 import time
 import os
-import subprocess
 import glob
-import threading
 import pandas as pd
 import argparse
 from pathlib import Path
 from src.utils.file_manager import FileManager
+from src import enrichment
+from src.enrichment import enrich_dataframe
+from src.streaming import StreamingEnricher
+from src.utils.scheduler import StageScheduler
+from src.utils.stage_cache import StageCache
+from src.utils.lead_journal import LeadJournal
+from src.utils.lead_store import get_lead_store, ENRICHED
+from src.utils.entity_resolution import resolve_entities
+from src.utils.chunked_csv import read_chunks, transform_csv, ChunkedCSVWriter
+from src.utils.frame_io import intermediate_suffix, read_frame, write_frame
+from src.email_pattern_generator import DomainPatternModel
+from config.config import LEAD_STORE_SKIP_ENRICHED
 import shutil
 
 # Set up logging
@@ -47,12 +57,23 @@ def get_latest_csv_file(directory="output", prefix=None):
     logging.info(f"Using latest file: {latest_file}")
     return latest_file
 
-def run_linkedin_scraper(file_manager):
-    """Run LinkedIn Sales Navigator scraper and return the path to the saved CSV file."""
+def run_linkedin_scraper(file_manager, on_lead=None, clean=True, resume=False):
+    """Run LinkedIn Sales Navigator scraper and return the path to the saved CSV file.
+    
+    on_lead is passed through to scrape_profiles to receive each lead as it is scraped.
+    With clean=False the raw CSV is returned so cleaning can run as its own stage.
+    Leads are committed to a LeadJournal as they are scraped; with resume=True a scrape
+    that crashed continues from the journal instead of starting over.
+    """
     logging.info("Starting LinkedIn Sales Navigator Scraper...")
     scraper = None
     csv_file = None
     
+    journal = LeadJournal()
+    if not resume:
+        # Keep any journal left behind by a crashed run rather than appending to it
+        journal.archive()
+    
     try:
         # Initialize and login
         scraper = LinkedInScraper()
@@ -61,69 +82,100 @@ def run_linkedin_scraper(file_manager):
         # Use the default search URL
         search_url = SALES_NAV_URL
         
-        # Check if this URL was previously scraped and get starting page
-        start_page = scraper.check_previous_scrape(search_url)
-        
-        # Extract profile links
-        logging.info("Extracting profile links from search results...")
-        profile_links = scraper.get_profile_links(start_page=start_page)
+        pending_links = journal.pending_links() if resume else []
+        if pending_links:
+            # The search finished before the crash; only the remaining profiles need visiting
+            logging.info(f"Resuming with {len(pending_links)} journaled profiles still to scrape...")
+            scraper.current_url = search_url
+            profile_links = pending_links
+        else:
+            # Check if this URL was previously scraped and get starting page
+            resume_page = journal.last_page(search_url) if resume else None
+            start_page = scraper.check_previous_scrape(search_url, resume_page=resume_page)
+            
+            # Extract profile links
+            logging.info("Extracting profile links from search results...")
+            profile_links = scraper.get_profile_links(start_page=start_page, journal=journal)
+            if resume:
+                profile_links = journal.pending_links()
         
-        if len(profile_links) == 0:
+        if len(profile_links) == 0 and journal.lead_count() == 0:
             logging.error("No profile links found. Exiting.")
             return None
             
-        # Scrape individual profiles
+        # Scrape individual profiles, committing each lead to the journal as it is extracted
         logging.info(f"Scraping {len(profile_links)} profiles...")
-        leads = scraper.scrape_profiles(profile_links)
+        scraper.scrape_profiles(profile_links, on_lead=on_lead, journal=journal)
         
         # Save results to CSV
-        if leads:
+        if journal.lead_count():
             # Use file manager to get path
             csv_file = file_manager.get_linkedin_path()
             
-            # Create DataFrame
-            df = pd.DataFrame(leads)
-            df.to_csv(str(csv_file), index=False)
+            # Stream the journal into the CSV instead of holding every lead in memory
+            lead_count = journal.export_csv(str(csv_file))
+            journal.archive(file_manager.get_linkedin_path("linkedin_journal.jsonl"))
             
-            logging.info(f"Successfully scraped {len(leads)} leads and saved to {csv_file}")
+            logging.info(f"Successfully scraped {lead_count} leads and saved to {csv_file}")
             
             # Save reference to latest file
             file_manager.save_latest_reference(csv_file, "linkedin")
             
-            # Post-process the LinkedIn Sales Navigator CSV
-            if csv_file:
-                logging.info(f"Post-processing LinkedIn leads with SalesNav_CSVCleaner...")
-                output_folder = Path(os.path.dirname(csv_file)) / "processed"
-                os.makedirs(output_folder, exist_ok=True)
-                
-                try:
-                    processed_file = file_manager.get_processed_path(source="linkedin")
-                    process_csv(csv_file, output_folder)
-                    # Use most recent processed file
-                    processed_csv = file_manager.get_processed_path(source="linkedin")
-                    if processed_csv.exists():
-                        logging.info(f"Successfully post-processed LinkedIn leads: {processed_csv}")
-                        # Use the processed file for future steps
-                        csv_file = processed_csv
-                        file_manager.save_latest_reference(csv_file, "linkedin_processed")
-                    else:
-                        logging.warning("Post-processing completed but couldn't locate the output file")
-                except Exception as e:
-                    logging.error(f"Error during LinkedIn leads post-processing: {e}")
+            # Post-process the LinkedIn Sales Navigator CSV, keeping the raw file if cleaning fails
+            if clean:
+                csv_file = clean_linkedin_csv(csv_file, file_manager) or csv_file
         else:
             logging.error("No leads were collected.")
     
     except Exception as e:
         logging.error(f"An error occurred during LinkedIn scraping: {e}")
+        logging.info("Scraped leads are kept in the lead journal; rerun with --resume to continue.")
     
     finally:
         # Clean up
+        journal.close()
         if scraper:
             scraper.cleanup()
         logging.info("LinkedIn scraping complete.")
     
     return csv_file
 
+def clean_linkedin_csv(csv_file, file_manager):
+    """Clean a raw LinkedIn CSV with SalesNav_CSVCleaner and return the path to the processed file."""
+    if csv_file is None:
+        return None
+    
+    logging.info("Post-processing LinkedIn leads with SalesNav_CSVCleaner...")
+    try:
+        # Only the pipeline reads the cleaned leads, so they use the intermediate format
+        processed_csv = file_manager.get_processed_path(source="linkedin", suffix=intermediate_suffix())
+        transform_csv(csv_file, processed_csv, clean_dataframe)
+        
+        logging.info(f"Successfully post-processed LinkedIn leads: {processed_csv}")
+        file_manager.save_latest_reference(processed_csv, "linkedin_processed")
+        return processed_csv
+    except Exception as e:
+        logging.error(f"Error during LinkedIn leads post-processing: {e}")
+        return None
+
+def run_linkedin_streaming(file_manager, find_emails=True, verify_emails=True, resume=False):
+    """Scrape LinkedIn and enrich each lead while the browser moves on to the next profile."""
+    enricher = StreamingEnricher(find=find_emails, patterns=find_emails, verify=verify_emails,
+                                 lead_store=get_lead_store())
+    enricher.start()
+    
+    try:
+        run_linkedin_scraper(file_manager, on_lead=enricher.submit, resume=resume)
+    finally:
+        # Let the workers drain the queue before collecting results
+        enriched_df = enricher.close()
+    
+    if enriched_df.empty:
+        logging.warning("Streaming enrichment produced no leads.")
+        return None
+    
+    return save_enriched(enriched_df, file_manager, find_emails, verify_emails)
+
 def run_apollo_scraper(file_manager):
     """Run Apollo scraper and return the path to the saved CSV file."""
     logging.info("Running Apollo Scraper...")
@@ -153,273 +205,234 @@ def run_apollo_scraper(file_manager):
         logging.error(f"An error occurred during Apollo scraping: {e}")
         return None
 
-def run_snovio_email_finder(csv_file, file_manager):
-    """Run Snov.io email finder on a CSV file."""
+def save_enriched(chunks, file_manager, find_emails=True, verify_emails=True):
+    """Write enriched leads (a DataFrame or an iterable of chunks) to the processed directory
+    and update the latest references."""
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    
+    output_file = file_manager.get_processed_path(source="enriched")
+    lead_store = get_lead_store()
+    with ChunkedCSVWriter(output_file) as writer:
+        for df in chunks:
+            writer.write(df)
+            # Later runs skip these leads when merging and reuse their emails instead of looking them up again
+            lead_store.add_leads(df.to_dict("records"), status=ENRICHED)
+    logging.info(f"Enrichment complete. Saved {writer.rows} leads to {output_file}")
+    
+    # Save references to latest file
+    if find_emails:
+        file_manager.save_latest_reference(output_file, "snov_processed")
+    if verify_emails:
+        file_manager.save_latest_reference(output_file, "verified")
+    
+    return output_file
+
+def run_enrichment(csv_file, file_manager, find_emails=True, verify_emails=True, stage_cache=None):
+    """Run Snov.io finding, pattern generation and Hunter.io verification in-process on a CSV file.
+    
+    With a StageCache, rows that are unchanged since an earlier run reuse that run's output.
+    The file is enriched and written CSV_CHUNK_SIZE rows at a time, so its size isn't limited by memory.
+    """
     if csv_file is None:
-        logging.warning("No CSV file provided for Snov.io processing")
+        logging.warning("No CSV file provided for enrichment")
         return None
-        
-    logging.info(f"Running Snov.io email finder on {csv_file}...")
+    
+    logging.info(f"Enriching leads from {csv_file}...")
     try:
-        # Get path to snov_email_finder.py
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        snov_script_path = os.path.join(script_dir, "src", "snov_email_finder.py")
-        
-        if not os.path.exists(snov_script_path):
-            # Try alternative path
-            snov_script_path = os.path.join(script_dir, "src", "utils", "snov_email_finder.py")
-            
-        if not os.path.exists(snov_script_path):
-            logging.error("Could not find Snov.io email finder script")
-            return None
-            
-        # Copy file to processed directory
-        output_file = file_manager.get_processed_path(source="snov")
-        
-        # Make sure directory exists
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        
-        # Copy source file to output location
-        shutil.copy2(csv_file, output_file)
-        
-        # Run the Snov.io email finder directly on the output file
-        output_file_str = str(output_file)
-        
-        # Call the script with the actual file path
-        subprocess.run(["python", snov_script_path, "--file", output_file_str], check=False)
-        logging.info("Snov.io email finder complete.")
-        
-        # Save reference to latest file
-        file_manager.save_latest_reference(output_file, "snov_processed")
-        
-        # Run email pattern generation as fallback
-        pattern_script_path = os.path.join(script_dir, "src", "email_pattern_generator.py")
-        if os.path.exists(pattern_script_path):
-            logging.info("Running email pattern generation as fallback...")
-            subprocess.run(["python", pattern_script_path, "--file", output_file_str], check=False)
-            logging.info("Email pattern generation complete.")
-            
-        return output_file
+        # Pass each chunk through every stage; the pattern model carries learned formats across chunks
+        pattern_model = DomainPatternModel()
+        chunks = (
+            enrich_dataframe(chunk, find=find_emails, patterns=find_emails, verify=verify_emails,
+                             pattern_model=pattern_model, stage_cache=stage_cache, lead_store=get_lead_store())
+            for chunk in read_chunks(csv_file)
+        )
+        
+        # Each enriched chunk is appended to the processed file as soon as it is done
+        return save_enriched(chunks, file_manager, find_emails, verify_emails)
     except Exception as e:
-        logging.error(f"Error during Snov.io processing: {e}")
+        logging.error(f"Error during enrichment: {e}")
         return None
 
-def run_hunter_verification(csv_file, file_manager):
-    """Run Hunter.io email verification on a CSV file."""
-    if csv_file is None:
-        logging.warning("No CSV file provided for Hunter.io verification")
-        return False
+# Standard column mapping for both sources
+STANDARD_COLUMNS = {
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'Role': 'role',
+    'Emails': 'email',
+    'Email': 'email',
+    'Domain': 'domain',
+    'Company': 'company',
+    'Phone': 'phone',
+    'Website': 'website',
+    'Misc': 'linkedin_url',  # SalesNav_CSVCleaner keeps the profile URL in Misc
+    'Profile URL': 'linkedin_url',
+    'Title': 'role'  # Map Title to role for consistency
+}
+
+# Columns the enrichment stages expect on every lead
+REQUIRED_COLUMNS = ['first_name', 'last_name', 'email', 'company', 'role']
+
+# Key columns kept in the merged output
+MERGED_COLUMNS = [
+    'first_name', 'last_name', 'role', 'company', 'email', 
+    'phone', 'website', 'domain', 'linkedin_url', 'source', 'sources'
+]
+
+def standardize_leads(df, source):
+    """Rename a source's columns to the standard names and tag each row with its source."""
+    # If Name column exists but first_name/last_name don't, split it
+    if 'Name' in df.columns and 'first_name' not in df.columns:
+        df[['first_name', 'last_name']] = df['Name'].str.split(' ', n=1, expand=True)
+    
+    # Rename columns to standard names
+    for old_col, new_col in STANDARD_COLUMNS.items():
+        if old_col in df.columns:
+            df = df.rename(columns={old_col: new_col})
+    
+    # Ensure critical columns exist
+    for col in REQUIRED_COLUMNS:
+        if col not in df.columns:
+            logging.warning(f"{source} leads missing required column '{col}' - adding empty column")
+            df[col] = None
+    
+    df['source'] = source
+    return df
+
+def load_leads(csv_file, source):
+    """Read a scraper's CSV into a standardized DataFrame, or None if it is missing or unreadable."""
+    if not csv_file or not os.path.exists(csv_file):
+        return None
     
-    logging.info(f"Verifying emails with Hunter.io for {csv_file}...")
     try:
-        # Get path to email_verifier.py
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        verifier_script_path = os.path.join(script_dir, "src", "email_verifier.py")
-        
-        if not os.path.exists(verifier_script_path):
-            # Try alternative path
-            verifier_script_path = os.path.join(script_dir, "src", "utils", "email_verifier.py")
-            
-        if not os.path.exists(verifier_script_path):
-            logging.error("Could not find Hunter.io email verifier script")
-            return False
-        
-        # Copy file to processed directory
-        output_file = file_manager.get_processed_path(source="hunter")
-        
-        # Make sure directory exists
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        
-        # Copy source file to output location
-        shutil.copy2(csv_file, output_file)
-        
-        # Convert Path to string
-        output_file_str = str(output_file)
-            
-        # Call the script with the actual file path
-        subprocess.run(["python", verifier_script_path, "--file", output_file_str], check=False)
-        logging.info("Email verification complete.")
-        
-        # Save reference to latest file
-        file_manager.save_latest_reference(output_file, "verified")
-        
-        return True
+        df = standardize_leads(read_frame(csv_file), source)
+        logging.info(f"Read {len(df)} rows from {source} CSV")
+        return df
     except Exception as e:
-        logging.error(f"Error during Hunter.io verification: {e}")
-        return False
+        logging.error(f"Error reading {source} CSV: {e}")
+        return None
 
-def merge_csv_files(linkedin_csv, apollo_csv, output_file="output/merged_leads.csv"):
-    """Merge LinkedIn and Apollo CSV files with proper column standardization."""
-    # Initialize with empty DataFrames
-    linkedin_df = pd.DataFrame()
-    apollo_df = pd.DataFrame()
-    
-    # Standard column mapping for both sources
-    standard_columns = {
-        'first_name': 'first_name',
-        'last_name': 'last_name',
-        'Role': 'role',
-        'Emails': 'email',
-        'Email': 'email',
-        'Domain': 'domain',
-        'Company': 'company',
-        'Phone': 'phone',
-        'Website': 'website',
-        'Misc': 'misc',
-        'Profile URL': 'linkedin_url',
-        'Title': 'role'  # Map Title to role for consistency
-    }
-    
-    # Read LinkedIn CSV if available
-    if linkedin_csv and os.path.exists(linkedin_csv):
-        try:
-            linkedin_df = pd.read_csv(linkedin_csv)
-            
-            # If Name column exists but first_name/last_name don't, split it
-            if 'Name' in linkedin_df.columns and 'first_name' not in linkedin_df.columns:
-                # Split Name into first and last name
-                linkedin_df[['first_name', 'last_name']] = linkedin_df['Name'].str.split(' ', n=1, expand=True)
-            
-            # Rename columns to standard names
-            for old_col, new_col in standard_columns.items():
-                if old_col in linkedin_df.columns:
-                    linkedin_df = linkedin_df.rename(columns={old_col: new_col})
-            
-            linkedin_df['source'] = 'LinkedIn'
-            logging.info(f"Read {len(linkedin_df)} rows from LinkedIn CSV")
-        except Exception as e:
-            logging.error(f"Error reading LinkedIn CSV: {e}")
-    
-    # Read Apollo CSV if available
-    if apollo_csv and os.path.exists(apollo_csv):
-        try:
-            apollo_df = pd.read_csv(apollo_csv)
-            
-            # Rename columns to standard names
-            for old_col, new_col in standard_columns.items():
-                if old_col in apollo_df.columns:
-                    apollo_df = apollo_df.rename(columns={old_col: new_col})
-            
-            apollo_df['source'] = 'Apollo'
-            logging.info(f"Read {len(apollo_df)} rows from Apollo CSV")
-        except Exception as e:
-            logging.error(f"Error reading Apollo CSV: {e}")
+def merge_dataframes(linkedin_df, apollo_df, lead_store=None):
+    """Combine standardized LinkedIn and Apollo leads into one DataFrame (None if both are empty).
+    
+    Leads found by both sources are merged into one record listing its sources;
+    with a lead store, leads delivered by an earlier run are dropped.
+    """
+    linkedin_df = linkedin_df if linkedin_df is not None else pd.DataFrame()
+    apollo_df = apollo_df if apollo_df is not None else pd.DataFrame()
     
-    # If both files are empty/unavailable, return None
+    # If both sources are empty/unavailable, return None
     if linkedin_df.empty and apollo_df.empty:
-        logging.warning("Both CSV files are empty or couldn't be read. Cannot merge.")
+        logging.warning("Both sources are empty or couldn't be read. Cannot merge.")
         return None
     
-    try:
-        # Combine dataframes
-        # First, ensure both have same columns for clean concat
-        all_columns = set(list(linkedin_df.columns) + list(apollo_df.columns))
-        
-        # Add missing columns with None values
-        for col in all_columns:
-            if col not in linkedin_df.columns:
-                linkedin_df[col] = None
-            if col not in apollo_df.columns:
-                apollo_df[col] = None
-        
-        # Ensure critical columns exist
-        required_columns = ['first_name', 'last_name', 'email', 'company', 'role']
-        for col in required_columns:
-            if col not in all_columns:
-                logging.warning(f"Missing required column '{col}' - adding empty column")
-                linkedin_df[col] = None
-                apollo_df[col] = None
-        
-        # Convert columns to appropriate types
-        for df in [linkedin_df, apollo_df]:
-            for col in df.columns:
-                # Convert to string to avoid type errors, except for boolean columns
-                if col != 'Email_Verified':
-                    df[col] = df[col].astype(str).replace({'nan': '', 'None': '', 'NaN': ''})
-        
-        # Combine dataframes
-        merged_df = pd.concat([linkedin_df, apollo_df], ignore_index=True)
-        
-        # Clean and standardize emails
-        merged_df['email'] = merged_df['email'].astype(str)
-        # Remove "+1" or other suffixes from emails
-        merged_df['email'] = merged_df['email'].str.replace(r'\+\d+$', '', regex=True)
-        
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        
-        # Select only the key columns for cleaner output
-        final_columns = [
-            'first_name', 'last_name', 'role', 'company', 'email', 
-            'phone', 'website', 'domain', 'linkedin_url', 'source'
-        ]
-        
-        # Only keep columns that exist in our data
-        output_columns = [col for col in final_columns if col in merged_df.columns]
-        
-        # Save to CSV
-        merged_df[output_columns].to_csv(output_file, index=False)
-        logging.info(f"Merged data saved to {output_file} ({len(merged_df)} rows)")
-        return output_file
-    except Exception as e:
-        logging.error(f"Error merging CSV files: {e}")
+    # First, ensure both have same columns for clean concat
+    all_columns = set(list(linkedin_df.columns) + list(apollo_df.columns))
+    
+    # Add missing columns with None values
+    for col in all_columns:
+        if col not in linkedin_df.columns:
+            linkedin_df[col] = None
+        if col not in apollo_df.columns:
+            apollo_df[col] = None
+    
+    # Convert columns to appropriate types
+    for df in [linkedin_df, apollo_df]:
+        for col in df.columns:
+            # Convert to string to avoid type errors, except for boolean columns
+            if col != 'Email_Verified':
+                df[col] = df[col].astype(str).replace({'nan': '', 'None': '', 'NaN': ''})
+    
+    # Combine dataframes
+    merged_df = pd.concat([linkedin_df, apollo_df], ignore_index=True)
+    
+    # Clean and standardize emails
+    merged_df['email'] = merged_df['email'].astype(str)
+    # Remove "+1" or other suffixes from emails
+    merged_df['email'] = merged_df['email'].str.replace(r'\+\d+$', '', regex=True)
+    
+    # The same person found by both sources becomes one record listing both sources; LinkedIn's fields win
+    resolved_df = resolve_entities(merged_df)
+    if len(resolved_df) < len(merged_df):
+        logging.info(f"Merged {len(merged_df)} leads into {len(resolved_df)} people")
+    merged_df = resolved_df
+    
+    if lead_store is not None and LEAD_STORE_SKIP_ENRICHED:
+        known = lead_store.enriched_mask(merged_df)
+        if known.any():
+            logging.info(f"Skipping {known.sum()} leads already enriched in an earlier run")
+            merged_df = merged_df[~known]
+    
+    # Only keep key columns that exist in our data
+    output_columns = [col for col in MERGED_COLUMNS if col in merged_df.columns]
+    return merged_df[output_columns]
+
+def find_apollo_emails(apollo_csv, stage_cache=None):
+    """Resolve the Apollo leads among themselves and fill their missing emails with Snov.io."""
+    apollo_df = merge_dataframes(None, load_leads(apollo_csv, 'Apollo'), get_lead_store())
+    if apollo_df is None or apollo_df.empty:
+        logging.warning("No Apollo leads to enrich")
         return None
+    return enrichment.find_emails(apollo_df, stage_cache, get_lead_store())
+
+def find_linkedin_only_emails(merged_df, stage_cache=None):
+    """Fill missing emails with Snov.io for merged records that no Apollo lead resolved to.
+
+    Records with an Apollo source were already looked up on the Apollo branch.
+    """
+    linkedin_only = ~merged_df['sources'].str.contains('Apollo', regex=False)
+    logging.info(f"{linkedin_only.sum()} of {len(merged_df)} merged leads still need a Snov.io lookup")
+    if not linkedin_only.any():
+        return merged_df
+    found_df = enrichment.find_emails(merged_df[linkedin_only], stage_cache, get_lead_store())
+    return pd.concat([merged_df[~linkedin_only], found_df]).sort_index()
 
-def run_full_pipeline():
-    """Run the full pipeline with LinkedIn and Apollo in parallel."""
+def merge_stage(linkedin_csv, apollo_df, file_manager):
+    """Merge the LinkedIn leads into the enriched Apollo records and save the merged CSV; raises if there is nothing to merge."""
+    merged_df = merge_dataframes(load_leads(linkedin_csv, 'LinkedIn'), apollo_df, get_lead_store())
+    if merged_df is None:
+        raise RuntimeError("Both scrapers failed. No data to process.")
+    if merged_df.empty:
+        raise RuntimeError("Every merged lead was already enriched in an earlier run. Nothing new to process.")
+    
+    merged_path = write_frame(merged_df, file_manager.get_merged_path(suffix=intermediate_suffix()))
+    logging.info(f"Merged data saved to {merged_path} ({len(merged_df)} rows)")
+    file_manager.save_latest_reference(merged_path, "merged")
+    return merged_df
+
+def run_full_pipeline(use_cache=True, resume=False):
+    """Run the full pipeline as a DAG of stages so LinkedIn and Apollo progress independently."""
     logging.info("Running full pipeline...")
     
     # Initialize file manager
     file_manager = FileManager()
+    stage_cache = StageCache() if use_cache else None
     
-    # Create threads for LinkedIn and Apollo scrapers
-    linkedin_thread = threading.Thread(
-        target=lambda: globals().update(linkedin_csv=run_linkedin_scraper(file_manager))
-    )
-    apollo_thread = threading.Thread(
-        target=lambda: globals().update(apollo_csv=run_apollo_scraper(file_manager))
-    )
-    
-    # Initialize result variables
-    globals()['linkedin_csv'] = None
-    globals()['apollo_csv'] = None
-    
-    # Start both scrapers in parallel
-    linkedin_thread.start()
-    time.sleep(10)  # Small delay to let LinkedIn initialize first
-    apollo_thread.start()
-    
-    # Wait for both to complete
-    linkedin_thread.join()
-    apollo_thread.join()
-    
-    # Get results
-    linkedin_csv = globals().get('linkedin_csv')
-    apollo_csv = globals().get('apollo_csv')
-    
-    logging.info(f"LinkedIn scraping completed: {linkedin_csv}")
-    logging.info(f"Apollo scraping completed: {apollo_csv}")
-    
-    # Merge results if at least one was successful
-    merged_csv = None
-    if linkedin_csv or apollo_csv:
-        merged_path = file_manager.get_merged_path()
-        merged_csv = merge_csv_files(linkedin_csv, apollo_csv, output_file=str(merged_path))
-        if merged_csv:
-            file_manager.save_latest_reference(merged_csv, "merged")
-    else:
-        logging.error("Both scrapers failed. No data to process.")
-        return
+    # Apollo enrichment starts as soon as Apollo is done instead of waiting for LinkedIn;
+    # after the merge only LinkedIn leads that didn't resolve to an Apollo record go to Snov.io,
+    # so a person found by both sources costs one lookup. Pattern generation waits for the
+    # merge so it can learn from every source
+    scheduler = StageScheduler()
+    scheduler.add("linkedin", lambda: run_linkedin_scraper(file_manager, clean=False, resume=resume))
+    scheduler.add("apollo", lambda: run_apollo_scraper(file_manager))
+    scheduler.add("clean", lambda raw_csv: clean_linkedin_csv(raw_csv, file_manager), deps=["linkedin"])
+    scheduler.add("snov_apollo", lambda csv_file: find_apollo_emails(csv_file, stage_cache), deps=["apollo"])
+    scheduler.add("merge", lambda linkedin_csv, apollo_df: merge_stage(linkedin_csv, apollo_df, file_manager),
+                  deps=["clean", "snov_apollo"])
+    scheduler.add("snov_linkedin", lambda df: find_linkedin_only_emails(df, stage_cache), deps=["merge"])
+    scheduler.add("pattern", lambda df: enrichment.generate_patterns(df, stage_cache=stage_cache),
+                  deps=["snov_linkedin"])
+    scheduler.add("verify", lambda df: enrichment.verify_emails(df, stage_cache), deps=["pattern"])
     
-    # Process with Snov.io
-    if merged_csv:
-        processed_csv = run_snovio_email_finder(merged_csv, file_manager)
-        
-        # Verify with Hunter.io
-        if processed_csv:
-            run_hunter_verification(processed_csv, file_manager)
+    results = scheduler.run()
+    
+    logging.info(f"LinkedIn scraping completed: {results['clean'].value or results['linkedin'].value}")
+    logging.info(f"Apollo scraping completed: {results['apollo'].value}")
+    
+    if results["verify"].succeeded:
+        save_enriched(results["verify"].value, file_manager)
     else:
-        logging.error("Merge failed. Cannot continue pipeline.")
+        logging.error("Pipeline did not complete. See stage timings above.")
 
 def main():
     """Main entry point with command-line argument support."""
@@ -429,6 +442,9 @@ def main():
     parser.add_argument("--skip-snovio", action="store_true", help="Skip Snov.io email finding")
     parser.add_argument("--skip-hunter", action="store_true", help="Skip Hunter.io email verification")
     parser.add_argument("--input-csv", help="Use existing CSV file instead of scraping")
+    parser.add_argument("--stream", action="store_true", help="With --linkedin-only, enrich leads while scraping continues")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every enrichment stage instead of reusing cached rows")
+    parser.add_argument("--resume", action="store_true", help="Continue a LinkedIn scrape that crashed, skipping journaled profiles")
     args = parser.parse_args()
     
     try:
@@ -444,35 +460,32 @@ def main():
             csv_file = args.input_csv
             logging.info(f"Using provided CSV file: {csv_file}")
             
-            if not args.skip_snovio:
-                csv_file = run_snovio_email_finder(csv_file, file_manager)
-                
-            if not args.skip_hunter and csv_file:
-                run_hunter_verification(csv_file, file_manager)
-                
+        elif args.linkedin_only and args.stream:
+            # Run LinkedIn scraper with enrichment workers consuming leads as they arrive
+            run_linkedin_streaming(file_manager,
+                                   find_emails=not args.skip_snovio,
+                                   verify_emails=not args.skip_hunter,
+                                   resume=args.resume)
+            return
+            
         elif args.linkedin_only:
             # Run only LinkedIn scraper
-            csv_file = run_linkedin_scraper(file_manager)
-            
-            if csv_file and not args.skip_snovio:
-                csv_file = run_snovio_email_finder(csv_file, file_manager)
-                
-            if csv_file and not args.skip_hunter:
-                run_hunter_verification(csv_file, file_manager)
+            csv_file = run_linkedin_scraper(file_manager, resume=args.resume)
                 
         elif args.apollo_only:
             # Run only Apollo scraper
             csv_file = run_apollo_scraper(file_manager)
-            
-            if csv_file and not args.skip_snovio:
-                csv_file = run_snovio_email_finder(csv_file, file_manager)
-                
-            if csv_file and not args.skip_hunter:
-                run_hunter_verification(csv_file, file_manager)
                 
         else:
             # Run full pipeline by default
-            run_full_pipeline()
+            run_full_pipeline(use_cache=not args.no_cache, resume=args.resume)
+            return
+        
+        if csv_file and not (args.skip_snovio and args.skip_hunter):
+            run_enrichment(csv_file, file_manager,
+                           find_emails=not args.skip_snovio,
+                           verify_emails=not args.skip_hunter,
+                           stage_cache=None if args.no_cache else StageCache())
             
     except KeyboardInterrupt:
         logging.warning("Process interrupted by user.")
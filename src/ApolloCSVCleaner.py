@@ -1,27 +1,28 @@
+import sys
 import pandas as pd
 import re
 from pathlib import Path
 
-def clean_csv(input_file, output_file):
-    # Ensure input_file and output_file are strings (in case Path objects are passed)
-    input_file = str(input_file)
-    output_file = str(output_file)
-    
-    # Load the CSV file
-    df = pd.read_csv(input_file, dtype=str)
-    
-    # Define regex pattern to filter single-letter names with optional dashes or periods
-    single_letter_pattern = re.compile(r'^\s*[A-Z]\s*[-.]*\s*$', re.IGNORECASE)
-    
+if __package__ in (None, ""):
+    # Allow running as a standalone script (python src/ApolloCSVCleaner.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config.config import CSV_CHUNK_SIZE
+from src.utils.chunked_csv import transform_csv
+
+# Define regex pattern to filter single-letter names with optional dashes or periods
+single_letter_pattern = re.compile(r'^\s*[A-Z]\s*[-.]*\s*$', re.IGNORECASE)
+
+def clean_dataframe(df):
     # Filter out rows where first_name or last_name match the pattern
     filtered_df = df[~df["first_name"].str.match(single_letter_pattern, na=False) &
                      ~df["last_name"].str.match(single_letter_pattern, na=False)]
     
     # Remove rows where email is "No email" or "Access email"
-    filtered_df = filtered_df[~filtered_df["email"].isin(["No email", "Access email"])]
+    filtered_df = filtered_df[~filtered_df["email"].isin(["No email", "Access email"])].copy()
     
     # Extract domain from email
-    filtered_df["domain"] = filtered_df["email"].str.extract(r'@(.+)')
+    filtered_df["domain"] = filtered_df["email"].str.extract(r'@(.+)', expand=False)
     
     # Reorder columns to place 'domain' after 'phone'
     if "phone" in filtered_df.columns and "domain" in filtered_df.columns:
@@ -30,8 +31,15 @@ def clean_csv(input_file, output_file):
         cols.insert(phone_index + 1, cols.pop(cols.index("domain")))
         filtered_df = filtered_df[cols]
     
-    # Save the cleaned DataFrame to a new CSV file
-    filtered_df.to_csv(output_file, index=False)
+    return filtered_df
+
+def clean_csv(input_file, output_file, chunksize=CSV_CHUNK_SIZE):
+    # Ensure input_file and output_file are strings (in case Path objects are passed)
+    input_file = str(input_file)
+    output_file = str(output_file)
+    
+    # Clean the CSV a chunk at a time and save the cleaned rows to a new CSV file
+    rows_in, rows_out = transform_csv(input_file, output_file, clean_dataframe, chunksize, dtype=str)
     
-    print(f"[INFO] Cleaning complete. {len(df) - len(filtered_df)} rows removed.")
+    print(f"[INFO] Cleaning complete. {rows_in - rows_out} rows removed.")
     # print(f"Cleaned file saved as: {output_file}")
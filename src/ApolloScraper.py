@@ -1,20 +1,103 @@
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from .ApolloCSVCleaner import clean_csv
+from .utils.helpers import chrome_launch_lock
+from .utils.browser import apply_lean_options, enable_resource_blocking, BrowserMetrics
+from .utils.pacing import PacingPolicy
+from .utils.search_cursor import SearchCursor, SearchURLCache, search_key
+from config.config import (APOLLO_REVEAL_CONCURRENCY, APOLLO_REVEAL_TIMEOUT, APOLLO_MAX_PAGES, APOLLO_SEARCH_URL,
+                           SETTLE_POLL_INTERVAL)
 import undetected_chromedriver as uc
 from distutils.util import strtobool
 from dotenv import load_dotenv
 from pathlib import Path
+from urllib.parse import parse_qsl, urlencode
 import time
-import copy
 import csv
 import os
 import re
 
+# Results rows Apollo renders per page
+ROWS_PER_PAGE = 25
+# How long to keep waiting for a full page once the first row is there (the last page has fewer rows)
+ROW_RENDER_TIMEOUT = 3
+
+# Clean CSV columns used when ROW_HEADERS_CLEAN isn't set
+DEFAULT_CLEAN_HEADERS = ['first_name', 'last_name', 'title', 'email', 'phone']
+# Cell index of each column (after the leading checkbox cell) when the table headers can't be matched
+FALLBACK_COLUMNS = {'name': 1, 'title': 2, 'company': 3, 'email': 4, 'phone': 5, 'links': 6}
+
+# .env settings that define the saved search; each combination gets its own resume cursor and cached URL
+SEARCH_FILTER_VARS = ['SEARCH_LOCATIONS', 'INDUSTRY_KEYWORDS', 'JOB_TITLES', 'EXCLUDE_JOBS']
+
+FILTER_TAB_SELECTOR = 'div.zp-accordion-header.zp_r3aQ1'
+# Title each filter accordion starts with, and its usual position if no title matches
+FILTER_TABS = {
+    'location': ('Location', 5),
+    'industry': ('Industry', 7),
+    'job': ('Job Titles', 3),
+    'email': ('Email Status', 2),
+}
+
+NEXT_PAGE_SELECTOR = 'button.zp_qe0Li.zp_S5tZC > .apollo-icon-chevron-arrow-right'
+
+PERSONAL_EMAIL_REGEX = r'\b[A-Za-z0-9._%+-]+@(gmail\.com|hotmail\.com|outlook\.com|yahoo\.com|aol\.com)\b'
+
+ROW_COUNT_JS = "return document.querySelectorAll(\"[id^='table-row-']\").length;"
+
+# Header labels plus every rendered row's cell texts and LinkedIn link, in one round trip
+TABLE_SNAPSHOT_JS = r"""
+const rowNumber = (row) => parseInt(row.id.replace('table-row-', ''), 10);
+const rows = Array.from(document.querySelectorAll("[id^='table-row-']"))
+    .sort((a, b) => rowNumber(a) - rowNumber(b));
+const table = rows.length ? rows[0].closest("table, [role='table'], [role='grid']") : null;
+const headerCells = table ? table.querySelectorAll("thead th, [role='columnheader']") : [];
+
+return {
+    headers: Array.from(headerCells, (cell) => (cell.innerText || '').trim()),
+    rows: rows.map((row) => {
+        const icon = row.querySelector('i.zp-icon.apollo-icon.apollo-icon-linkedin');
+        const link = icon ? icon.parentElement : null;
+        return {
+            cells: Array.from(row.querySelectorAll('.zp_KtrQp'), (cell) => (cell.innerText || '').trim()),
+            linkedin: link && link.href ? link.href : null,
+        };
+    }),
+};
+"""
+
+# Ids of the rows whose email is still behind an "Access email" button
+HIDDEN_EMAIL_ROWS_JS = r"""
+const hasRevealButton = (row) => Array.from(row.querySelectorAll('button > span'))
+    .some((span) => span.textContent.trim() === 'Access email');
+return Array.from(document.querySelectorAll("[id^='table-row-']"))
+    .filter(hasRevealButton)
+    .map((row) => row.id);
+"""
+
+# Reveal state of each given row: pending while its "Access email" button is there,
+# then revealed or no_email depending on whether an address showed up
+REVEAL_STATE_JS = r"""
+const rowIds = arguments[0];
+const emailPattern = /[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}/;
+const states = {};
+for (const rowId of rowIds) {
+    const row = document.getElementById(rowId);
+    if (!row) {
+        states[rowId] = 'missing';
+        continue;
+    }
+    const waiting = Array.from(row.querySelectorAll('button > span'))
+        .some((span) => span.textContent.trim() === 'Access email');
+    states[rowId] = waiting ? 'pending' : (emailPattern.test(row.innerText || '') ? 'revealed' : 'no_email');
+}
+return states;
+"""
+
 def login_google(browser):
     """Fills in the user details and handles 2-factor authentication"""
     loginID = WebDriverWait(browser, 10).until(
@@ -161,18 +244,237 @@ def industryFilter(browser, industryTab):
         first_child.click()
         time.sleep(1)
 
-def show_all_emails(browser):
-    allEmailButtons = browser.find_elements(By.XPATH, "//button[span[text()='Access email']]")
+def reveal_button(browser, rowId):
+    """The row's "Access email" button, or None if it has none"""
+    buttons = browser.find_elements(By.XPATH, f"//*[@id='{rowId}']//button[span[text()='Access email']]")
+    return buttons[0] if buttons else None
+
+def filter_tab(tabs, name):
+    """The filter accordion header for a FILTER_TABS entry, found by its title"""
+    label, index = FILTER_TABS[name]
+    for tab in tabs:
+        if tab.text.strip().lower().startswith(label.lower()):
+            return tab
+    print(f"[WARNING] No '{label}' filter tab found; using tab {index}")
+    return tabs[index]
+
+def apply_filters(browser):
+    """Set the search filters by clicking through the People filter panel"""
+    # Navigate to the appropriate tab
+    peopleTab = WebDriverWait(browser, 30).until(
+        EC.element_to_be_clickable((By.ID, 'side-nav-people'))
+    )
+    peopleTab.click()
+
+    print('[INFO] Setting location filters')
+    # Get the filter tabs
+    tabs = WebDriverWait(browser, 10).until(
+        EC.presence_of_all_elements_located((By.CSS_SELECTOR, FILTER_TAB_SELECTOR))
+    )
+
+    # Filter locations
+    location_filter(browser, filter_tab(tabs, 'location'))
+
+    # Filter Industry
+    print('[INFO] Setting industry filters')
+    industryFilter(browser, filter_tab(tabs, 'industry'))
+
+    print('[INFO] Setting job filters')
+    # Filter required jobs
+    job_filter(browser, filter_tab(tabs, 'job'))
+
+    print('[INFO] Setting email filters')
+    # Only include verified emails
+    filter_tab(tabs, 'email').click()
+    browser.find_element(By.CLASS_NAME, 'zp_vcdPP').click()
+
+def open_search(browser, searchKey, page=1, searches=None):
+    """Open the configured search at the given page: straight from APOLLO_SEARCH_URL or the
+    URL cached for these filters when there is one, otherwise by clicking through the filters"""
+    searches = searches or SearchURLCache()
+    searchUrl = APOLLO_SEARCH_URL or searches.get(searchKey)
+
+    if searchUrl:
+        print('[INFO] Opening saved search' if APOLLO_SEARCH_URL else '[INFO] Opening cached search for these filters')
+        browser.get(with_page(searchUrl, page))
+        try:
+            wait_for_table(browser)
+            return
+        except TimeoutException:
+            print('[WARNING] Saved search did not load any results; setting the filters instead')
+            if not APOLLO_SEARCH_URL:
+                searches.forget(searchKey)
+
+    apply_filters(browser)
+    wait_for_table(browser)
+    # Apollo encodes the filters in the URL, so later runs can open it directly
+    if '?' in browser.current_url:
+        searches.save(searchKey, browser.current_url)
+    if page > 1:
+        goto_page(browser, page)
+
+def show_all_emails(browser, concurrency=APOLLO_REVEAL_CONCURRENCY, timeout=APOLLO_REVEAL_TIMEOUT, pacing=None):
+    """Reveal every hidden email on the page, keeping at most `concurrency` reveals in flight.
+    Each clicked row is watched until its email cell changes, up to `timeout` seconds per row.
+
+    Returns a dict of row id -> 'revealed', 'no_email', 'timeout', 'missing' or 'failed'
+    """
+    pacing = pacing or PacingPolicy()
+    pending = browser.execute_script(HIDDEN_EMAIL_ROWS_JS) or []
+    inFlight = {}
+    results = {}
+    start = time.time()
+
+    while pending or inFlight:
+        # Top up the reveals in flight
+        while pending and len(inFlight) < concurrency:
+            rowId = pending.pop(0)
+            try:
+                button = reveal_button(browser, rowId)
+                if button is None:
+                    results[rowId] = 'missing'
+                    continue
+                button.click()
+                inFlight[rowId] = time.time()
+            except Exception as e:
+                print(f'[WARNING] Could not click "Access email" on {rowId}: {e}')
+                results[rowId] = 'failed'
+            pacing.pause('email_reveal')
+
+        if not inFlight:
+            continue
+
+        # One script call reports the state of every row being revealed
+        states = browser.execute_script(REVEAL_STATE_JS, list(inFlight)) or {}
+        now = time.time()
+        for rowId, clickedAt in list(inFlight.items()):
+            state = states.get(rowId, 'missing')
+            if state == 'pending' and now - clickedAt < timeout:
+                continue
+            results[rowId] = 'timeout' if state == 'pending' else state
+            del inFlight[rowId]
+            if results[rowId] in ('timeout', 'missing'):
+                print(f'[WARNING] Email reveal for {rowId} ended as {results[rowId]} after {now - clickedAt:.1f}s')
+
+        if inFlight:
+            time.sleep(SETTLE_POLL_INTERVAL)
+
+    revealed = sum(1 for state in results.values() if state == 'revealed')
+    print(f'[INFO] Revealed {revealed}/{len(results)} emails in {time.time() - start:.2f}s')
+    return results
+
+def get_clean_headers():
+    """Columns of the cleaned CSV, from ROW_HEADERS_CLEAN in the .env file"""
+    headersStr = os.getenv('ROW_HEADERS_CLEAN')
+    return headersStr.split(',') if headersStr else DEFAULT_CLEAN_HEADERS
+
+def column_index(headers, label, cellCount):
+    """Cell index of the first table header containing label, or its usual position if the headers don't line up"""
+    if len(headers) == cellCount:
+        for index, header in enumerate(headers):
+            if label in header.lower():
+                return index
+    return FALLBACK_COLUMNS.get(label)
+
+def parse_table(snapshot, cleanHeaders):
+    """Turn a table snapshot into raw rows and cleaned rows (one value per clean header)"""
+    headers = snapshot.get('headers') or []
+    rawRows = []
+    cleanRows = []
+
+    for row in snapshot.get('rows') or []:
+        cells = list(row['cells'])
+        if not cells:
+            continue
+
+        def cell(label):
+            index = column_index(headers, label, len(cells))
+            return cells[index] if index is not None and index < len(cells) else ''
+
+        # Put the LinkedIn profile link in the Links column
+        linkedInIndex = column_index(headers, 'links', len(cells))
+        if linkedInIndex is not None and linkedInIndex < len(cells):
+            cells[linkedInIndex] = row.get('linkedin') or 'N/A'
+
+        # Check if the email is personal and discard if so
+        email = cell('email')
+        if email != 'Access email' and re.match(PERSONAL_EMAIL_REGEX, email):
+            continue
+
+        # There tends to be an empty element at the start of each row
+        rawRows.append(cells[1:])
+
+        nameParts = cell('name').split(' ')
+        values = {'first_name': nameParts[0], 'last_name': nameParts[-1]}
+        cleanRow = []
+        for header in cleanHeaders:
+            key = header.strip().lower().replace(' ', '_')
+            cleanRow.append(values[key] if key in values else cell(key.replace('_', ' ')))
+        cleanRows.append(cleanRow)
+
+    return rawRows, cleanRows
+
+def wait_for_table(browser):
+    """Wait once for the results table to render its rows"""
+    WebDriverWait(browser, 10).until(
+        EC.presence_of_element_located((By.ID, 'table-row-0'))
+    )
+    try:
+        WebDriverWait(browser, ROW_RENDER_TIMEOUT).until(
+            lambda driver: driver.execute_script(ROW_COUNT_JS) >= ROWS_PER_PAGE
+        )
+    except TimeoutException:
+        # The last page can have fewer rows; take what is rendered
+        pass
+
+def apollo_search_key():
+    """Cursor key for the configured search: the saved search URL if set, else the .env filters"""
+    if APOLLO_SEARCH_URL:
+        return search_key({'url': APOLLO_SEARCH_URL})
+    return search_key({name: os.getenv(name) for name in SEARCH_FILTER_VARS})
+
+def with_page(url, page):
+    """The search URL pointed at the given results page (Apollo keeps the search in the URL fragment)"""
+    base, _, fragment = url.partition('#')
+    path, _, query = fragment.partition('?')
+    params = [(key, value) for key, value in parse_qsl(query, keep_blank_values=True) if key != 'page']
+    params.append(('page', str(page)))
+    return f"{base}#{path}?{urlencode(params, safe='[]')}"
+
+def goto_page(browser, page):
+    """Open the given results page of the current search"""
+    browser.get(with_page(browser.current_url, page))
+    wait_for_table(browser)
+
+def next_page(browser):
+    """Move to the next results page; returns False if there is none"""
+    icons = browser.find_elements(By.CSS_SELECTOR, NEXT_PAGE_SELECTOR)
+    if not icons:
+        return False
+    button = icons[0].find_element(By.XPATH, '..')
+    if button.get_attribute('disabled') is not None or not button.is_enabled():
+        return False
+
+    firstRow = browser.find_element(By.ID, 'table-row-0')
+    button.click()
+    try:
+        # Don't read the next page until the current rows have been replaced
+        WebDriverWait(browser, 10).until(EC.staleness_of(firstRow))
+    except TimeoutException:
+        print('[WARNING] Results table did not refresh after moving to the next page')
+    return True
 
-    for emailButton in allEmailButtons:
-        emailButton.click()
-        time.sleep(12)
+def collect_data(browser, shouldCollectEmail, onPage, startPage=1, pageCount=APOLLO_MAX_PAGES, metrics=None):
+    """Read up to pageCount results pages starting at startPage, handing each to
+    onPage(pageNumber, rawRows, cleanRows) as soon as it is read.
 
-def collect_data(browser, dataList, dataListClean, shouldCollectEmail):
-    # Set based on the free limit of the service
-    for pageNumber in range(3):
+    Returns (pages read, whether the search ran out of results)
+    """
+    cleanHeaders = get_clean_headers()
+    pagesRead = 0
+
+    for pageNumber in range(startPage, startPage + pageCount):
 
-        # Assuming there are 25 records in each page
         if(shouldCollectEmail):
             print('[INFO] Collecting Emails')
             # Wait for the loading to stop before collecting the buttons
@@ -183,53 +485,34 @@ def collect_data(browser, dataList, dataListClean, shouldCollectEmail):
         else:
             print('[INFO] Skipping email collection (enable from settings)')
         
-        for x in range(25):
-            firstRow = WebDriverWait(browser, 10).until(
-                EC.presence_of_element_located((By.ID, 'table-row-' + str(x)))
-            )
-            dataRow = firstRow.find_elements(By.CLASS_NAME, 'zp_KtrQp')
-
-            currRowData = []
-            for cell in dataRow:
-                currRowData.append(cell.text)
-
-            # Need to ensure that the LinkedIn profile link exists for this row
-            linkedInHref = 'N/A'
-            if(len(firstRow.find_elements(By.CSS_SELECTOR, "i.zp-icon.apollo-icon.apollo-icon-linkedin")) > 0):
-                linkedInHref = firstRow.find_element(By.CSS_SELECTOR, "i.zp-icon.apollo-icon.apollo-icon-linkedin").find_element(By.XPATH, "..").get_attribute("href")
-            currRowData[6] = linkedInHref
-            # There tends to be an empty element at the start of each row
-            currRowData.pop(0)
-            
-            # Check if the email is personal and discard if so
-            email_regex = r'\b[A-Za-z0-9._%+-]+@(gmail\.com|hotmail\.com|outlook\.com|yahoo\.com|aol\.com)\b'
-            if(currRowData[3] != 'Access email' and re.match(currRowData[3], email_regex)):
-                continue
-
-            dataList.append(currRowData)
-            # Now for the cleaned data
-            currRowCleaned = copy.deepcopy(currRowData)
-            # Original Cleaning process
-            firstName = currRowCleaned[0].split(' ')[0]
-            lastName = currRowCleaned[0].split(' ')[-1]
-            currRowCleaned.pop(0)
-            currRowCleaned.insert(0, lastName)
-            currRowCleaned.insert(0, firstName)
-            currRowCleaned.pop()
-            currRowCleaned.pop()
-            currRowCleaned.pop()
-            currRowCleaned.pop(-2)
-            currRowCleaned.pop(-2) # Empty column
-            # Extra Cleaning to match the standard format
-            currRowCleaned.pop() # Remove Location
-            currRowCleaned.pop(3) # Remove Company
-            dataListClean.append(currRowCleaned)
-
-        # Navigate to next page
-        nextPageBtn = WebDriverWait(browser, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, 'button.zp_qe0Li.zp_S5tZC > .apollo-icon-chevron-arrow-right'))
-        )
-        nextPageBtn.click()
+        # Read every row of the page in a single script call
+        start = time.time()
+        wait_for_table(browser)
+        snapshot = browser.execute_script(TABLE_SNAPSHOT_JS)
+        rowCount = len(snapshot.get('rows') or [])
+        rawRows, cleanRows = parse_table(snapshot, cleanHeaders)
+        print(f'[INFO] Extracted {len(rawRows)} of {rowCount} rows from page {pageNumber} in {time.time() - start:.2f}s')
+
+        onPage(pageNumber, rawRows, cleanRows)
+        pagesRead += 1
+
+        if metrics:
+            metrics.sample()
+
+        # A short page is the last one
+        if rowCount < ROWS_PER_PAGE or not next_page(browser):
+            print(f'[INFO] Reached the last results page ({pageNumber})')
+            return pagesRead, True
+
+    return pagesRead, False
+
+def open_page_csv(path, headers, fresh):
+    """Open an output CSV for appending pages, starting it over with headers on a fresh pull"""
+    file = open(path, 'w' if fresh or not os.path.exists(path) else 'a', newline='', encoding='utf-8')
+    writer = csv.writer(file)
+    if file.tell() == 0:
+        writer.writerow(headers)
+    return file, writer
 
 def ApolloScraper():
     print('[INFO] Loading configuration')
@@ -241,7 +524,11 @@ def ApolloScraper():
     else:
         print(f"[INFO] Successfully loaded .env file from {envPath}")
 
-    browser = uc.Chrome()
+    options = apply_lean_options(uc.ChromeOptions())
+    with chrome_launch_lock:
+        browser = uc.Chrome(options=options)
+    enable_resource_blocking(browser)
+    metrics = BrowserMetrics(browser, "apollo")
 
     try:
         browser.get('https://app.apollo.io/#/login')
@@ -256,64 +543,43 @@ def ApolloScraper():
         # Login using Google
         login_google(browser)
 
-        # Navigate to the appropriate tab
-        peopleTab = WebDriverWait(browser, 30).until(
-            EC.element_to_be_clickable((By.ID, 'side-nav-people'))
+        # Wait for the app to finish loading after the login
+        WebDriverWait(browser, 30).until(
+            EC.presence_of_element_located((By.ID, 'side-nav-people'))
         )
-        peopleTab.click()
-        time.sleep(4)
-
-        print('[INFO] Setting location filters')
-        # Get the filter tabs
-        tabs = browser.find_elements(By.CSS_SELECTOR, 'div.zp-accordion-header.zp_r3aQ1')
-        
-        # Filter locations
-        location_filter(browser, tabs[5])
 
-        # Filter Industry
-        print('[INFO] Setting industry filters')
-        industryFilter(browser, tabs[7])
+        print('[INFO] Scrapping data')
+        cursor = SearchCursor()
+        searchKey = apollo_search_key()
+        startPage = cursor.next_page(searchKey)
+        if startPage > 1:
+            print(f'[INFO] Resuming saved search from page {startPage} ({cursor.rows(searchKey)} rows already saved)')
+        open_search(browser, searchKey, startPage)
 
-        print('[INFO] Setting job filters')
-        # Filter required jobs
-        job_filter(browser, tabs[3])
+        output_dir = Path(__file__).resolve().parents[1] / 'output'
+        # Each page is appended to the raw and cleaned CSVs as soon as it is read
+        headersStr = os.getenv('ROW_HEADERS')
+        rawFile, rawWriter = open_page_csv(output_dir / 'ApolloRaw.csv', headersStr.split(',') if headersStr else [], startPage == 1)
+        cleanFile, cleanWriter = open_page_csv(output_dir / 'ApolloCleaned.csv', get_clean_headers(), startPage == 1)
+
+        def save_page(pageNumber, rawRows, cleanRows):
+            for file, writer, rows in ((rawFile, rawWriter, rawRows), (cleanFile, cleanWriter, cleanRows)):
+                writer.writerows(rows)
+                file.flush()
+                os.fsync(file.fileno())
+            cursor.advance(searchKey, pageNumber, len(cleanRows))
 
-        print('[INFO] Setting email filters')
-        # Only include verified emails
-        tabs[2].click()
-        browser.find_element(By.CLASS_NAME, 'zp_vcdPP').click()
-        
-        print('[INFO] Scrapping data')
-        userDataList = []
-        userDataListClean = []
-        
-        # Collect all the user data into a list for CSV/JSON storage
         isCollectEmails = bool(strtobool(os.getenv('COLLECT_EMAILS')))
-        collect_data(browser, userDataList, userDataListClean, isCollectEmails)
+        try:
+            pagesRead, exhausted = collect_data(browser, isCollectEmails, save_page, startPage, APOLLO_MAX_PAGES, metrics)
+        finally:
+            rawFile.close()
+            cleanFile.close()
 
-        output_dir = Path(__file__).resolve().parents[1] / 'output'
-        print('[INFO] Generating raw csv files')
-        # Write the output to a csv file
-        with open(output_dir / 'ApolloRaw.csv', 'w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            # Load the headers first before writing
-            headersStr = os.getenv('ROW_HEADERS')
-            headers = headersStr.split(',') if headersStr else []
-            # Write to the csv file
-            writer.writerow(headers)
-            writer.writerows(userDataList)
-
-        print('[INFO] Generating cleaned csv files')
-        # Write the cleaned csv file
-        with open(output_dir / 'ApolloCleaned.csv', 'w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            # Load the headers first before writing
-            headersStr = os.getenv('ROW_HEADERS_CLEAN')
-            headers = headersStr.split(',') if headersStr else []
-            # Write to the csv file
-            writer.writerow(headers)
-            # userDataListClean
-            writer.writerows(userDataListClean)
+        if exhausted:
+            # The next pull of this search starts over from the first page
+            cursor.reset(searchKey)
+        print(f'[INFO] Saved {pagesRead} pages')
 
         # Process the cleaned data using the post process function
         print('[INFO] Standardising CSV output')
@@ -340,6 +606,7 @@ def ApolloScraper():
         try:
             print("Completed")
             if 'browser' in locals() and browser:
+                metrics.report()
                 try:
                     browser.quit()
                     print("[INFO] Browser closed")
@@ -1,50 +1,102 @@
 import os
 import sys
 import pandas as pd
+import numpy as np
 import re
 from datetime import datetime
 from urllib.parse import urlparse
 from pathlib import Path
 
+if __package__ in (None, ""):
+    # Allow running as a standalone script (python src/SalesNav_CSVCleaner.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config.config import CSV_CHUNK_SIZE
+from src.utils.chunked_csv import transform_csv
+
 "Output CSV FILE STORED IN OUTPUT FOLDER"
 "INPUT command python SalesNav_CSVCleaner.py ../output/(name).csv "
 "Output CSV FILE STORED IN OUTPUT FOLDER"
 "INPUT command python SalesNav_CSVCleaner.py ../output/(name).csv "
 
+# Column layout of the cleaned leads file
+OUTPUT_COLUMNS = ['first_name', 'last_name', 'Role', 'Emails', 'Domain', 'Phone', 'Misc']
+
+# Patterns and lookup sets are built once here and shared by the scalar and vectorized cleaners
+NON_ASCII_PATTERN = re.compile(r'[^\x00-\x7F]+')
+NICKNAME_PATTERN = re.compile(r'["\'][\w\s]+["\']')
+INITIAL_PATTERN = re.compile(r"[A-Z]\.?")
+CREDENTIAL_PATTERN = re.compile(r"[A-Z0-9\-]+")
+ROMAN_NUMERALS = {"I", "II", "III", "IV", "V"}
+
+# Expanded list of common suffixes and professional certifications to remove
+NAME_SUFFIXES = {
+    # Academic and professional degrees
+    "Jr", "Sr", "II", "III", "IV", "MD", "PhD", "RN", "BSN", "MBA", 
+    "CPA", "CFA", "CWS", "CFP", "DDS", "Esq", "JD", "MSA", "MS", "MA",
+    # Business titles
+    "CEO", "CFO", "COO", "CTO", "CMO", "CHRO", "CIO", "CCO",
+    "President", "VP", "Director", "Manager", "Partner", "Associate",
+    # Real estate specific
+    "REALTOR", "REALTORÂ®", "ARM", "ABR", "GRI", "CRS", "SRS"
+}
+NAME_SUFFIXES_UPPER = {suffix.upper() for suffix in NAME_SUFFIXES}
+
+# Expanded list of domains to ignore
+INVALID_DOMAINS = {
+    # Search engines
+    "google.com", "bing.com", "yahoo.com", "duckduckgo.com",
+    # Social media
+    "twitter.com", "youtube.com", "facebook.com", "instagram.com",
+    "linkedin.com", "tiktok.com", "pinterest.com",
+    # Link aggregators
+    "linktr.ee", "linkin.bio", "bit.ly", "t.co",
+    # Free blogging/hosting
+    "wordpress.com", "blogspot.com", "wix.com", "squarespace.com",
+    "webflow.io", "medium.com", "tumblr.com",
+    # Invalid URL parts
+    "http", "https"
+}
+SEARCH_DOMAINS = ["bing.com", "google.com", "yahoo.com"]
+FREE_HOSTING_DOMAINS = ["wordpress.com", "blogspot.com", "wix.com"]
+COMPANY_SUFFIXES = [' inc', ' llc', ' ltd', ' corp', ' group', ' properties', ' realty', ' homes']
+
+PERSONAL_EMAIL_DOMAINS = {"gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "icloud.com", "aol.com"}
+
+EXECUTIVE_ROLES = {
+    "CEO", "CFO", "COO", "Founder", "Co-Founder", "Owner", "Co-Owner",
+    "Director", "Vice President", 
+    "President", "Chief", "Principal","Chief Executive Officer","Chief Operating Officer",
+    "Chief Financial Officer"
+}
+EXECUTIVE_ROLE_PATTERN = re.compile("|".join(re.escape(role.lower()) for role in EXECUTIVE_ROLES))
+
+# List of roles to EXCLUDE (matched as written against the lowercased title, like extract_role does)
+EXCLUDED_ROLES = {"Coordinator", "Assistant", "Specialist", "Analyst", "Representative", "Associate"}
+EXCLUDED_ROLE_PATTERN = re.compile("|".join(re.escape(role) for role in EXCLUDED_ROLES))
+
+def _keep_name_word(word):
+    """True if a word of a name is not an initial, credential or suffix."""
+    if INITIAL_PATTERN.fullmatch(word):
+        return False
+    # Filter out credential patterns (all caps with possible hyphens, like MSGB-LMOC)
+    if CREDENTIAL_PATTERN.fullmatch(word) and word not in ROMAN_NUMERALS:
+        return False
+    return word.upper() not in NAME_SUFFIXES_UPPER
+
 def clean_name(full_name):
     """Cleans name by removing initials, suffixes, certifications and nicknames."""
     if not full_name or full_name.strip().lower() in {"n/a", "na"}:
         return None, None
 
     # Remove any non-ASCII characters (to handle encoding issues)
-    full_name = re.sub(r'[^\x00-\x7F]+', '', full_name)
+    full_name = NON_ASCII_PATTERN.sub('', full_name)
     
     # Remove nicknames in quotes
-    full_name = re.sub(r'["\'][\w\s]+["\']', '', full_name)
+    full_name = NICKNAME_PATTERN.sub('', full_name)
     
-    # Split into words
-    words = full_name.replace(",", "").split()  # Remove commas before splitting
-
-    # Remove initials (single letters with or without a dot)
-    words = [word for word in words if not re.fullmatch(r"[A-Z]\.?$", word)]
-    
-    # Expanded list of common suffixes and professional certifications to remove
-    suffixes = {
-        # Academic and professional degrees
-        "Jr", "Sr", "II", "III", "IV", "MD", "PhD", "RN", "BSN", "MBA", 
-        "CPA", "CFA", "CWS", "CFP", "DDS", "Esq", "JD", "MSA", "MS", "MA",
-        # Business titles
-        "CEO", "CFO", "COO", "CTO", "CMO", "CHRO", "CIO", "CCO",
-        "President", "VP", "Director", "Manager", "Partner", "Associate",
-        # Real estate specific
-        "REALTOR", "REALTORÂ®", "ARM", "ABR", "GRI", "CRS", "SRS"
-    }
-
-    # Filter out credential patterns (all caps with possible hyphens, like MSGB-LMOC)
-    words = [word for word in words if not re.fullmatch(r"[A-Z0-9\-]+$", word) or word in {"I", "II", "III", "IV", "V"}]
-    
-    # Remove suffixes (case-insensitive comparison)
-    words = [word for word in words if word.upper() not in {s.upper() for s in suffixes}]
+    # Split into words, removing commas first, and drop initials, credentials and suffixes
+    words = [word for word in full_name.replace(",", "").split() if _keep_name_word(word)]
 
     # Ensure we have at least two words left for first and last name
     if len(words) < 2:
@@ -53,119 +105,150 @@ def clean_name(full_name):
     # Always return the first two remaining words as first and last name
     return words[0], words[1]
 
+def _website_domain(website):
+    """Extracts a valid business domain from a website URL, or None."""
+    if not website or website == "N/A":
+        return None
+
+    try:
+        if not website.startswith(('http://', 'https://')):
+            website = 'https://' + website
+        parsed_url = urlparse(website)
+        domain = parsed_url.netloc or parsed_url.path
+
+        # Remove "www." prefix
+        if domain.startswith('www.'):
+            domain = domain[4:]
+
+        # Handle search URLs
+        if any(search_domain in domain for search_domain in SEARCH_DOMAINS) and "search" in parsed_url.path:
+            return None
+
+        # Ignore invalid domains
+        if domain in INVALID_DOMAINS or not domain or domain.count('.') < 1:
+            return None
+            
+        # Handle free subdomains of blogging platforms
+        if any(domain.endswith(f".{free_domain}") for free_domain in FREE_HOSTING_DOMAINS):
+            return None
+
+        return domain
+    except Exception:
+        return None
+
+def _company_domain(company):
+    """Guesses a domain from the company name, or None."""
+    if not company or company == "N/A":
+        return None
+
+    company = company.lower()
+    for suffix in COMPANY_SUFFIXES:
+        if company.endswith(suffix):
+            company = company[:-len(suffix)]
+
+    company = ''.join(c for c in company if c.isalnum() or c == ' ')
+    company = company.strip().replace(' ', '')
+
+    return f"{company}.com" if company else None
+
 def extract_domain(website, company):
     """Extracts a valid business domain from the website URL or company name."""
-    
-    # Expanded list of domains to ignore
-    invalid_domains = {
-        # Search engines
-        "google.com", "bing.com", "yahoo.com", "duckduckgo.com",
-        # Social media
-        "twitter.com", "youtube.com", "facebook.com", "instagram.com",
-        "linkedin.com", "tiktok.com", "pinterest.com",
-        # Link aggregators
-        "linktr.ee", "linkin.bio", "bit.ly", "t.co",
-        # Free blogging/hosting
-        "wordpress.com", "blogspot.com", "wix.com", "squarespace.com",
-        "webflow.io", "medium.com", "tumblr.com",
-        # Invalid URL parts
-        "http", "https"
-    }
-
-    domain = None  # Default value
-
-    if website and website != "N/A":
-        try:
-            if not website.startswith(('http://', 'https://')):
-                website = 'https://' + website
-            parsed_url = urlparse(website)
-            domain = parsed_url.netloc or parsed_url.path
-
-            # Remove "www." prefix
-            if domain.startswith('www.'):
-                domain = domain[4:]
-
-            # Handle search URLs
-            if any(search_domain in domain for search_domain in ["bing.com", "google.com", "yahoo.com"]) and "search" in parsed_url.path:
-                domain = None
-
-            # Ignore invalid domains
-            if domain in invalid_domains or not domain or domain.count('.') < 1:
-                domain = None
-                
-            # Handle free subdomains of blogging platforms
-            if domain and any(domain.endswith(f".{free_domain}") for free_domain in ["wordpress.com", "blogspot.com", "wix.com"]):
-                domain = None
-
-        except Exception:
-            domain = None
-    
-    # Extract domain from company name if the website is invalid
-    if not domain and company and company != "N/A":
-        company = company.lower()
-        for suffix in [' inc', ' llc', ' ltd', ' corp', ' group', ' properties', ' realty', ' homes']:
-            if company.endswith(suffix):
-                company = company[:-len(suffix)]
-
-        company = ''.join(c for c in company if c.isalnum() or c == ' ')
-        company = company.strip().replace(' ', '')
-
-        if company:
-            return f"{company}.com"
-    
-    return domain
+    # Fall back to the company name if the website is invalid
+    return _website_domain(website) or _company_domain(company)
 
 def is_business_email(email):
     """Check if an email is a business email. Returns True if business, False if personal."""
-    personal_domains = {"gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "icloud.com", "aol.com"}
     if "@" in email:
         domain = email.split('@')[-1].strip().lower()
-        return domain not in personal_domains and "." in domain  # Ensure it’s a valid domain
+        return domain not in PERSONAL_EMAIL_DOMAINS and "." in domain  # Ensure it’s a valid domain
     return False
 
 
 def extract_role(title):
-    
-    executive_roles = {
-        "CEO", "CFO", "COO", "Founder", "Co-Founder", "Owner", "Co-Owner",
-        "Director", "Vice President", 
-        "President", "Chief", "Principal","Chief Executive Officer","Chief Operating Officer",
-        "Chief Financial Officer"
-    }
-
-    # List of roles to EXCLUDE
-    excluded_roles = {"Coordinator", "Assistant", "Specialist", "Analyst", "Representative", "Associate"}
-
+    """Return the title if it is an executive role, otherwise None."""
     # Convert title to lowercase for case-insensitive matching
     title_lower = title.lower()
 
     # If a high-level executive role is found, return the full title
-    if any(role.lower() in title_lower for role in executive_roles):
+    if EXECUTIVE_ROLE_PATTERN.search(title_lower):
         # Ensure the title does NOT contain excluded words
-        if not any(excluded in title_lower for excluded in excluded_roles):
+        if not EXCLUDED_ROLE_PATTERN.search(title_lower):
             return title  
 
     return None  
 
-
-
-def process_csv(input_file, output_folder):
-    """Process the CSV file and save the output."""
-    df = pd.read_csv(input_file)
+def _map_unique(values, func):
+    """Apply func once per distinct value and broadcast the results back to every row."""
+    codes, uniques = pd.factorize(values)
+    results = np.array([func(value) for value in uniques] + [None], dtype=object)
+    return results[codes]
+
+def clean_names(names):
+    """Vectorized clean_name: return first and last name Series (None where no full name remains)."""
+    names = names.astype(str).reset_index(drop=True)
+    cleaned = (names.str.replace(NON_ASCII_PATTERN, '', regex=True)
+                    .str.replace(NICKNAME_PATTERN, '', regex=True)
+                    .str.replace(",", "", regex=False))
+
+    # One row per word; each distinct word is checked once and the verdict broadcast back
+    words = cleaned.str.split().explode().dropna()
+    words = words[_map_unique(words, _keep_name_word).astype(bool)]
+
+    position = words.groupby(level=0).cumcount()
+    first = words[position == 0].reindex(names.index)
+    last = words[position == 1].reindex(names.index)
+
+    # Only rows with at least two words left have a full name
+    has_name = last.notna()
+    first = first.where(has_name, None).astype(object)
+    last = last.where(has_name, None).astype(object)
+    return first.to_numpy(), last.to_numpy()
+
+def extract_roles(titles):
+    """Vectorized extract_role over a Series of titles."""
+    titles = titles.astype(str)
+    titles_lower = titles.str.lower()
+    is_executive = (titles_lower.str.contains(EXECUTIVE_ROLE_PATTERN, regex=True)
+                    & ~titles_lower.str.contains(EXCLUDED_ROLE_PATTERN, regex=True))
+    return titles.where(is_executive, None)
+
+def business_emails(emails):
+    """Vectorized is_business_email: keep business emails and replace the rest with "N/A"."""
+    text = emails.astype(str)
+    # Everything after the last '@', like email.split('@')[-1]
+    domains = text.str.extract(r'([^@]*)$', expand=False).str.strip().str.lower()
+    is_business = (text.str.contains('@', regex=False)
+                   & ~domains.isin(PERSONAL_EMAIL_DOMAINS)
+                   & domains.str.contains('.', regex=False))
+    return emails.where(is_business, "N/A")
+
+def extract_domains(websites, companies):
+    """Vectorized extract_domain over website and company Series."""
+    website_domains = _map_unique(websites.astype(str), _website_domain)
+    company_domains = _map_unique(companies.astype(str), _company_domain)
+    return np.where(pd.isna(website_domains), company_domains, website_domains)
+
+def clean_dataframe(df):
+    """Clean raw Sales Navigator leads and return them in the standard column layout."""
+    df = df.copy()
 
     # Clean names
-    df[['first_name', 'last_name']] = df['Name'].astype(str).apply(clean_name).apply(pd.Series)
+    df['first_name'], df['last_name'] = clean_names(df['Name'])
     df = df.dropna(subset=['first_name', 'last_name'])
 
     # Extract roles
-    df['Role'] = df['Title'].astype(str).apply(extract_role)
+    df['Role'] = extract_roles(df['Title'])
     df = df.dropna(subset=['Role'])
 
+    # Nothing left to clean
+    if df.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
     # Ensure business emails are used, but keep personal emails if a domain exists
-    df['Emails'] = df['Email'].apply(lambda x: x if is_business_email(str(x)) else "N/A")
+    df['Emails'] = business_emails(df['Email'])
 
-    # Extract domain from website or company name
-    df['Domain'] = df.apply(lambda row: extract_domain(str(row['Website']), str(row['Company'])), axis=1)
+    # Extract domain from website or company name, parsing each distinct value once
+    df['Domain'] = extract_domains(df['Website'], df['Company'])
 
     # Drop rows where both email is personal AND no domain exists
     df = df[~((df['Emails'] == "N/A") & (df['Domain'].isna()))]
@@ -177,19 +260,21 @@ def process_csv(input_file, output_folder):
     df['Misc'] = df['Profile URL']
 
   
-    df = df[['first_name', 'last_name', 'Role', 'Emails', 'Domain', 'Phone', 'Misc']]
-
-    print(f"Final Row Count: {len(df)}") 
+    return df[OUTPUT_COLUMNS]
 
+def process_csv(input_file, output_folder, chunksize=CSV_CHUNK_SIZE):
+    """Process the CSV file chunk by chunk and save the output."""
     # Ensure the output folder exists
     os.makedirs(output_folder, exist_ok=True)
 
     # Save processed file
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    output_file = output_folder / f'processed_leads_{timestamp}.csv'
+    output_file = Path(output_folder) / f'processed_leads_{timestamp}.csv'
 
-    df.to_csv(output_file, index=False)
+    _, rows = transform_csv(input_file, output_file, clean_dataframe, chunksize)
+    print(f"Final Row Count: {rows}") 
     print(f"Processed file saved: {output_file}")
+    return output_file
 
 
 
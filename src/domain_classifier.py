@@ -0,0 +1,134 @@
+"""
+Domain classification for email pattern generation
+Decides once per domain whether it is deliverable, catch-all or dead so the
+pattern generator doesn't spend verifications on domains that can't tell
+candidates apart
+"""
+import uuid
+import socket
+import logging
+
+try:
+    import dns.resolver
+    import dns.exception
+except ImportError:  # dnspython is optional; fall back to address lookups
+    dns = None
+
+logger = logging.getLogger(__name__)
+
+DELIVERABLE = "deliverable"
+CATCH_ALL = "catch_all"
+DEAD = "dead"
+UNKNOWN = "unknown"
+
+class DnsResolver:
+    """Looks up the mail servers for a domain
+
+    Any object with a resolve_mx(domain) method can stand in for this class,
+    e.g. a stub resolver backed by a dict in tests.
+    """
+
+    def __init__(self, timeout=5):
+        """Initialize with a lookup timeout in seconds"""
+        self.timeout = timeout
+
+    def resolve_mx(self, domain):
+        """Return the mail hosts for a domain, or [] when it cannot receive mail
+
+        Raises an exception for transient lookup failures so the caller
+        doesn't cache a temporary error as a dead domain.
+        """
+        if dns is not None:
+            try:
+                answers = dns.resolver.resolve(domain, "MX", lifetime=self.timeout)
+                return [str(answer.exchange).rstrip(".") for answer in answers]
+            except dns.resolver.NXDOMAIN:
+                return []
+            except dns.resolver.NoAnswer:
+                # No MX records: fall back to the implicit MX (the domain's own address)
+                pass
+
+        try:
+            socket.getaddrinfo(domain, 25)
+            return [domain]
+        except socket.gaierror as e:
+            if e.errno == socket.EAI_AGAIN:
+                raise
+            return []
+
+class DomainClassifier:
+    """Classifies domains as deliverable, catch-all or dead and caches the answer"""
+
+    def __init__(self, probe, cache=None, resolver=None):
+        """
+        Args:
+            probe: function(email) -> (status, score) or None, used to test a random address
+            cache: optional VerificationCache for storing classifications
+            resolver: object with a resolve_mx(domain) method (defaults to DnsResolver)
+        """
+        self.probe = probe
+        self.cache = cache
+        self.resolver = resolver or DnsResolver()
+        self._memo = {}
+        # domain -> whether it has mail servers, for domains classified without a probe
+        self._has_mail = {}
+
+    def classify(self, domain, probe=True):
+        """Return the classification for a domain
+
+        With probe=False no verification is spent: dead domains are still caught
+        by the MX lookup, and anything else comes back UNKNOWN (and isn't cached).
+        """
+        domain = domain.strip().lower()
+
+        if domain in self._memo:
+            return self._memo[domain]
+
+        if self.cache:
+            cached = self.cache.get_domain(domain)
+            if cached:
+                self._memo[domain] = cached
+                return cached
+
+        classification = self._classify_uncached(domain) if probe else self._classify_without_probe(domain)
+
+        # Only remember definite answers; unknown domains are retried next time
+        if classification != UNKNOWN:
+            self._memo[domain] = classification
+            if self.cache:
+                self.cache.set_domain(domain, classification)
+
+        logger.info(f"Domain {domain} classified as {classification}")
+        return classification
+
+    def _classify_without_probe(self, domain):
+        """Return DEAD if the domain has no mail servers, else UNKNOWN; one MX lookup per domain"""
+        if domain not in self._has_mail:
+            try:
+                self._has_mail[domain] = bool(self.resolver.resolve_mx(domain))
+            except Exception as e:
+                logger.warning(f"MX lookup failed for {domain}: {e}")
+                return UNKNOWN
+        return UNKNOWN if self._has_mail[domain] else DEAD
+
+    def _classify_uncached(self, domain):
+        """Look up MX records and probe for catch-all behaviour"""
+        try:
+            mail_hosts = self.resolver.resolve_mx(domain)
+        except Exception as e:
+            logger.warning(f"MX lookup failed for {domain}: {e}")
+            return UNKNOWN
+
+        if not mail_hosts:
+            return DEAD
+
+        # An address nobody would use only verifies if the server accepts everything
+        probe_email = f"zz{uuid.uuid4().hex[:12]}@{domain}"
+        result = self.probe(probe_email)
+        if result is None:
+            return UNKNOWN
+
+        status, score = result
+        if status in ("accept_all", "deliverable", "valid") or (score or 0) >= 50:
+            return CATCH_ALL
+        return DELIVERABLE
@@ -3,22 +3,25 @@ Email pattern generation fallback for LinkedIn leads
 This script implements fallback pattern generation when Snov.io can't find emails
 """
 import os
-import requests
 import pandas as pd
 import time
 import logging
 import re
+import sys
+from pathlib import Path
+from collections import Counter
+
+if __package__ in (None, ""):
+    # Allow running as a standalone script (python src/email_pattern_generator.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config.config import CSV_CHUNK_SIZE, CATCH_ALL_PROBE_MIN_LEADS
+from src.utils.verification_cache import get_verification_cache
+from src.utils.chunked_csv import transform_csv
+from src.utils.http_client import get_client
+from src.utils.stage_cache import mark_stage_error
+from src.domain_classifier import DomainClassifier, CATCH_ALL, DEAD
 
-# Setup logging
-os.makedirs("logs", exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(f"logs/pattern_generator_{time.strftime('%Y%m%d_%H%M%S')}.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Hunter.io API details
@@ -56,39 +59,110 @@ def extract_domain_from_company(company):
     
     return None
 
-def generate_email_patterns(first_name, last_name, domain):
-    """Generate various email patterns based on name and domain"""
-    if not first_name or not last_name or not domain:
-        return []
-    
+def candidate_local_parts(first_name, last_name):
+    """Build (pattern name, local part) pairs for the common email formats"""
     # Clean up names
     first_name = first_name.lower().strip()
     last_name = last_name.lower().strip()
     
+    if not first_name or not last_name:
+        return []
+    
     # Generate common patterns
     patterns = [
-        f"{first_name}@{domain}",
-        f"{last_name}@{domain}",
-        f"{first_name}{last_name}@{domain}",
-        f"{first_name}.{last_name}@{domain}",
-        f"{first_name[0]}{last_name}@{domain}",
-        f"{first_name[0]}.{last_name}@{domain}",
-        f"{first_name}_{last_name}@{domain}",
-        f"{first_name}-{last_name}@{domain}",
-        f"{last_name}{first_name}@{domain}",
-        f"{last_name}.{first_name}@{domain}",
+        ("first", first_name),
+        ("last", last_name),
+        ("firstlast", f"{first_name}{last_name}"),
+        ("first.last", f"{first_name}.{last_name}"),
+        ("flast", f"{first_name[0]}{last_name}"),
+        ("f.last", f"{first_name[0]}.{last_name}"),
+        ("first_last", f"{first_name}_{last_name}"),
+        ("first-last", f"{first_name}-{last_name}"),
+        ("lastfirst", f"{last_name}{first_name}"),
+        ("last.first", f"{last_name}.{first_name}"),
         # Try with first name shortened (e.g., Dave for David)
-        f"{first_name[:3]}@{domain}" if len(first_name) > 3 else None,
-        f"{first_name[:3]}{last_name}@{domain}" if len(first_name) > 3 else None
+        ("fir", first_name[:3]) if len(first_name) > 3 else None,
+        ("firlast", f"{first_name[:3]}{last_name}") if len(first_name) > 3 else None
     ]
     
     # Remove any None entries
     return [p for p in patterns if p]
 
-def verify_email(email):
-    """Verify if an email is valid using Hunter.io API"""
-    if not email or email.lower() in ['n/a', 'na', '', 'nan', 'none']:
-        return False
+class DomainPatternModel:
+    """Learns which email format each domain uses from confirmed addresses"""
+    
+    def __init__(self):
+        """Start with no known domain formats"""
+        # domain -> {pattern name: number of confirmed emails using it}
+        self.domain_patterns = {}
+    
+    def learn(self, email, first_name, last_name):
+        """Record the format of a confirmed email and return the matching pattern name"""
+        if not email or '@' not in email or not first_name or not last_name:
+            return None
+        
+        local_part, domain = email.strip().lower().rsplit('@', 1)
+        for pattern_name, candidate in candidate_local_parts(first_name, last_name):
+            if candidate == local_part:
+                counts = self.domain_patterns.setdefault(domain, {})
+                counts[pattern_name] = counts.get(pattern_name, 0) + 1
+                return pattern_name
+        
+        return None
+    
+    def best_pattern(self, domain):
+        """Return the most frequently confirmed pattern name for a domain, if any"""
+        counts = self.domain_patterns.get(domain.lower())
+        if not counts:
+            return None
+        return max(counts, key=counts.get)
+    
+    def rank(self, domain, candidates):
+        """Order (pattern name, email) candidates by how often the domain confirmed each format"""
+        counts = self.domain_patterns.get(domain.lower(), {})
+        # sorted() is stable, so unknown formats keep the default order
+        return sorted(candidates, key=lambda candidate: -counts.get(candidate[0], 0))
+
+def generate_email_patterns(first_name, last_name, domain, pattern_model=None):
+    """Generate various email patterns based on name and domain, best guesses first"""
+    if not first_name or not last_name or not domain:
+        return []
+    
+    candidates = [(name, f"{local_part}@{domain}") for name, local_part in candidate_local_parts(first_name, last_name)]
+    
+    # Put the domain's known format(s) first when we have learned them
+    if pattern_model:
+        candidates = pattern_model.rank(domain, candidates)
+    
+    return [email for _, email in candidates]
+
+def get_lead_names(row, columns):
+    """Get a lead's first and last name, falling back to splitting the full name"""
+    first_name = str(row['first_name']).strip() if pd.notna(row['first_name']) else ""
+    last_name = str(row['last_name']).strip() if pd.notna(row['last_name']) else ""
+    
+    # If missing first/last name but have full name, try to split it
+    if (not first_name or not last_name) and 'Name' in columns:
+        name = str(row['Name']).strip() if pd.notna(row['Name']) else ""
+        if name and ' ' in name:
+            name_parts = name.split()
+            first_name = name_parts[0] if not first_name else first_name
+            last_name = name_parts[-1] if not last_name else last_name
+    
+    return first_name, last_name
+
+def fetch_verification(email, cache_result=True):
+    """Get the Hunter.io (status, score) for an email, or None if the lookup failed
+    
+    Pass cache_result=False for throwaway addresses (e.g. catch-all probes) that
+    shouldn't be stored in the verification cache.
+    """
+    # Reuse a recent result instead of spending an API call
+    cached = get_verification_cache().get(email)
+    if cached:
+        status, score = cached
+        logger.info(f"Pattern {email} verification (cached): status={status}, score={score}")
+        return status, score
     
     logger.info(f"Verifying email pattern: {email}")
     
@@ -98,7 +172,7 @@ def verify_email(email):
     }
     
     try:
-        response = requests.get(HUNTER_VERIFY_URL, params=params)
+        response = get_client("hunter").get(HUNTER_VERIFY_URL, params=params)
         
         if response.status_code == 200:
             data = response.json()
@@ -110,25 +184,79 @@ def verify_email(email):
             status = result.get('status', '')
             score = result.get('score', 0)
             logger.info(f"Pattern {email} verification: status={status}, score={score}")
-            
-            # Check if email is valid
-            is_valid = status == 'deliverable' or score >= 50
-            return is_valid
+            if cache_result:
+                get_verification_cache().set(email, status, score)
+            return status, score
         else:
             logger.warning(f"API error: {response.status_code}, {response.text}")
-            return False
+            return None
             
     except Exception as e:
         logger.error(f"Error verifying email pattern {email}: {e}")
+        return None
+
+def verify_email(email):
+    """Verify if an email is valid using Hunter.io API (None if Hunter.io gave no answer)"""
+    if not email or email.lower() in ['n/a', 'na', '', 'nan', 'none']:
         return False
+    
+    result = fetch_verification(email)
+    if not result:
+        return None
+    
+    # Check if email is valid
+    status, score = result
+    return status == 'deliverable' or (score or 0) >= 50
 
-def process_csv(file_path):
-    """Process a CSV file to generate email patterns for missing emails"""
-    logger.info(f"Processing file: {file_path}")
+def probe_domain(email):
+    """Catch-all probe: verify a random address without caching it"""
+    return fetch_verification(email, cache_result=False)
+
+def get_lead_domain(row, columns):
+    """Get a lead's email domain from its website, domain or company name"""
+    domain = None
+    website = str(row['website']).strip() if 'website' in columns and pd.notna(row['website']) else ""
+    if website and website.lower() not in ['n/a', 'na', '', 'nan', 'none']:
+        domain = extract_domain_from_website(website)
+    
+    if not domain and 'domain' in columns and pd.notna(row['domain']):
+        domain = str(row['domain']).strip()
+    
+    if not domain:
+        company = str(row['company']).strip() if 'company' in columns and pd.notna(row['company']) else ""
+        if company and company.lower() not in ['n/a', 'na', '', 'nan', 'none']:
+            domain = extract_domain_from_company(company)
+    
+    return domain
+
+def missing_email(row):
+    """True if the row's email is empty or a placeholder"""
+    email = str(row['email']).strip() if pd.notna(row['email']) else ""
+    return email.lower() in ['n/a', 'na', '', 'nan', 'none']
+
+def learn_from_dataframe(pattern_model, df):
+    """Teach the pattern model the format of every confirmed email in a DataFrame"""
+    if 'email' not in df.columns:
+        return
     
+    for idx, row in df.iterrows():
+        email = str(row['email']).strip() if pd.notna(row['email']) else ""
+        if email.lower() in ['n/a', 'na', '', 'nan', 'none']:
+            continue
+        if 'Email_Verified' in df.columns and str(row['Email_Verified']).lower() == 'false':
+            continue
+        first_name, last_name = get_lead_names(row, df.columns)
+        pattern_model.learn(email, first_name, last_name)
+
+def process_dataframe(df, pattern_model=None):
+    """Generate verified email patterns for leads with missing emails
+    
+    Pass a shared DomainPatternModel to keep learned domain formats across calls.
+    """
     try:
-        # Read CSV file
-        df = pd.read_csv(file_path)
+        # Track cache usage for this run
+        cache = get_verification_cache()
+        cache_hits, cache_misses = cache.hits, cache.misses
         
         # Ensure all string columns are properly typed 
         for col in df.columns:
@@ -168,88 +296,155 @@ def process_csv(file_path):
         # Add pattern generation tracking column
         df['Email_Pattern_Generated'] = False
         
+        # Learn each domain's email format from leads that already have a confirmed email
+        # (found by Snov.io, supplied by Apollo, or verified earlier)
+        if pattern_model is None:
+            pattern_model = DomainPatternModel()
+        learn_from_dataframe(pattern_model, df)
+        
+        logger.info(f"Learned email formats for {len(pattern_model.domain_patterns)} domains")
+        verification_attempts = 0
+        
+        # Classify each domain once so catch-all and dead domains don't burn the whole pattern loop
+        domain_classifier = DomainClassifier(probe=probe_domain, cache=cache)
+        # The catch-all probe costs a verification, so only spend it where several leads need a pattern
+        leads_per_domain = Counter(
+            domain.lower() for _, row in df.iterrows() if missing_email(row)
+            for domain in [get_lead_domain(row, df.columns)] if domain
+        )
+        df['Domain_Status'] = ''
+        dead_domain_count = 0
+        catch_all_count = 0
+        failed_lookup_count = 0
+        
         # Process each row
         for idx, row in df.iterrows():
-            email = str(row['email']).strip() if pd.notna(row['email']) else ""
-            
             # Only process rows with missing or N/A emails
-            if email.lower() in ['n/a', 'na', '', 'nan', 'none']:
+            if missing_email(row):
                 missing_email_count += 1
                 logger.info(f"Row {idx}: Email is missing, attempting pattern generation")
                 
                 # Get first and last name
-                first_name = str(row['first_name']).strip() if pd.notna(row['first_name']) else ""
-                last_name = str(row['last_name']).strip() if pd.notna(row['last_name']) else ""
-                
-                # If missing first/last name but have full name, try to split it
-                if (not first_name or not last_name) and 'Name' in df.columns:
-                    name = str(row['Name']).strip() if pd.notna(row['Name']) else ""
-                    if name and ' ' in name:
-                        name_parts = name.split()
-                        first_name = name_parts[0] if not first_name else first_name
-                        last_name = name_parts[-1] if not last_name else last_name
+                first_name, last_name = get_lead_names(row, df.columns)
                 
                 # Get domain from website or company name
-                domain = None
-                website = str(row['website']).strip() if 'website' in df.columns and pd.notna(row['website']) else ""
-                if website and website.lower() not in ['n/a', 'na', '', 'nan', 'none']:
-                    domain = extract_domain_from_website(website)
-                
-                if not domain and 'domain' in df.columns and pd.notna(row['domain']):
-                    domain = str(row['domain']).strip()
-                
-                if not domain:
-                    company = str(row['company']).strip() if 'company' in df.columns and pd.notna(row['company']) else ""
-                    if company and company.lower() not in ['n/a', 'na', '', 'nan', 'none']:
-                        domain = extract_domain_from_company(company)
+                domain = get_lead_domain(row, df.columns)
                 
                 # Generate and verify email patterns
                 if first_name and last_name and domain:
-                    patterns_generated += 1
-                    logger.info(f"Generating email patterns for {first_name} {last_name} at {domain}")
-                    email_patterns = generate_email_patterns(first_name, last_name, domain)
-                    
-                    valid_emails = []
-                    for pattern in email_patterns:
-                        if verify_email(pattern):
-                            valid_emails.append(pattern)
-                            # Break after finding the first valid pattern to save API calls
-                            break
+                    # A learned format or a single lead is cheaper to verify directly than to probe
+                    should_probe = (leads_per_domain[domain.lower()] >= CATCH_ALL_PROBE_MIN_LEADS
+                                    and not pattern_model.best_pattern(domain))
+                    domain_status = domain_classifier.classify(domain, probe=should_probe)
+                    df.at[idx, 'Domain_Status'] = domain_status
                     
-                    if valid_emails:
-                        patterns_verified += 1
-                        best_email = valid_emails[0]  # Use the first valid email pattern
+                    if domain_status == DEAD:
+                        dead_domain_count += 1
+                        logger.warning(f"Skipping {first_name} {last_name}: {domain} has no mail server")
+                    elif domain_status == CATCH_ALL:
+                        # Every candidate would verify, so take the best-ranked guess without spending calls
+                        catch_all_count += 1
+                        best_email = generate_email_patterns(first_name, last_name, domain, pattern_model)[0]
                         df.at[idx, 'email'] = best_email
                         df.at[idx, 'Email_Pattern_Generated'] = True
-                        logger.info(f"Found valid email pattern: {best_email}")
+                        logger.info(f"{domain} accepts all addresses, using unverified guess: {best_email}")
                     else:
-                        logger.warning(f"No valid email patterns found for {first_name} {last_name} at {domain}")
+                        patterns_generated += 1
+                        logger.info(f"Generating email patterns for {first_name} {last_name} at {domain}")
+                        known_pattern = pattern_model.best_pattern(domain)
+                        if known_pattern:
+                            logger.info(f"Trying known format '{known_pattern}' for {domain} first")
+                        email_patterns = generate_email_patterns(first_name, last_name, domain, pattern_model)
+                        
+                        valid_emails = []
+                        lookup_failed = False
+                        for pattern in email_patterns:
+                            verification_attempts += 1
+                            is_valid = verify_email(pattern)
+                            if is_valid is None:
+                                # Rate limited or API error: the remaining candidates would fail too
+                                lookup_failed = True
+                                break
+                            if is_valid:
+                                valid_emails.append(pattern)
+                                # Break after finding the first valid pattern to save API calls
+                                break
+                        
+                        if valid_emails:
+                            patterns_verified += 1
+                            best_email = valid_emails[0]  # Use the first valid email pattern
+                            df.at[idx, 'email'] = best_email
+                            df.at[idx, 'Email_Pattern_Generated'] = True
+                            logger.info(f"Found valid email pattern: {best_email}")
+                            # Later leads at this domain try the confirmed format first
+                            pattern_model.learn(best_email, first_name, last_name)
+                        elif lookup_failed:
+                            failed_lookup_count += 1
+                            mark_stage_error(df, idx)
+                            logger.warning(f"Could not verify patterns for {first_name} {last_name} at {domain}, try again later")
+                        else:
+                            logger.warning(f"No valid email patterns found for {first_name} {last_name} at {domain}")
                 else:
                     logger.warning(f"Insufficient data to generate email patterns for row {idx}")
-            
-            # Add small delay between API calls
-            time.sleep(1)
-        
-        # Save updates back to the CSV file
-        df.to_csv(file_path, index=False)
         
         logger.info(f"Pattern generation complete:")
         logger.info(f"  - Total leads: {total_leads}")
         logger.info(f"  - Leads with missing emails: {missing_email_count}")
         logger.info(f"  - Patterns generated: {patterns_generated}")
         logger.info(f"  - Leads with verified pattern emails: {patterns_verified}")
-        logger.info(f"  - Original file updated: {file_path}")
+        logger.info(f"  - Pattern verifications attempted: {verification_attempts}")
+        logger.info(f"  - Domains with learned formats: {len(pattern_model.domain_patterns)}")
+        logger.info(f"  - Leads skipped on dead domains: {dead_domain_count}")
+        logger.info(f"  - Leads guessed on catch-all domains: {catch_all_count}")
+        logger.info(f"  - Leads not checked (provider error): {failed_lookup_count}")
+        logger.info(f"  - Cache hits: {cache.hits - cache_hits}")
+        logger.info(f"  - Cache misses: {cache.misses - cache_misses}")
         
-        return True
+        return df
+    
+    except Exception as e:
+        logger.error(f"Error generating email patterns: {e}")
+        return None
+
+def process_csv(file_path, chunksize=CSV_CHUNK_SIZE):
+    """Process a CSV file to generate email patterns for missing emails"""
+    logger.info(f"Processing file: {file_path}")
+    
+    # Shared across chunks so later chunks use the formats learned from earlier ones
+    pattern_model = DomainPatternModel()
     
+    try:
+        # Read, process and save the CSV a chunk at a time so large files fit in memory
+        result = transform_csv(file_path, file_path,
+                               lambda chunk: process_dataframe(chunk, pattern_model), chunksize)
     except Exception as e:
         logger.error(f"Error processing CSV file: {e}")
         return False
+    
+    if result is None:
+        return False
+    
+    logger.info(f"Original file updated: {file_path}")
+    return True
+
+def setup_logging():
+    """Log to the console and a timestamped file when run as a script"""
+    os.makedirs("logs", exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler(f"logs/pattern_generator_{time.strftime('%Y%m%d_%H%M%S')}.log"),
+            logging.StreamHandler()
+        ]
+    )
 
 def main():
     """Main function to generate email patterns for LinkedIn leads with missing emails"""
     import argparse
     
+    setup_logging()
+    
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Generate email patterns for LinkedIn leads with missing emails')
     parser.add_argument('--file', help='Specific CSV file to process (relative to output directory)')
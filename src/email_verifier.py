@@ -3,21 +3,23 @@ Email verification using Hunter.io API
 This script checks if emails from LinkedIn leads are valid
 """
 import os
-import requests
+import sys
+import asyncio
 import pandas as pd
 import time
 import logging
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Allow running as a standalone script (python src/email_verifier.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config.config import VERIFY_CONCURRENCY, CSV_CHUNK_SIZE
+from src.utils.verification_cache import get_verification_cache
+from src.utils.http_client import get_client, RateLimitedError
+from src.utils.chunked_csv import transform_csv
+from src.utils.stage_cache import mark_stage_error
 
-# Setup logging
-os.makedirs("logs", exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(f"logs/email_verifier_{time.strftime('%Y%m%d_%H%M%S')}.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Hunter.io API details
@@ -25,11 +27,21 @@ HUNTER_API_KEY = "e245d54a727765469f2cf49ac56ad9681ce2c1f2"
 HUNTER_VERIFY_URL = "https://api.hunter.io/v2/email-verifier"
 
 def verify_email(email):
-    """Verify if an email is valid using Hunter.io API"""
+    """Verify if an email is valid using Hunter.io API
+    
+    Returns True or False, or None if Hunter.io gave no answer (rate limited, API or network error).
+    """
     if not email or email.lower() in ['n/a', 'na', '', 'nan', 'none']:
         logger.info(f"Empty email provided, skipping verification")
         return False
     
+    # Reuse a recent result instead of spending an API call
+    cached = get_verification_cache().get(email)
+    if cached:
+        status, score = cached
+        logger.info(f"Email {email} verification result (cached): status={status}, score={score}")
+        return status == 'deliverable' or (score or 0) >= 50
+    
     logger.info(f"Verifying email: {email}")
     
     params = {
@@ -38,7 +50,7 @@ def verify_email(email):
     }
     
     try:
-        response = requests.get(HUNTER_VERIFY_URL, params=params)
+        response = get_client("hunter").get(HUNTER_VERIFY_URL, params=params)
         
         if response.status_code == 200:
             data = response.json()
@@ -50,25 +62,53 @@ def verify_email(email):
             status = result.get('status', '')
             score = result.get('score', 0)
             logger.info(f"Email {email} verification result: status={status}, score={score}")
+            get_verification_cache().set(email, status, score)
             
             # Check if email is valid (status is 'deliverable' or score is high)
             is_valid = status == 'deliverable' or score >= 50
             return is_valid
         else:
             logger.warning(f"API error: {response.status_code}, {response.text}")
-            return False
-            
+            return None
+    
+    except RateLimitedError as e:
+        logger.warning(f"Could not verify {email}: {e}")
+        return None
     except Exception as e:
         logger.error(f"Error verifying email {email}: {e}")
-        return False
+        return None
 
-def process_csv(file_path):
-    """Process a CSV file to verify emails"""
-    logger.info(f"Processing file: {file_path}")
+async def verify_emails_async(emails, concurrency=VERIFY_CONCURRENCY, requests_per_second=None):
+    """Verify emails concurrently and return the results in input order
+    
+    The request rate is capped by the shared Hunter.io token bucket;
+    requests_per_second overrides its configured rate.
+    """
+    if requests_per_second:
+        get_client("hunter").limiter.set_rate(requests_per_second)
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def verify_one(email):
+        async with semaphore:
+            # verify_email is blocking, so run it on a worker thread
+            return await asyncio.to_thread(verify_email, email)
+
+    return await asyncio.gather(*(verify_one(email) for email in emails))
+
+def verify_emails(emails, concurrency=VERIFY_CONCURRENCY, requests_per_second=None):
+    """Blocking wrapper around verify_emails_async"""
+    return asyncio.run(verify_emails_async(emails, concurrency, requests_per_second))
+
+def process_dataframe(df, concurrency=VERIFY_CONCURRENCY, requests_per_second=None):
+    """Verify the emails in a leads DataFrame and add an Email_Verified column"""
+    rate = requests_per_second or get_client("hunter").limiter.rate
+    logger.info(f"Verification engine: concurrency={concurrency}, max {rate} requests/second")
     
     try:
-        # Read CSV file
-        df = pd.read_csv(file_path)
+        # Track cache usage for this run
+        cache = get_verification_cache()
+        cache_hits, cache_misses = cache.hits, cache.misses
         
         # Standardize email column name
         if 'Email' in df.columns and 'email' not in df.columns:
@@ -79,7 +119,7 @@ def process_csv(file_path):
         # Ensure 'email' column exists
         if 'email' not in df.columns:
             logger.error(f"CSV is missing required 'Email' column")
-            return False
+            return None
         
         # Clean up email values
         df['email'] = df['email'].astype(str)
@@ -93,13 +133,15 @@ def process_csv(file_path):
         verified_count = 0
         invalid_count = 0
         skipped_count = 0
+        unverified_count = 0
         
         logger.info(f"Found {total_leads} leads in the CSV file")
         
         # Create a new column for verification status
         df['Email_Verified'] = False
         
-        # Process each row
+        # Collect the rows that need verification
+        pending = []
         for idx, row in df.iterrows():
             email = str(row['email']).strip()
             
@@ -108,46 +150,83 @@ def process_csv(file_path):
                 logger.info(f"Row {idx}: Email is empty or N/A, skipping verification")
                 skipped_count += 1
                 continue
-                
-            # Verify the email
-            is_valid = verify_email(email)
             
+            pending.append((idx, email))
+        
+        # Verify all pending emails concurrently (results come back in row order)
+        results = verify_emails([email for _, email in pending], concurrency, requests_per_second)
+        
+        for (idx, email), is_valid in zip(pending, results):
             # Update verification status
-            df.at[idx, 'Email_Verified'] = is_valid
+            df.at[idx, 'Email_Verified'] = bool(is_valid)
             
-            if is_valid:
+            if is_valid is None:
+                unverified_count += 1
+                mark_stage_error(df, idx)
+                logger.warning(f"Row {idx}: Email {email} could not be verified, try again later")
+            elif is_valid:
                 verified_count += 1
                 logger.info(f"Row {idx}: Email {email} is valid")
             else:
                 invalid_count += 1
                 logger.warning(f"Row {idx}: Email {email} is invalid")
-            
-            # Add small delay between API calls
-            time.sleep(1)
-        
-        # Save updates back to the CSV file
-        df.to_csv(file_path, index=False)
         
         logger.info(f"Processing complete:")
         logger.info(f"  - Total leads: {total_leads}")
         logger.info(f"  - Valid emails: {verified_count}")
         logger.info(f"  - Invalid emails: {invalid_count}")
         logger.info(f"  - Skipped (no email): {skipped_count}")
-        logger.info(f"  - Original file updated: {file_path}")
+        logger.info(f"  - Not verified (provider error): {unverified_count}")
+        logger.info(f"  - Cache hits: {cache.hits - cache_hits}")
+        logger.info(f"  - Cache misses: {cache.misses - cache_misses}")
         
-        return True
+        return df
     
+    except Exception as e:
+        logger.error(f"Error verifying emails: {e}")
+        return None
+
+def process_csv(file_path, concurrency=VERIFY_CONCURRENCY, requests_per_second=None, chunksize=CSV_CHUNK_SIZE):
+    """Process a CSV file to verify emails"""
+    logger.info(f"Processing file: {file_path}")
+    
+    try:
+        # Read, process and save the CSV a chunk at a time so large files fit in memory
+        result = transform_csv(file_path, file_path,
+                               lambda chunk: process_dataframe(chunk, concurrency, requests_per_second), chunksize)
     except Exception as e:
         logger.error(f"Error processing CSV file: {e}")
         return False
+    
+    if result is None:
+        return False
+    
+    logger.info(f"Original file updated: {file_path}")
+    return True
+
+def setup_logging():
+    """Log to the console and a timestamped file when run as a script"""
+    os.makedirs("logs", exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler(f"logs/email_verifier_{time.strftime('%Y%m%d_%H%M%S')}.log"),
+            logging.StreamHandler()
+        ]
+    )
 
 def main():
     """Main function to verify emails in LinkedIn leads CSV files"""
     import argparse
     
+    setup_logging()
+    
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Verify emails in LinkedIn leads using Hunter.io API')
     parser.add_argument('--file', help='Specific CSV file to process (relative to output directory)')
+    parser.add_argument('--concurrency', type=int, default=VERIFY_CONCURRENCY, help='Maximum verifications in flight at once')
+    parser.add_argument('--rps', type=float, help='Maximum Hunter.io requests per second (overrides PROVIDER_SETTINGS)')
     args = parser.parse_args()
     
     print("=" * 60)
@@ -163,7 +242,7 @@ def main():
         # Process specific file
         file_path = os.path.join(output_dir, args.file)
         if os.path.exists(file_path):
-            process_csv(file_path)
+            process_csv(file_path, args.concurrency, args.rps)
         else:
             logger.error(f"File not found: {file_path}")
     else:
@@ -183,7 +262,7 @@ def main():
             latest_file = os.path.join(output_dir, output_files[0])
             
             logger.info(f"Processing most recent file: {latest_file}")
-            process_csv(latest_file)
+            process_csv(latest_file, args.concurrency, args.rps)
         
         except Exception as e:
             logger.error(f"Error finding CSV files: {e}")
@@ -0,0 +1,111 @@
+"""
+In-process enrichment pipeline
+Passes one DataFrame through Snov.io email finding, pattern generation and
+Hunter.io verification instead of spawning each script as a subprocess
+"""
+import json
+import time
+import logging
+
+from config.config import (PROVIDER_SETTINGS, CATCH_ALL_PROBE_MIN_LEADS, VERIFICATION_CACHE_TTL_DAYS,
+                           DOMAIN_CLASS_TTL_DAYS)
+from src import snov_email_finder, email_pattern_generator, email_verifier, domain_classifier
+from src.utils.stage_cache import file_fingerprint
+from src.utils.lead_store import normalize_email
+
+def run_stage(name, stage, df):
+    """Run one enrichment stage, passing its input through unchanged if it fails"""
+    logging.info(f"Running enrichment stage '{name}' on {len(df)} leads...")
+    start = time.time()
+
+    # Stages modify the frame in place, so give them a copy to keep the input intact on failure
+    result = stage(df.copy())
+    if result is None:
+        logging.warning(f"Enrichment stage '{name}' failed; keeping its input unchanged")
+        return df
+
+    logging.info(f"Enrichment stage '{name}' finished in {time.time() - start:.1f}s")
+    return result
+
+def stage_settings(name):
+    """Config values that change a stage's output, so editing them invalidates its cached rows"""
+    settings = {
+        "snov": {"PROVIDER_SETTINGS": PROVIDER_SETTINGS.get("snov")},
+        "pattern": {
+            "PROVIDER_SETTINGS": PROVIDER_SETTINGS.get("hunter"),
+            "CATCH_ALL_PROBE_MIN_LEADS": CATCH_ALL_PROBE_MIN_LEADS,
+            "VERIFICATION_CACHE_TTL_DAYS": VERIFICATION_CACHE_TTL_DAYS,
+            "DOMAIN_CLASS_TTL_DAYS": DOMAIN_CLASS_TTL_DAYS,
+            "domain_classifier": file_fingerprint(domain_classifier.__file__),
+        },
+        "verify": {
+            "PROVIDER_SETTINGS": PROVIDER_SETTINGS.get("hunter"),
+            "VERIFICATION_CACHE_TTL_DAYS": VERIFICATION_CACHE_TTL_DAYS,
+        },
+    }
+    return settings.get(name, {})
+
+def run_cached_stage(name, stage, df, module, stage_cache=None, on_reuse=None):
+    """Run a stage through the stage cache (when given) so unchanged rows reuse earlier output"""
+    if stage_cache is None:
+        return run_stage(name, stage, df)
+
+    # Editing the stage's module or its settings changes the fingerprint and invalidates the cached rows
+    config = {"code": file_fingerprint(module.__file__),
+              "settings": json.dumps(stage_settings(name), sort_keys=True, default=str)}
+    return run_stage(name, lambda frame: stage_cache.run(name, stage, frame, config, on_reuse), df)
+
+def fill_known_emails(df, lead_store):
+    """Fill missing emails that an earlier run already found for the same name and domain"""
+    column = next((col for col in ("email", "Email", "Emails") if col in df.columns), None)
+    if column is None:
+        return df
+
+    filled = 0
+    for idx, lead in zip(df.index, df.to_dict("records")):
+        if normalize_email(lead.get(column)):
+            continue
+        email = lead_store.known_email(lead)
+        if email:
+            df.at[idx, column] = email
+            filled += 1
+
+    if filled:
+        logging.info(f"Filled {filled} emails from the lead store without calling any provider")
+    return df
+
+def find_emails(df, stage_cache=None, lead_store=None):
+    """Fill missing emails from the lead store (when given), then using Snov.io"""
+    if lead_store is not None:
+        df = fill_known_emails(df.copy(), lead_store)
+    return run_cached_stage("snov", snov_email_finder.process_dataframe, df, snov_email_finder, stage_cache)
+
+def generate_patterns(df, pattern_model=None, stage_cache=None):
+    """Guess and verify emails that are still missing from name/domain patterns"""
+    if pattern_model is None:
+        pattern_model = email_pattern_generator.DomainPatternModel()
+
+    return run_cached_stage(
+        "pattern",
+        lambda frame: email_pattern_generator.process_dataframe(frame, pattern_model),
+        df,
+        email_pattern_generator,
+        stage_cache,
+        # Changed rows still learn domain formats from the rows served from the cache
+        on_reuse=lambda reused: email_pattern_generator.learn_from_dataframe(pattern_model, reused),
+    )
+
+def verify_emails(df, stage_cache=None):
+    """Verify every email with Hunter.io and add the Email_Verified column"""
+    return run_cached_stage("verify", email_verifier.process_dataframe, df, email_verifier, stage_cache)
+
+def enrich_dataframe(df, find=True, patterns=True, verify=True, pattern_model=None, stage_cache=None,
+                     lead_store=None):
+    """Run the enabled stages in order: find -> pattern -> verify"""
+    if find:
+        df = find_emails(df, stage_cache, lead_store)
+    if patterns:
+        df = generate_patterns(df, pattern_model, stage_cache)
+    if verify:
+        df = verify_emails(df, stage_cache)
+    return df
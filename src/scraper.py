@@ -14,16 +14,40 @@ from selenium.webdriver.support import expected_conditions as EC
 from fake_useragent import UserAgent
 import logging
 import json
+import queue
+import threading
 
 from config.config import *
-from src.utils.helpers import take_debug_screenshot, extract_email, extract_website
+from src.utils.helpers import (
+    take_debug_screenshot, extract_email, extract_website, extract_profile, chrome_launch_lock,
+    NAME_XPATHS, TITLE_XPATHS, COMPANY_XPATHS,
+)
+from src.utils.waits import PageWaiter
+from src.utils.pacing import PacingPolicy
+from src.utils.network_capture import SalesApiCapture, enable_performance_logging
+from src.utils.rate_limiter import TokenBucket
+from src.utils.browser import apply_lean_options, enable_resource_blocking, BrowserMetrics
+from src.utils.lead_store import get_lead_store
+
+RESULTS_CONTAINER = "#search-results-container"
+LEAD_LINK_XPATH = "//a[contains(@href, '/sales/lead/')]"
+# The bare //h1 fallback would match before the lead card has rendered
+LEAD_NAME_XPATH = " | ".join(NAME_XPATHS[:-1])
 
 class LinkedInScraper:
     """LinkedIn Sales Navigator Scraper Class"""
     
-    def __init__(self):
-        """Initialize the scraper with browser settings."""
+    def __init__(self, user_data_dir=None, cookie_file=COOKIE_FILE):
+        """Initialize the scraper with browser settings.
+        
+        Profile workers pass their own user_data_dir and cookie_file so sessions stay isolated.
+        """
+        self.user_data_dir = user_data_dir
+        self.cookie_file = cookie_file
         self.setup_browser()
+        # Load waits and human-like pacing are tracked separately so each can be tuned
+        self.waiter = PageWaiter(self.driver)
+        self.pacing = PacingPolicy()
         self.scrape_history_file = "output/scrape_history.json"
         self.scrape_history = self._load_scrape_history()
         self.current_url = None
@@ -36,7 +60,18 @@ class LinkedInScraper:
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-extensions")
-        self.driver = uc.Chrome(options=options)
+        apply_lean_options(options)
+        
+        # In "api" mode lead records are read from the Sales Navigator JSON responses
+        capture_api = LINKEDIN_CAPTURE_MODE == "api"
+        if capture_api:
+            enable_performance_logging(options)
+        
+        with chrome_launch_lock:
+            self.driver = uc.Chrome(options=options, user_data_dir=self.user_data_dir)
+        self.capture = SalesApiCapture(self.driver) if capture_api else None
+        enable_resource_blocking(self.driver)
+        self.metrics = BrowserMetrics(self.driver, "linkedin")
         
     def _load_scrape_history(self):
         """Load scraping history from file."""
@@ -59,10 +94,21 @@ class LinkedInScraper:
         except Exception as e:
             print(f"[WARNING] Error saving scrape history: {e}")
     
-    def check_previous_scrape(self, url):
-        """Check if URL was previously scraped and prompt user for action."""
+    def check_previous_scrape(self, url, resume_page=None):
+        """Check if URL was previously scraped and prompt user for action.
+        
+        When resuming from a lead journal, resume_page is used without prompting.
+        """
         self.current_url = url
         
+        if resume_page:
+            print(f"[INFO] Resuming search from journaled page {resume_page}.")
+            self.scrape_history[url] = {
+                'last_page': resume_page,
+                'last_scraped': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+            return resume_page
+        
         if url in self.scrape_history:
             last_page = self.scrape_history[url].get('last_page', 1)
             last_scraped = self.scrape_history[url].get('last_scraped', 'unknown date')
@@ -98,17 +144,17 @@ class LinkedInScraper:
         """Handle LinkedIn login through cookies or credentials."""
         print("[INFO] Starting LinkedIn login process...")
         self.driver.get("https://www.linkedin.com/")
-        time.sleep(5)
+        self.waiter.document_ready()
         
         login_successful = False
         
         # Try to use existing cookies first
-        if os.path.exists(COOKIE_FILE):
+        if os.path.exists(self.cookie_file):
             try:
                 print("[INFO] Attempting login with saved cookies...")
                 self._load_cookies()
                 self.driver.refresh()
-                time.sleep(10)
+                self.waiter.url(lambda url: "feed" in url or "/sales" in url)
                 
                 # Check if we're logged in
                 if "feed" in self.driver.current_url or "/sales" in self.driver.current_url:
@@ -124,7 +170,7 @@ class LinkedInScraper:
             try:
                 print("[INFO] Attempting login with username and password...")
                 self.driver.get("https://www.linkedin.com/login")
-                time.sleep(3)
+                self.pacing.pause("login")
                 self._perform_login()
                 login_successful = True
             except Exception as e:
@@ -135,7 +181,7 @@ class LinkedInScraper:
         # Navigate to Sales Navigator
         print("[OK] Logged in successfully. Redirecting to Sales Navigator...")
         self.driver.get(SALES_NAV_URL)
-        time.sleep(10)
+        self._wait_for_sales_nav()
         
         # Check if we were redirected back to login
         if "login" in self.driver.current_url.lower():
@@ -144,7 +190,7 @@ class LinkedInScraper:
             
             print("[WARNING] Trying to access Sales Navigator again...")
             self.driver.get(SALES_NAV_URL)
-            time.sleep(10)
+            self._wait_for_sales_nav()
             
         # Final verification
         if "/sales/" not in self.driver.current_url.lower():
@@ -154,9 +200,14 @@ class LinkedInScraper:
             
         print("[OK] Successfully reached Sales Navigator.")
     
+    def _wait_for_sales_nav(self):
+        """Wait until Sales Navigator loaded or LinkedIn redirected to the login page."""
+        self.waiter.url(lambda url: "/sales/" in url.lower() or "login" in url.lower())
+        self.waiter.document_ready()
+    
     def _load_cookies(self):
         """Load cookies from file."""
-        with open(COOKIE_FILE, "rb") as f:
+        with open(self.cookie_file, "rb") as f:
             cookies = pickle.load(f)
         for cookie in cookies:
             self.driver.add_cookie(cookie)
@@ -164,8 +215,8 @@ class LinkedInScraper:
     
     def _save_cookies(self):
         """Save cookies to file."""
-        os.makedirs(os.path.dirname(COOKIE_FILE), exist_ok=True)
-        with open(COOKIE_FILE, "wb") as f:
+        os.makedirs(os.path.dirname(self.cookie_file) or ".", exist_ok=True)
+        with open(self.cookie_file, "wb") as f:
             pickle.dump(self.driver.get_cookies(), f)
         print("[OK] Session cookies saved.")
     
@@ -192,8 +243,8 @@ class LinkedInScraper:
             sign_in_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
             sign_in_button.click()
             
-            # Wait for login to complete (longer timeout for security checks)
-            time.sleep(10)
+            # Wait for login to complete: LinkedIn leaves the login page or shows a security check
+            self.waiter.url(lambda url: "/login" not in url or "checkpoint" in url or "challenge" in url)
             
             # Check if login was successful
             if "checkpoint" in self.driver.current_url or "challenge" in self.driver.current_url:
@@ -225,37 +276,31 @@ class LinkedInScraper:
                 
                 # Scroll down with random pause
                 self.driver.execute_script(f"window.scrollBy(0, {scroll_y});")
-                time.sleep(random.uniform(0.5, 1.5))
+                self.pacing.pause("scroll_step")
                 
         except Exception as e:
             print(f"[WARNING] Error during scrolling: {e}")
             # Continue execution even if scrolling fails
             pass
     
-    def save_profile_links(self, profile_links, filename="output/scraped_profiles.txt"):
-        """Save profile links to a file to track already scraped profiles."""
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, "a") as f:
-            for link in profile_links:
-                f.write(f"{link}\n")
-        print(f"[INFO] Saved {len(profile_links)} profile links to {filename}")
-
-    def load_scraped_profiles(self, filename="output/scraped_profiles.txt"):
-        """Load previously scraped profile links to avoid duplicates."""
-        if not os.path.exists(filename):
-            return set()
-            
-        with open(filename, "r") as f:
-            return set(line.strip() for line in f if line.strip())
+    def _record_page(self, page, journal=None):
+        """Remember the results page reached in the scrape history and the lead journal."""
+        if self.current_url:
+            self.scrape_history[self.current_url]['last_page'] = page
+            self._save_scrape_history()
+            if journal:
+                journal.record_page(self.current_url, page)
     
-    def get_profile_links(self, start_page=1):
-        """Extract LinkedIn lead profile URLs from Sales Navigator search results."""
+    def get_profile_links(self, start_page=1, journal=None):
+        """Extract LinkedIn lead profile URLs from Sales Navigator search results.
+        
+        With a LeadJournal, each page's links and the page reached are journaled as they are found.
+        """
         profile_links = []
         page = start_page
         
-        # Load previously scraped profiles to avoid duplicates
-        previously_scraped = self.load_scraped_profiles()
-        print(f"[INFO] Found {len(previously_scraped)} previously scraped profiles to avoid duplicates")
+        # Profiles seen in earlier runs are looked up in the lead store instead of loaded up front
+        lead_store = get_lead_store()
         
         if page > 1:
             print(f"[INFO] Starting from page {page} based on previous scraping session")
@@ -265,8 +310,7 @@ class LinkedInScraper:
                     print(f"[INFO] Navigating to page {p}...")
                     next_buttons = self.driver.find_elements(By.XPATH, "//button[contains(@class, 'artdeco-pagination__button--next')]")
                     if next_buttons and next_buttons[0].is_enabled():
-                        next_buttons[0].click()
-                        time.sleep(5 + random.uniform(1, 3))
+                        self._turn_page(next_buttons[0].click)
                     else:
                         print("[WARNING] Couldn't navigate to the requested start page. Starting from current page.")
                         break
@@ -281,25 +325,24 @@ class LinkedInScraper:
             # Scroll until no new content loads
             try:
                 print("[INFO] Starting infinite scroll to bottom...")
-                time.sleep(2)
-                last_height = self.driver.execute_script("return document.querySelector('#search-results-container').scrollHeight")
+                self.waiter.element((By.CSS_SELECTOR, RESULTS_CONTAINER))
+                self.waiter.watch_mutations(RESULTS_CONTAINER)
+                last_height = self.driver.execute_script(f"return document.querySelector('{RESULTS_CONTAINER}').scrollHeight")
                 while True:
                     # Scroll to bottom of container
-                    self.driver.execute_script("document.querySelector('#search-results-container').scrollTo(0, document.querySelector('#search-results-container').scrollHeight)")
-                    time.sleep(3)
+                    self.driver.execute_script(f"document.querySelector('{RESULTS_CONTAINER}').scrollTo(0, document.querySelector('{RESULTS_CONTAINER}').scrollHeight)")
                     
-                    # Calculate new scroll height
-                    new_height = self.driver.execute_script("return document.querySelector('#search-results-container').scrollHeight")
+                    # Wait until the lazy-loaded rows stop arriving instead of sleeping a fixed time
+                    new_height = self.waiter.settled(RESULTS_CONTAINER)
                     
                     if new_height == last_height:
                         print("[INFO] Reached bottom of content")
-                        time.sleep(3)
                         break
                     last_height = new_height
                 
                 # Scroll back to top in many small increments
                 print("[INFO] Scrolling back to top gradually...")
-                total_height = self.driver.execute_script("return document.querySelector('#search-results-container').scrollHeight")
+                total_height = self.driver.execute_script(f"return document.querySelector('{RESULTS_CONTAINER}').scrollHeight")
                 steps = 15  # Increased number of steps
                 for i in range(steps):
                     # Calculate scroll position with slight randomization
@@ -307,19 +350,20 @@ class LinkedInScraper:
                     scroll_position += random.randint(-50, 50)  # Add small random offset
                     scroll_position = max(0, min(total_height, scroll_position))  # Ensure within bounds
                     
-                    self.driver.execute_script(f"document.querySelector('#search-results-container').scrollTo(0, {scroll_position})")
-                    time.sleep(random.uniform(0.8, 1.5))  # Random delay between steps
+                    self.driver.execute_script(f"document.querySelector('{RESULTS_CONTAINER}').scrollTo(0, {scroll_position})")
+                    self.pacing.pause("scroll_back")  # Random delay between steps
                 
                 print("[INFO] Waiting for page to stabilize before extracting profiles...")
-                time.sleep(8)
+                self.waiter.settled(RESULTS_CONTAINER)
                 
             except Exception as e:
                 print(f"[WARNING] Error during infinite scroll: {e}")
                 # Fallback to basic scrolling if container not found
                 print("[INFO] Using fallback scroll method...")
+                self.waiter.watch_mutations()
                 for _ in range(7):
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(3)
+                    self.waiter.settled()
                 
                 # Fallback gradual scroll back up
                 print("[INFO] Scrolling back up gradually (fallback mode)...")
@@ -330,21 +374,16 @@ class LinkedInScraper:
                     scroll_position += random.randint(-50, 50)
                     scroll_position = max(0, min(total_height, scroll_position))
                     self.driver.execute_script(f"window.scrollTo(0, {scroll_position})")
-                    time.sleep(random.uniform(0.8, 1.5))
+                    self.pacing.pause("scroll_back")
                 
-                time.sleep(8)
+                self.waiter.settled()
             
             # Wait for profile elements to be present
-            try:
-                print("[INFO] Waiting for profile elements to load...")
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.XPATH, "//a[contains(@href, '/sales/lead/')]"))
-                )
-            except Exception as e:
-                print(f"[WARNING] Timeout waiting for profile elements: {e}")
+            print("[INFO] Waiting for profile elements to load...")
+            if self.waiter.element((By.XPATH, LEAD_LINK_XPATH)) is None:
+                print("[WARNING] Timeout waiting for profile elements")
 
             print("[INFO] Beginning profile extraction...")
-            time.sleep(2)
 
             # Debug: Take screenshot to verify pagination area
             take_debug_screenshot(self.driver, f"page_{page}_before_extraction")
@@ -354,25 +393,37 @@ class LinkedInScraper:
             if "sales/lead/" not in sample_source:
                 print("[WARNING] Page source does not contain expected '/sales/lead/' text. Verify if the page loaded correctly.")
 
-            profiles = self.driver.find_elements(By.XPATH, "//a[contains(@href, '/sales/lead/')]")
+            self.metrics.sample()
+            if self.capture:
+                found = self.capture.collect()
+                print(f"[INFO] Captured {found} lead records from Sales Navigator API responses on Page {page}.")
+
+            profiles = self.driver.find_elements(By.XPATH, LEAD_LINK_XPATH)
             print(f"[INFO] Found {len(profiles)} profile link elements on Page {page}.")
 
+            page_start = len(profile_links)
             for profile in profiles:
                 link = profile.get_attribute("href")
-                # Add check for previously_scraped to avoid duplicates
-                if link and "linkedin.com" in link and link not in profile_links and link not in previously_scraped:
+                # Skip profiles already collected in this or an earlier run
+                if link and "linkedin.com" in link and link not in profile_links and not lead_store.has_profile(link):
                     full_link = "https://www.linkedin.com" + link if link.startswith("/sales/lead/") else link
                     profile_links.append(full_link)
                     if len(profile_links) >= MAX_PROFILES:
                         break
 
+            # Record each page's new links right away so a crash doesn't lose them
+            lead_store.add_profiles(profile_links[page_start:])
+            if journal:
+                journal.record_links(profile_links[page_start:])
+
             if len(profile_links) >= MAX_PROFILES:
                 break
 
             if len(profile_links) == 0:
                 print("[WARNING] No profiles found on this page. Refreshing and retrying...")
                 self.driver.refresh()
-                time.sleep(10)
+                self.waiter.document_ready()
+                self.waiter.element((By.XPATH, LEAD_LINK_XPATH))
 
             # Try multiple different selectors for the next button
             next_button_found = False
@@ -392,19 +443,14 @@ class LinkedInScraper:
                     try:
                         # Try scrolling to make the button visible first
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", next_buttons[0])
-                        time.sleep(1)
                         
                         # Take a screenshot before clicking
                         take_debug_screenshot(self.driver, f"page_{page}_next_button_found")
                         
-                        next_buttons[0].click()
+                        self._turn_page(next_buttons[0].click)
                         page += 1
                         # Update the last page in history
-                        if self.current_url:
-                            self.scrape_history[self.current_url]['last_page'] = page
-                            self._save_scrape_history()
-                        # Add random delay after clicking next page button
-                        time.sleep(5 + random.uniform(1, 3))
+                        self._record_page(page, journal)
                         next_button_found = True
                         break
                     except Exception as e:
@@ -414,89 +460,161 @@ class LinkedInScraper:
                 try:
                     # Last resort: try JavaScript approach to go to next page
                     print("[INFO] Trying JavaScript pagination approach...")
-                    self.driver.execute_script("document.querySelector('button.artdeco-pagination__button--next').click();")
+                    self._turn_page(lambda: self.driver.execute_script("document.querySelector('button.artdeco-pagination__button--next').click();"))
                     page += 1
-                    if self.current_url:
-                        self.scrape_history[self.current_url]['last_page'] = page
-                        self._save_scrape_history()
-                    time.sleep(5 + random.uniform(1, 3))
+                    self._record_page(page, journal)
                 except Exception as e:
                     print("[INFO] No more pages or pagination failed. Breaking loop.")
                     break
 
         print(f"[OK] Extracted {len(profile_links)} profile links in total.")
-        
-        # Save the newly found profile links to avoid duplicates in future runs
-        if profile_links:
-            self.save_profile_links(profile_links)
+        self.log_timing("Profile link extraction")
         
         return profile_links[:MAX_PROFILES]
     
-    def scrape_profiles(self, profile_links):
-        """Visits each profile and extracts details including name, title, company, email, and website."""
-        leads = []
+    def _turn_page(self, click):
+        """Click to the next results page and wait for the old results to be replaced."""
+        current_results = self.driver.find_elements(By.XPATH, LEAD_LINK_XPATH)
+        click()
+        if current_results:
+            self.waiter.stale(current_results[0])
+        self.waiter.element((By.XPATH, LEAD_LINK_XPATH))
+        self.pacing.pause("page_turn")
+    
+    def log_timing(self, label):
+        """Report time spent waiting for pages separately from pacing delays."""
+        print(f"[INFO] {label}: {self.waiter.total_wait:.1f}s waiting for pages "
+              f"({self.waiter.wait_count} waits, {self.waiter.timeouts} timeouts), "
+              f"{self.pacing.total_pause:.1f}s pacing ({self.pacing.pause_count} pauses)")
+    
+    def _first_text(self, xpaths, field):
+        """Return the text of the first element matched by the fallback XPaths."""
+        try:
+            for xpath in xpaths:
+                elements = self.driver.find_elements(By.XPATH, xpath)
+                if elements:
+                    return elements[0].text.strip()
+        except Exception as e:
+            print(f"[WARNING] {field} extraction error: {e}")
+        return "N/A"
+    
+    def _extract_profile_fallback(self):
+        """Extract profile fields one WebDriver call at a time (used if the batched script fails)."""
+        return {
+            "name": self._first_text(NAME_XPATHS, "Name"),
+            "title": self._first_text(TITLE_XPATHS, "Title"),
+            "company": self._first_text(COMPANY_XPATHS, "Company"),
+            "email": extract_email(self.driver),
+            "website": extract_website(self.driver),
+        }
+    
+    def scrape_profiles(self, profile_links, on_lead=None, workers=PROFILE_WORKERS, journal=None):
+        """Visits each profile and extracts details including name, title, company, email, and website.
+        
+        If on_lead is given it is called with each lead as soon as it is extracted,
+        e.g. to stream leads into enrichment while scraping continues.
+        With workers > 1 the profiles are visited by a ProfileWorkerPool; leads keep the input order.
+        With a LeadJournal each lead is committed to disk as soon as it is extracted and not
+        kept in memory; profiles already in the journal are skipped and the return value is
+        the number of leads journaled by this call. Leads are journaled as workers finish them;
+        LeadJournal.export_csv writes them back in input order.
+        """
+        already_scraped = journal.scraped_urls() if journal else set()
+        journaled = 0
+        
+        lead_store = get_lead_store()
+        
+        def emit(lead):
+            nonlocal journaled
+            lead_store.add_lead(lead, source="LinkedIn")
+            if journal:
+                journal.record_lead(lead)
+                journaled += 1
+            if on_lead:
+                on_lead(lead)
+        
+        leads_by_index = {}
+        to_visit = []
         for index, profile_url in enumerate(profile_links):
-            print(f"[INFO] Visiting Profile {index+1}/{len(profile_links)}: {profile_url}")
-            try:
-                self.driver.get(profile_url)
-                time.sleep(5)  # Give page time to load
-                
-                # Add some human-like behavior
-                self.human_like_scroll()
-                
-                # Updated name extraction for the new Sales Navigator HTML structure
-                try:
-                    # Target the specific h1 with data-x--lead--name attribute
-                    name_elements = self.driver.find_elements(By.XPATH, "//h1[@data-x--lead--name]") or                                    self.driver.find_elements(By.XPATH, "//h1[contains(@class, '_headingText_')]") or                                    self.driver.find_elements(By.XPATH, "//h1[contains(@class, 'profile-info-card__name')]") or                                    self.driver.find_elements(By.XPATH, "//h1")
-                    name = name_elements[0].text.strip() if name_elements else "N/A"
-                except Exception as e:
-                    print(f"[WARNING] Name extraction error: {e}")
-                    name = "N/A"
-                
-                # Updated title extraction
-                try:
-                    # Try various possible selectors for the job title
-                    title_elements = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'profile-info-card__subtitle')]") or                                     self.driver.find_elements(By.XPATH, "//span[contains(@data-anonymize, 'job-title')]") or                                     self.driver.find_elements(By.XPATH, "//span[contains(@class, '_subtitle_')]") or                                     self.driver.find_elements(By.XPATH, "//span[contains(@class, 't-14 t-black')]")
-                    title = title_elements[0].text.strip() if title_elements else "N/A"
-                except Exception as e:
-                    print(f"[WARNING] Title extraction error: {e}")
-                    title = "N/A"
-                
-                # Updated company extraction
-                try:
-                    # Try various possible selectors for the company name
-                    company_elements = self.driver.find_elements(By.XPATH, "//a[contains(@data-anonymize, 'company-name')]") or                                       self.driver.find_elements(By.XPATH, "//a[contains(@href, '/sales/company/')]") or                                       self.driver.find_elements(By.XPATH, "//a[contains(@href, '/company/')]") or                                       self.driver.find_elements(By.XPATH, "//div[contains(@class, 'profile-info-card__company-name')]")
-                    company = company_elements[0].text.strip() if company_elements else "N/A"
-                except Exception as e:
-                    print(f"[WARNING] Company extraction error: {e}")
-                    company = "N/A"
-                    
-                email = extract_email(self.driver)
-                website = extract_website(self.driver)
-                
-                # Print extracted data for debugging
-                print(f"  - Name: {name}")
-                print(f"  - Title: {title}")
-                print(f"  - Company: {company}")
-                print(f"  - Email: {email}")
-                print(f"  - Website: {website}")
+            if profile_url in already_scraped:
+                continue
+            
+            # Leads already captured from a search response don't need a page visit
+            captured = self.capture.get(profile_url) if self.capture else None
+            if captured and captured["Name"] != "N/A":
+                print(f"[INFO] Using captured API record for Profile {index+1}/{len(profile_links)}: {captured['Name']}")
+                lead = dict(captured, **{"Profile URL": profile_url})
+                emit(lead)
+                if not journal:
+                    leads_by_index[index] = lead
+            else:
+                to_visit.append((index, profile_url))
+        
+        if workers > 1 and len(to_visit) > 1:
+            pool = ProfileWorkerPool(workers=workers)
+            visited = pool.scrape([profile_url for _, profile_url in to_visit], on_lead=emit)
+            for (index, _), lead in zip(to_visit, visited):
+                if lead and not journal:
+                    leads_by_index[index] = lead
+        else:
+            for index, profile_url in to_visit:
+                print(f"[INFO] Visiting Profile {index+1}/{len(profile_links)}: {profile_url}")
+                lead = self.scrape_profile(profile_url)
+                if lead:
+                    emit(lead)
+                    if not journal:
+                        leads_by_index[index] = lead
                 
-                leads.append({
-                    "Name": name,
-                    "Title": title,
-                    "Company": company,
-                    "Profile URL": profile_url,
-                    "Email": email,
-                    "Website": website
-                })
-            except Exception as e:
-                print(f"[WARNING] Skipping profile due to error: {e}")
+                # Add randomization to delay between requests for more human-like behavior
+                self.pacing.pause("profile")
             
-            # Add randomization to delay between requests for more human-like behavior
-            delay = DELAY_BETWEEN_REQUESTS + random.uniform(0.5, 2)
-            time.sleep(delay)
+            self.log_timing("Profile scraping")
+        
+        if journal:
+            return journaled
+        return [leads_by_index[index] for index in sorted(leads_by_index)]
+    
+    def scrape_profile(self, profile_url):
+        """Visit one profile and return its lead dict, or None if it couldn't be scraped."""
+        try:
+            self.driver.get(profile_url)
+            # Continue as soon as the lead's name is rendered
+            if self.waiter.element((By.XPATH, LEAD_NAME_XPATH)) is None:
+                print("[WARNING] Lead name did not appear in time; extracting whatever loaded")
+            
+            # Add some human-like behavior
+            self.human_like_scroll()
+            
+            # One execute_script call evaluates every selector fallback in the page
+            profile = extract_profile(self.driver) or self._extract_profile_fallback()
+            self.metrics.sample()
             
-        return leads
+            # Prefer the profile API response over the rendered page where it has a value
+            if self.capture:
+                self.capture.collect()
+                captured = self.capture.get(profile_url) or {}
+                for field in ("name", "title", "company", "email", "website"):
+                    if captured.get(field.title(), "N/A") != "N/A":
+                        profile[field] = captured[field.title()]
+            
+            # Print extracted data for debugging
+            print(f"  - Name: {profile['name']}")
+            print(f"  - Title: {profile['title']}")
+            print(f"  - Company: {profile['company']}")
+            print(f"  - Email: {profile['email']}")
+            print(f"  - Website: {profile['website']}")
+            
+            return {
+                "Name": profile["name"],
+                "Title": profile["title"],
+                "Company": profile["company"],
+                "Profile URL": profile_url,
+                "Email": profile["email"],
+                "Website": profile["website"]
+            }
+        except Exception as e:
+            print(f"[WARNING] Skipping profile due to error: {e}")
+            return None
     
     def save_to_csv(self, leads):
         """Save leads to CSV file."""
@@ -509,12 +627,85 @@ class LinkedInScraper:
         df.to_csv(output_file, index=False)
         print(f"[OK] Leads saved to {output_file}")
     
-    def cleanup(self):
+    def cleanup(self, save_history=True):
         """Clean up resources."""
         try:
             # Save the final scrape history before quitting
-            self._save_scrape_history()
+            if save_history:
+                self._save_scrape_history()
+            self.metrics.report()
             self.driver.quit()
             print("[OK] Browser closed")
         except Exception as e:
-            print(f"[WARNING] Error closing browser: {e}")
\ No newline at end of file
+            print(f"[WARNING] Error closing browser: {e}")
+
+class ProfileWorkerPool:
+    """Visits profiles on several isolated browser sessions fed from a shared queue"""
+    
+    def __init__(self, workers=PROFILE_WORKERS, cookie_files=None, rate_per_minute=PROFILE_RATE_PER_MINUTE):
+        """Initialize the pool settings (browsers are started by scrape())."""
+        self.worker_count = max(1, workers)
+        self.cookie_files = cookie_files if cookie_files is not None else PROFILE_COOKIE_FILES
+        # One bucket shared by every worker caps the account-wide visit rate
+        self.limiter = TokenBucket(rate_per_minute / 60.0, capacity=1)
+        self._lead_lock = threading.Lock()
+    
+    def _cookie_file(self, worker_id):
+        """Return the worker's own cookie file, falling back to the shared one."""
+        if worker_id < len(self.cookie_files):
+            return self.cookie_files[worker_id]
+        return COOKIE_FILE
+    
+    def scrape(self, profile_links, on_lead=None):
+        """Scrape every profile and return the leads in input order (None where scraping failed)."""
+        results = [None] * len(profile_links)
+        work = queue.Queue()
+        for index, profile_url in enumerate(profile_links):
+            work.put((index, profile_url))
+        
+        threads = []
+        for worker_id in range(min(self.worker_count, len(profile_links))):
+            thread = threading.Thread(target=self._work, args=(worker_id, work, results, on_lead),
+                                      name=f"profile-worker-{worker_id+1}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        
+        if not work.empty():
+            print(f"[WARNING] {work.qsize()} profiles were not visited because every worker stopped")
+        print(f"[OK] Worker pool scraped {sum(1 for lead in results if lead)}/{len(profile_links)} profiles")
+        return results
+    
+    def _work(self, worker_id, work, results, on_lead):
+        """Worker loop: log in once, then visit profiles until the queue is empty."""
+        scraper = None
+        try:
+            user_data_dir = os.path.abspath(os.path.join(WORKER_PROFILE_DIR, f"worker_{worker_id+1}"))
+            os.makedirs(user_data_dir, exist_ok=True)
+            scraper = LinkedInScraper(user_data_dir=user_data_dir, cookie_file=self._cookie_file(worker_id))
+            scraper.login()
+            
+            while True:
+                try:
+                    index, profile_url = work.get_nowait()
+                except queue.Empty:
+                    break
+                
+                self.limiter.acquire()
+                print(f"[INFO] Worker {worker_id+1} visiting Profile {index+1}/{len(results)}: {profile_url}")
+                lead = scraper.scrape_profile(profile_url)
+                results[index] = lead
+                if lead and on_lead:
+                    # Callers such as the streaming enricher aren't written for concurrent submits
+                    with self._lead_lock:
+                        on_lead(lead)
+                
+                scraper.pacing.pause("profile")
+            
+            scraper.log_timing(f"Worker {worker_id+1}")
+        except Exception as e:
+            print(f"[ERROR] Profile worker {worker_id+1} stopped: {e}")
+        finally:
+            if scraper:
+                scraper.cleanup(save_history=False)
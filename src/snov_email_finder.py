@@ -8,22 +8,23 @@ If Snov.io can't find an email or if there are credit issues, it keeps the origi
 
 import os
 import pandas as pd
-import requests
 import time
 from urllib.parse import urlparse
 import argparse
 import logging
+import sys
+import threading
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Allow running as a standalone script (python src/snov_email_finder.py)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config.config import CSV_CHUNK_SIZE
+from src.utils.http_client import get_client, ProviderError
+from src.utils.chunked_csv import transform_csv
+from src.utils.stage_cache import mark_stage_error
 
-# Setup logging
-os.makedirs("logs", exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(f"logs/email_finder_{time.strftime('%Y%m%d_%H%M%S')}.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Snov.io API credentials - replace with your actual credentials
@@ -34,8 +35,24 @@ SNOV_CLIENT_SECRET = "bc19ba364a6949e08e3192535b456fa6"
 SNOV_AUTH_URL = "https://api.snov.io/v1/oauth/access_token"
 SNOV_EMAIL_FINDER_URL = "https://api.snov.io/v1/get-emails-from-names"
 
+# Reuse the access token until shortly before it expires
+_token_cache = {'token': None, 'expires_at': 0}
+_token_lock = threading.Lock()
+
 def get_access_token():
     """Get Snov.io API access token"""
+    with _token_lock:
+        if _token_cache['token'] and time.time() < _token_cache['expires_at']:
+            return _token_cache['token']
+        
+        token, expires_in = request_access_token()
+        if token:
+            _token_cache['token'] = token
+            _token_cache['expires_at'] = time.time() + expires_in - 60
+        return token
+
+def request_access_token():
+    """Request a new Snov.io API access token, returning (token, lifetime in seconds)"""
     logger.info("Getting Snov.io API access token...")
     
     payload = {
@@ -45,19 +62,19 @@ def get_access_token():
     }
     
     try:
-        response = requests.post(SNOV_AUTH_URL, data=payload)
+        response = get_client("snov").post(SNOV_AUTH_URL, data=payload)
         
         if response.status_code == 200:
             token_data = response.json()
             if 'access_token' in token_data:
                 logger.info("Successfully obtained Snov.io access token")
-                return token_data['access_token']
+                return token_data['access_token'], token_data.get('expires_in', 3600)
         
         logger.warning("Failed to get valid access token")
-        return None
+        return None, 0
     except Exception as e:
         logger.error(f"Error getting access token: {e}")
-        return None
+        return None, 0
 
 def extract_domain(website, company):
     """Extract domain from website URL or company name"""
@@ -97,7 +114,11 @@ def extract_domain(website, company):
     return None
 
 def find_email(name, domain, access_token):
-    """Find email using Snov.io API, handling errors gracefully"""
+    """Find email using Snov.io API
+    
+    Returns the best email, or None if Snov.io has none; raises ProviderError if
+    Snov.io gave no answer (rate limited, API or network error).
+    """
     if not name or name == "N/A" or not domain or not access_token:
         return None
     
@@ -120,7 +141,7 @@ def find_email(name, domain, access_token):
     }
     
     try:
-        response = requests.post(SNOV_EMAIL_FINDER_URL, data=payload)
+        response = get_client("snov").post(SNOV_EMAIL_FINDER_URL, data=payload)
         
         # If response is OK and has emails
         if response.status_code == 200:
@@ -133,23 +154,20 @@ def find_email(name, domain, access_token):
                     best_email = emails[0].get('email')
                     logger.info(f"Found email: {best_email}")
                     return best_email
+            
+            logger.info(f"No email found for {name} at {domain}")
+            return None
         
-        # If no emails or any error, log and return None
-        logger.info(f"No email found or API error for {name} at {domain}")
-        return None
+        raise ProviderError(f"Snov.io returned {response.status_code} for {name} at {domain}")
         
+    except ProviderError:
+        raise
     except Exception as e:
-        logger.warning(f"Error calling Snov.io API: {e}")
-        return None
+        raise ProviderError(f"Error calling Snov.io API: {e}") from e
 
-def process_csv(file_path):
-    """Process a single CSV file to find missing emails"""
-    logger.info(f"Processing file: {file_path}")
-    
+def process_dataframe(df):
+    """Find missing emails for the leads in a DataFrame using Snov.io"""
     try:
-        # Read CSV file
-        df = pd.read_csv(file_path)
-        
         # Standardize email column name
         if 'Email' in df.columns and 'email' not in df.columns:
             df['email'] = df['Email']
@@ -174,7 +192,7 @@ def process_csv(file_path):
         
         if missing_columns:
             logger.error(f"CSV is missing required columns: {', '.join(missing_columns)}")
-            return False
+            return None
         
         # Clean up values
         for col in df.columns:
@@ -185,12 +203,13 @@ def process_csv(file_path):
         access_token = get_access_token()
         if not access_token:
             logger.error("Failed to get Snov.io access token. Exiting.")
-            return False
+            return None
         
         # Initialize counters
         total_leads = len(df)
         missing_email_count = 0
         found_email_count = 0
+        failed_lookup_count = 0
         
         logger.info(f"Found {total_leads} leads in the CSV file")
         
@@ -212,7 +231,13 @@ def process_csv(file_path):
                 
                 if domain and first_name and last_name:
                     # Try to find email
-                    found_email = find_email(f"{first_name} {last_name}", domain, access_token)
+                    try:
+                        found_email = find_email(f"{first_name} {last_name}", domain, access_token)
+                    except ProviderError as e:
+                        failed_lookup_count += 1
+                        mark_stage_error(df, idx)
+                        logger.warning(f"Could not look up {first_name} {last_name}, try again later: {e}")
+                        continue
                     
                     if found_email:
                         # Update dataframe with found email
@@ -223,27 +248,52 @@ def process_csv(file_path):
                         logger.info(f"Could not find email for {first_name} {last_name} - keeping original value: {email}")
                 else:
                     logger.warning(f"Could not determine domain for {first_name} {last_name} at {company}")
-                
-            # Add small delay between API calls
-            time.sleep(1)
-        
-        # Save updates back to the original CSV file
-        df.to_csv(file_path, index=False)
-        
+            
         logger.info(f"Processing complete:")
         logger.info(f"  - Total leads: {total_leads}")
         logger.info(f"  - Leads with missing emails: {missing_email_count}")
         logger.info(f"  - Emails found and updated: {found_email_count}")
-        logger.info(f"  - Original file updated: {file_path}")
+        logger.info(f"  - Lookups failed (provider error): {failed_lookup_count}")
         
-        return True
+        return df
     
+    except Exception as e:
+        logger.error(f"Error finding emails: {e}")
+        return None
+
+def process_csv(file_path, chunksize=CSV_CHUNK_SIZE):
+    """Process a single CSV file to find missing emails"""
+    logger.info(f"Processing file: {file_path}")
+    
+    try:
+        # Read, process and save the CSV a chunk at a time so large files fit in memory
+        result = transform_csv(file_path, file_path, process_dataframe, chunksize)
     except Exception as e:
         logger.error(f"Error processing CSV file: {e}")
         return False
+    
+    if result is None:
+        return False
+    
+    logger.info(f"Original file updated: {file_path}")
+    return True
+
+def setup_logging():
+    """Log to the console and a timestamped file when run as a script"""
+    os.makedirs("logs", exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler(f"logs/email_finder_{time.strftime('%Y%m%d_%H%M%S')}.log"),
+            logging.StreamHandler()
+        ]
+    )
 
 def main():
     """Main function to process LinkedIn leads CSV files"""
+    setup_logging()
+    
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Find missing emails for LinkedIn leads using Snov.io API')
     parser.add_argument('--file', help='Specific CSV file to process (relative to output directory)')
@@ -0,0 +1,108 @@
+"""
+Streaming enrichment for scraped leads
+The scraper hands each lead to a bounded queue and worker threads clean, find
+and verify it while the browser moves on to the next profile
+"""
+import queue
+import logging
+import threading
+import pandas as pd
+
+from config.config import STREAM_WORKERS, STREAM_QUEUE_SIZE
+from src.SalesNav_CSVCleaner import clean_dataframe
+from src.email_pattern_generator import DomainPatternModel
+from src.enrichment import enrich_dataframe
+
+# Same standard names main.standardize_leads uses, so streamed output matches the batch pipeline
+STANDARD_COLUMNS = {
+    'Role': 'role',
+    'Emails': 'email',
+    'Domain': 'domain',
+    'Phone': 'phone',
+    'Misc': 'linkedin_url',
+}
+
+class StreamingEnricher:
+    """Cleans and enriches leads on background workers as they are produced"""
+
+    def __init__(self, workers=STREAM_WORKERS, queue_size=STREAM_QUEUE_SIZE,
+                 find=True, patterns=True, verify=True, lead_store=None):
+        """Initialize the queue and worker settings (call start() to begin)"""
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.worker_count = max(1, workers)
+        self.stages = {'find': find, 'patterns': patterns, 'verify': verify}
+        # Shared so every worker benefits from formats learned on earlier leads
+        self.pattern_model = DomainPatternModel()
+        self.lead_store = lead_store
+        self.submitted = 0
+        self.dropped = 0
+        self.failed = 0
+        self._results = []
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        """Start the worker threads"""
+        for i in range(self.worker_count):
+            thread = threading.Thread(target=self._work, name=f"enrich-worker-{i+1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logging.info(f"Streaming enrichment started with {self.worker_count} workers")
+
+    def submit(self, lead):
+        """Queue a scraped lead; blocks while the queue is full so the scraper can't run away"""
+        self.queue.put((self.submitted, lead))
+        self.submitted += 1
+
+    def _work(self):
+        """Worker loop: clean and enrich one lead at a time"""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                sequence, lead = item
+                self._process(sequence, lead)
+            finally:
+                self.queue.task_done()
+
+    def _process(self, sequence, lead):
+        """Clean and enrich a single lead"""
+        try:
+            df = clean_dataframe(pd.DataFrame([lead]))
+            if df.empty:
+                # Filtered out by the cleaner (no usable name, role or domain)
+                with self._lock:
+                    self.dropped += 1
+                return
+
+            # The cleaner drops company and website, but the enrichment stages use them to find the domain
+            df = df.rename(columns=STANDARD_COLUMNS)
+            df['company'] = lead.get('Company', '')
+            df['website'] = lead.get('Website', '')
+            df['source'] = 'LinkedIn'
+
+            df = enrich_dataframe(df, pattern_model=self.pattern_model, lead_store=self.lead_store, **self.stages)
+            with self._lock:
+                self._results.append((sequence, df))
+        except Exception as e:
+            logging.error(f"Error enriching streamed lead {lead.get('Profile URL', '')}: {e}")
+            with self._lock:
+                self.failed += 1
+
+    def close(self):
+        """Wait for queued leads to finish and return the enriched leads in scrape order"""
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        logging.info(f"Streaming enrichment complete: {self.submitted} submitted, "
+                     f"{len(self._results)} enriched, {self.dropped} dropped by cleaner, {self.failed} failed")
+
+        if not self._results:
+            return pd.DataFrame()
+
+        self._results.sort(key=lambda result: result[0])
+        return pd.concat([df for _, df in self._results], ignore_index=True)
@@ -0,0 +1,129 @@
+"""
+Lean browser profile and page load metrics shared by the LinkedIn and Apollo scrapers
+Lean mode blocks images, fonts, media and trackers that aren't needed to read
+lead data, and the metrics show what that saves compared with the normal mode
+"""
+import os
+import json
+import logging
+
+from config.config import LEAN_BROWSER, LEAN_BLOCKED_URLS, BROWSER_METRICS_FILE
+
+# Chrome switches that turn off features a scraper never uses
+LEAN_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--autoplay-policy=user-gesture-required",
+]
+
+# Transfer size and load time of everything the page fetched since the last sample
+PAGE_METRICS_JS = """
+performance.setResourceTimingBufferSize(10000);
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = resources.reduce((total, entry) => total + (entry.transferSize || 0), 0);
+let loadMs = resources.reduce((latest, entry) => Math.max(latest, entry.responseEnd), 0);
+if (navigation && !window.__chaseiqNavigationSampled) {
+    bytes += navigation.transferSize || 0;
+    loadMs = Math.max(loadMs, navigation.loadEventEnd || navigation.domContentLoadedEventEnd || 0);
+    window.__chaseiqNavigationSampled = true;
+}
+const since = window.__chaseiqLastSample || 0;
+window.__chaseiqLastSample = performance.now();
+performance.clearResourceTimings();
+return {bytes: bytes, requests: resources.length, load_ms: Math.max(0, loadMs - since)};
+"""
+
+def apply_lean_options(options, lean=LEAN_BROWSER):
+    """Add the lean profile's Chrome switches to the options (no-op in normal mode)"""
+    if lean:
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+    return options
+
+def enable_resource_blocking(driver, lean=LEAN_BROWSER, patterns=None):
+    """Block heavy resource types and trackers over CDP (no-op in normal mode)"""
+    if not lean:
+        return False
+
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or LEAN_BLOCKED_URLS})
+        logging.info(f"Lean browser mode: blocking {len(patterns or LEAN_BLOCKED_URLS)} URL patterns")
+        return True
+    except Exception as e:
+        logging.warning(f"Could not enable resource blocking: {e}")
+        return False
+
+class BrowserMetrics:
+    """Accumulates bytes transferred and page load times for one browser session"""
+
+    def __init__(self, driver, name, lean=LEAN_BROWSER):
+        """Initialize for a scraper name (e.g. 'linkedin') and the mode it runs in"""
+        self.driver = driver
+        self.name = name
+        self.mode = "lean" if lean else "normal"
+        self.pages = 0
+        self.bytes = 0
+        self.requests = 0
+        self.load_ms = 0.0
+
+    def sample(self):
+        """Record what the current page transferred since the previous sample"""
+        try:
+            metrics = self.driver.execute_script(PAGE_METRICS_JS)
+        except Exception as e:
+            logging.debug(f"Could not read page metrics: {e}")
+            return None
+
+        self.pages += 1
+        self.bytes += int(metrics.get("bytes") or 0)
+        self.requests += int(metrics.get("requests") or 0)
+        self.load_ms += float(metrics.get("load_ms") or 0)
+        return metrics
+
+    def summary(self):
+        """Return the totals and per-page averages for this session"""
+        pages = max(1, self.pages)
+        return {
+            "pages": self.pages,
+            "bytes": self.bytes,
+            "requests": self.requests,
+            "avg_kb_per_page": round(self.bytes / pages / 1024, 1),
+            "avg_load_ms": round(self.load_ms / pages, 1),
+        }
+
+    def report(self, metrics_file=BROWSER_METRICS_FILE):
+        """Log this session's metrics, compare with the last run in the other mode and save them"""
+        if not self.pages:
+            return
+
+        summary = self.summary()
+        logging.info(f"{self.name} browser ({self.mode} mode): {summary['pages']} pages, "
+                     f"{summary['bytes'] / 1024 / 1024:.1f} MB transferred, "
+                     f"{summary['avg_kb_per_page']} KB/page, {summary['avg_load_ms']} ms avg load")
+
+        history = {}
+        if os.path.exists(metrics_file):
+            try:
+                with open(metrics_file, "r") as f:
+                    history = json.load(f)
+            except (OSError, ValueError):
+                history = {}
+
+        other_mode = "normal" if self.mode == "lean" else "lean"
+        other = history.get(self.name, {}).get(other_mode)
+        if other and other.get("avg_kb_per_page") and other.get("avg_load_ms"):
+            logging.info(f"{self.name} browser vs last {other_mode} run: "
+                         f"{summary['avg_kb_per_page'] / other['avg_kb_per_page']:.0%} of the bytes per page, "
+                         f"{summary['avg_load_ms'] / other['avg_load_ms']:.0%} of the load time")
+
+        history.setdefault(self.name, {})[self.mode] = summary
+        os.makedirs(os.path.dirname(metrics_file) or ".", exist_ok=True)
+        with open(metrics_file, "w") as f:
+            json.dump(history, f, indent=2)
@@ -0,0 +1,107 @@
+"""
+Chunked CSV processing for lead files too large to load at once
+Stages read CSV_CHUNK_SIZE rows at a time and append their output as they go,
+so peak memory follows the chunk size rather than the file size
+"""
+import os
+import logging
+import pandas as pd
+
+from config.config import CSV_CHUNK_SIZE
+from src.utils.frame_io import is_parquet, iter_parquet, read_columns, ParquetChunkWriter
+
+def read_chunks(path, chunksize=CSV_CHUNK_SIZE, **kwargs):
+    """Yield a CSV (or Parquet) file as DataFrames of at most chunksize rows"""
+    if is_parquet(path):
+        yield from iter_parquet(path, chunksize)
+        return
+
+    for chunk in pd.read_csv(path, chunksize=chunksize, **kwargs):
+        yield chunk
+
+def open_writer(path, columns=None):
+    """Return a chunk writer for the path's format (Parquet or CSV)"""
+    if is_parquet(path):
+        return ParquetChunkWriter(path, columns)
+    return ChunkedCSVWriter(path, columns)
+
+class ChunkedCSVWriter:
+    """Appends DataFrames to one CSV file, keeping the columns of the first chunk"""
+
+    def __init__(self, path, columns=None):
+        """Initialize with the output path and optionally a fixed column layout"""
+        self.path = str(path)
+        self.columns = list(columns) if columns is not None else None
+        self.rows = 0
+        self._file = None
+        self._closed = False
+
+    def write(self, df):
+        """Append a chunk, writing the header with the first one"""
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            if self.columns is None:
+                self.columns = list(df.columns)
+            df.reindex(columns=self.columns).to_csv(self._file, index=False)
+        else:
+            extra = [col for col in df.columns if col not in self.columns]
+            if extra:
+                logging.warning(f"Dropping columns missing from the first chunk of {self.path}: {extra}")
+            df.reindex(columns=self.columns).to_csv(self._file, index=False, header=False)
+        self.rows += len(df)
+
+    def close(self):
+        """Close the file, writing just the header if no chunk was written"""
+        if self._closed:
+            return
+        if self._file is None and self.columns is not None:
+            self.write(pd.DataFrame(columns=self.columns))
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def transform_csv(input_file, output_file, transform, chunksize=CSV_CHUNK_SIZE, **read_kwargs):
+    """Stream a CSV through transform(chunk) into output_file, chunk by chunk.
+    Either file may also be Parquet, chosen by its suffix.
+
+    Returns (rows read, rows written), or None if transform returned None for a
+    chunk; output_file is then left as it was. input_file and output_file may be
+    the same path, since the output is written to a temporary file and moved into place.
+    """
+    output_file = str(output_file)
+    root, ext = os.path.splitext(output_file)
+    partial_file = f"{root}.partial{ext}"
+    writer = open_writer(partial_file)
+    rows_in = 0
+    completed = False
+
+    try:
+        for chunk in read_chunks(input_file, chunksize, **read_kwargs):
+            rows_in += len(chunk)
+            result = transform(chunk)
+            if result is None:
+                logging.error(f"Processing {input_file} failed on the chunk ending at row {rows_in}")
+                return None
+            writer.write(result)
+            logging.info(f"Processed {rows_in} rows of {input_file}")
+
+        if writer.columns is None:
+            # Header-only input: nothing was transformed, so keep the input's columns
+            writer.columns = read_columns(input_file)
+        writer.close()
+        os.replace(partial_file, output_file)
+        completed = True
+    finally:
+        writer.close()
+        if not completed and os.path.exists(partial_file):
+            os.remove(partial_file)
+
+    return rows_in, writer.rows
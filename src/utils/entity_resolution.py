@@ -0,0 +1,151 @@
+"""
+Entity resolution for leads found by more than one source
+Rows are only compared within blocks that share a LinkedIn URL, an email, or a
+company domain plus last name, so a merge stays close to linear in the number of
+leads; every cluster of matching rows becomes one golden record
+"""
+import difflib
+import logging
+import numpy as np
+import pandas as pd
+
+from config.config import ENTITY_NAME_THRESHOLD, ENTITY_MAX_BLOCK_NAMES
+from src.utils.lead_store import _clean, _name_part, profile_key, normalize_email, normalize_domain
+from src.SalesNav_CSVCleaner import PERSONAL_EMAIL_DOMAINS
+
+# When records disagree on a field, the earlier source wins
+SOURCE_PRIORITY = ['LinkedIn', 'Apollo']
+
+def _map_unique(series, func):
+    """Apply func once per distinct value and broadcast the results back to every row (missing -> None)"""
+    codes, uniques = pd.factorize(series)
+    results = np.array([func(value) for value in uniques] + [None], dtype=object)
+    return pd.Series(results[codes], index=series.index, dtype=object)
+
+def _column(df, name, func):
+    """A lead column normalized by func, or all None if the column is absent"""
+    if name not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    return _map_unique(df[name], func)
+
+def _company_email_domain(email):
+    """Domain of a business email address; personal addresses say nothing about the company"""
+    domain = email.rsplit('@', 1)[1]
+    return None if domain in PERSONAL_EMAIL_DOMAINS else domain
+
+def blocking_keys(df):
+    """Return the LinkedIn, email, domain, last name and first name keys of every row"""
+    emails = _column(df, 'email', normalize_email)
+    domains = _column(df, 'domain', normalize_domain)
+    domains = domains.fillna(_column(df, 'website', normalize_domain))
+    domains = domains.fillna(_map_unique(emails.dropna(), _company_email_domain))
+
+    return pd.DataFrame({
+        'linkedin': _column(df, 'linkedin_url', profile_key),
+        'email': emails,
+        'domain': domains,
+        'last': _column(df, 'last_name', _name_part),
+        'first': _column(df, 'first_name', _name_part),
+    }, index=df.index)
+
+def name_similarity(a, b):
+    """Score two normalized first names from 0 to 1; an initial or shortened form of the other scores 0.9"""
+    if a == b:
+        return 1.0
+    short, full = sorted((a, b), key=len)
+    if full.startswith(short) and (len(short) == 1 or len(short) >= 3):
+        return 0.9
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+def similar_names(names, threshold=ENTITY_NAME_THRESHOLD):
+    """Pairs of distinct first names in one block that name the same person.
+    A name that matches more than one other name (e.g. an initial) is ambiguous and left unmatched.
+    """
+    pairs = [(a, b) for i, a in enumerate(names) for b in names[i + 1:] if name_similarity(a, b) >= threshold]
+    matches = pd.Series([name for pair in pairs for name in pair], dtype=object).value_counts()
+    return [(a, b) for a, b in pairs if matches[a] == 1 and matches[b] == 1]
+
+def _name_edges(keys, threshold):
+    """Row pairs whose first names match within a (domain, last name) block"""
+    people = keys.reset_index(drop=True)[['domain', 'last', 'first']].dropna().drop_duplicates()
+    block_sizes = people.groupby(['domain', 'last'])['first'].transform('size')
+    oversized = people[block_sizes > ENTITY_MAX_BLOCK_NAMES][['domain', 'last']].drop_duplicates()
+    if len(oversized):
+        logging.info(f"Skipping name matching in {len(oversized)} blocks with more than {ENTITY_MAX_BLOCK_NAMES} names")
+
+    left, right = [], []
+    for _, block in people[(block_sizes > 1) & (block_sizes <= ENTITY_MAX_BLOCK_NAMES)].groupby(['domain', 'last']):
+        # Each distinct name stands for the first row carrying it
+        rows = dict(zip(block['first'], block.index))
+        for a, b in similar_names(list(rows), threshold):
+            left.append(rows[a])
+            right.append(rows[b])
+    return np.array(left, dtype=np.int64), np.array(right, dtype=np.int64)
+
+def cluster_rows(keys, threshold=ENTITY_NAME_THRESHOLD):
+    """Label every row with the position of the first row of its entity.
+    Rows sharing a LinkedIn URL, an email or an exact name at a domain are linked outright;
+    similar first names link rows within a (domain, last name) block.
+    """
+    n = len(keys)
+    groups = [pd.factorize(keys['linkedin'])[0], pd.factorize(keys['email'])[0]]
+    named = keys[['domain', 'last', 'first']].notna().all(axis=1).to_numpy()
+    person = np.full(n, -1)
+    person[named] = pd.factorize(keys['domain'][named] + '|' + keys['last'][named] + '|' + keys['first'][named])[0]
+    groups.append(person)
+    left, right = _name_edges(keys, threshold)
+
+    # Connected components by min-label propagation; each pass is vectorized
+    labels = np.arange(n)
+    while True:
+        before = labels
+        labels = labels.copy()
+        for codes in groups:
+            linked = codes >= 0
+            labels[linked] = pd.Series(labels[linked]).groupby(codes[linked]).transform('min').to_numpy()
+        if len(left):
+            lowest = np.minimum(labels[left], labels[right])
+            np.minimum.at(labels, left, lowest)
+            np.minimum.at(labels, right, lowest)
+        # Point every row straight at its root
+        while not np.array_equal(labels, labels[labels]):
+            labels = labels[labels]
+        if np.array_equal(labels, before):
+            return labels
+
+def resolve_entities(df, threshold=ENTITY_NAME_THRESHOLD):
+    """Merge rows that describe the same person into one golden record per person.
+
+    Each field takes the first non-empty value by source priority (then row order),
+    and a 'sources' column lists every source that contributed a row.
+    Records come out in the order of their first row.
+    """
+    if df.empty:
+        return df.assign(sources=pd.Series(dtype=object))
+
+    df = df.reset_index(drop=True)
+    labels = cluster_rows(blocking_keys(df), threshold)
+
+    text_columns = [col for col in df.columns if df[col].dtype == object or isinstance(df[col].dtype, pd.StringDtype)]
+    work = df.copy()
+    for col in text_columns:
+        work[col] = _map_unique(work[col], _clean)
+
+    source = work['source'] if 'source' in work.columns else pd.Series(None, index=work.index, dtype=object)
+    rank = {name: rank for rank, name in enumerate(SOURCE_PRIORITY)}
+    priority = source.map(rank).fillna(len(rank)).astype(int)
+    order = np.lexsort((np.arange(len(df)), priority.to_numpy(), labels))
+    golden = work.iloc[order].groupby(labels[order], sort=True).first()
+
+    # List the sources in priority order; there are only a handful, so build the string per source
+    contributed = pd.DataFrame({'label': labels, 'source': source}).dropna().drop_duplicates()
+    names = sorted(contributed['source'].unique(), key=lambda name: (rank.get(name, len(rank)), name))
+    sources = pd.Series('', index=golden.index, dtype=object)
+    for name in names:
+        has = golden.index.isin(contributed.loc[contributed['source'] == name, 'label'])
+        sources = sources + np.where(has, name + ',', '')
+    golden['sources'] = sources.str.rstrip(',')
+
+    for col in text_columns:
+        golden[col] = golden[col].astype(object).where(golden[col].notna(), '')
+    return golden.reset_index(drop=True)
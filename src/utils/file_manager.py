@@ -48,17 +48,17 @@ class FileManager:
             return self.run_dir / "apollo" / filename
         return self.run_dir / "apollo" / f"apollo_leads_{self.timestamp}.csv"
     
-    def get_merged_path(self, filename=None):
+    def get_merged_path(self, filename=None, suffix=".csv"):
         """Get path for merged output files"""
         if filename:
             return self.run_dir / "merged" / filename
-        return self.run_dir / "merged" / f"merged_leads_{self.timestamp}.csv"
+        return self.run_dir / "merged" / f"merged_leads_{self.timestamp}{suffix}"
     
-    def get_processed_path(self, source="merged", filename=None):
-        """Get path for processed output files"""
+    def get_processed_path(self, source="merged", filename=None, suffix=".csv"):
+        """Get path for processed output files (suffix=".parquet" for stage handoffs)"""
         if filename:
             return self.run_dir / "processed" / filename
-        return self.run_dir / "processed" / f"{source}_processed_{self.timestamp}.csv"
+        return self.run_dir / "processed" / f"{source}_processed_{self.timestamp}{suffix}"
     
     def get_screenshot_path(self, name):
         """Get path for screenshot files"""
@@ -0,0 +1,137 @@
+"""
+Columnar intermediate files for handing leads between pipeline stages
+Stage outputs that only feed the next stage can be stored as Parquet with an
+explicit schema, so booleans stay booleans and nothing is re-parsed from text;
+final deliverables are still written as CSV
+"""
+import os
+import logging
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; intermediates fall back to CSV
+    pa = None
+    pq = None
+
+from config.config import INTERMEDIATE_FORMAT, CSV_CHUNK_SIZE
+
+PARQUET_SUFFIX = ".parquet"
+
+# Column types for lead files; any other column is stored as a string
+LEAD_SCHEMA = {
+    'Email_Verified': 'boolean',
+    'source': 'category',
+}
+BOOLEAN_VALUES = {True: True, False: False, 'True': True, 'False': False, 'true': True, 'false': False}
+
+def parquet_available():
+    """True if pyarrow is installed"""
+    return pq is not None
+
+def intermediate_suffix(file_format=INTERMEDIATE_FORMAT):
+    """Return the file suffix for stage handoffs: .parquet when enabled and available, else .csv"""
+    if file_format == "csv":
+        return ".csv"
+    if parquet_available():
+        return PARQUET_SUFFIX
+    if file_format == "parquet":
+        logging.warning("INTERMEDIATE_FORMAT is 'parquet' but pyarrow isn't installed; using CSV")
+    return ".csv"
+
+def is_parquet(path):
+    """True if the path names a Parquet file"""
+    return str(path).endswith(PARQUET_SUFFIX)
+
+def apply_schema(df):
+    """Return a copy of df with the lead schema's column types (other columns as strings)"""
+    df = df.copy()
+    for col in df.columns:
+        dtype = LEAD_SCHEMA.get(col, 'string')
+        if dtype == 'boolean':
+            df[col] = df[col].map(BOOLEAN_VALUES).astype('boolean')
+        elif dtype == 'category':
+            df[col] = df[col].astype('string').astype('category')
+        elif df[col].dtype == object or df[col].isna().all():
+            df[col] = df[col].astype('string')
+    return df
+
+def _from_arrow(df):
+    """Give columns read from Parquet the same Python values read_csv would produce"""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.StringDtype):
+            # Stages call astype(str) and expect 'nan' rather than '<NA>' for missing values
+            df[col] = df[col].astype(object).where(df[col].notna(), np.nan)
+        elif isinstance(df[col].dtype, pd.BooleanDtype):
+            df[col] = df[col].astype(bool) if df[col].notna().all() else df[col].astype(object)
+    return df
+
+def read_frame(path, **kwargs):
+    """Read a lead file written by write_frame (Parquet or CSV, chosen by suffix)"""
+    if is_parquet(path):
+        return _from_arrow(pd.read_parquet(path))
+    return pd.read_csv(path, **kwargs)
+
+def write_frame(df, path):
+    """Write leads as Parquet (with the lead schema) or CSV, chosen by the path's suffix"""
+    os.makedirs(os.path.dirname(str(path)) or ".", exist_ok=True)
+    if is_parquet(path):
+        apply_schema(df).to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+def read_columns(path):
+    """Return a lead file's column names without reading its rows"""
+    if is_parquet(path):
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def iter_parquet(path, chunksize=CSV_CHUNK_SIZE):
+    """Yield a Parquet file as DataFrames of at most chunksize rows, one record batch at a time"""
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+        yield _from_arrow(batch.to_pandas())
+
+class ParquetChunkWriter:
+    """Appends DataFrames to one Parquet file, keeping the schema of the first chunk"""
+
+    def __init__(self, path, columns=None):
+        """Initialize with the output path and optionally a fixed column layout"""
+        self.path = str(path)
+        self.columns = list(columns) if columns is not None else None
+        self.rows = 0
+        self._writer = None
+        self._closed = False
+
+    def write(self, df):
+        """Append a chunk, fixing the file's schema with the first one"""
+        if self.columns is None:
+            self.columns = list(df.columns)
+        table = pa.Table.from_pandas(apply_schema(df.reindex(columns=self.columns)), preserve_index=False)
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            # Categories differ between chunks, and all-missing columns have no inferred type
+            table = table.cast(self._writer.schema, safe=False) if table.schema != self._writer.schema else table
+        self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        """Close the file, writing an empty table if no chunk was written"""
+        if self._closed:
+            return
+        if self._writer is None and self.columns is not None:
+            self.write(pd.DataFrame(columns=self.columns))
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -4,8 +4,13 @@ Helper functions for the LinkedIn Sales Navigator Scraper
 import re
 import time
 import os
+import threading
 from selenium.webdriver.common.by import By
 
+# undetected_chromedriver patches the shared driver binary on launch, so scrapers
+# running side by side must not start their browsers at the same moment
+chrome_launch_lock = threading.Lock()
+
 def take_debug_screenshot(driver, name="debug_screenshot"):
     """Take a screenshot for debugging purposes."""
     try:
@@ -63,12 +68,7 @@ def extract_website(driver):
                 if href and "linkedin.com" not in href and "mailto:" not in href:
                     print(f"  - Found website: {text} (URL: {href})")
                     # Clean up the URL if needed
-                    if "?" in href and ("url=" in href or "redirect=" in href):
-                        # Extract actual URL from redirect URL
-                        match = re.search(r'(?:url=|redirect=)(https?://[^&]+)', href)
-                        if match:
-                            return match.group(1)
-                    return href
+                    return clean_website_url(href)
     except Exception as e:
         print(f"[WARNING] Contact info website extraction error: {e}")
     
@@ -81,11 +81,7 @@ def extract_website(driver):
         for element in website_elements:
             href = element.get_attribute("href")
             if href and "linkedin.com" not in href and "mailto:" not in href:
-                if "?" in href and ("url=" in href or "redirect=" in href):
-                    match = re.search(r'(?:url=|redirect=)(https?://[^&]+)', href)
-                    if match:
-                        return match.group(1)
-                return href
+                return clean_website_url(href)
     except Exception as e:
         print(f"[WARNING] Website extraction error: {e}")
     
@@ -107,3 +103,119 @@ def extract_website(driver):
         print(f"[WARNING] Website regex extraction error: {e}")
     
     return "N/A"
+
+# Selector fallbacks for the Sales Navigator lead page, tried in order
+NAME_XPATHS = [
+    "//h1[@data-x--lead--name]",
+    "//h1[contains(@class, '_headingText_')]",
+    "//h1[contains(@class, 'profile-info-card__name')]",
+    "//h1",
+]
+TITLE_XPATHS = [
+    "//div[contains(@class, 'profile-info-card__subtitle')]",
+    "//span[contains(@data-anonymize, 'job-title')]",
+    "//span[contains(@class, '_subtitle_')]",
+    "//span[contains(@class, 't-14 t-black')]",
+]
+COMPANY_XPATHS = [
+    "//a[contains(@data-anonymize, 'company-name')]",
+    "//a[contains(@href, '/sales/company/')]",
+    "//a[contains(@href, '/company/')]",
+    "//div[contains(@class, 'profile-info-card__company-name')]",
+]
+
+# Runs every extraction step of extract_email/extract_website and the selector
+# fallbacks inside the page, so a profile costs one WebDriver round trip
+PROFILE_EXTRACTION_JS = r"""
+const [nameXpaths, titleXpaths, companyXpaths] = arguments;
+
+function first(xpath) {
+    return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+
+function all(xpath) {
+    const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < result.snapshotLength; i++) { nodes.push(result.snapshotItem(i)); }
+    return nodes;
+}
+
+function firstText(xpaths) {
+    for (const xpath of xpaths) {
+        const node = first(xpath);
+        if (node) { return (node.innerText || "").trim(); }
+    }
+    return "N/A";
+}
+
+const isExternal = (href) => href && !href.includes("linkedin.com") && !href.includes("mailto:");
+
+function firstExternalLink(xpath) {
+    for (const anchor of all(xpath)) {
+        if (isExternal(anchor.href)) { return anchor.href; }
+    }
+    return null;
+}
+
+const html = document.documentElement.outerHTML;
+
+let email = null;
+const mailto = document.querySelector("a[href^='mailto:']");
+if (mailto) {
+    email = mailto.getAttribute("href").replace("mailto:", "").split("?")[0].trim();
+} else {
+    const match = html.match(/[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}/);
+    email = match ? match[0] : "N/A";
+}
+
+let website = null;
+if (first("//h2[contains(text(), 'Contact information') or contains(@class, '_header_') and contains(text(), 'Contact')]")) {
+    website = firstExternalLink("//a[@data-anonymize='url' or contains(@href, 'http') and not(contains(@href, 'linkedin.com')) and not(contains(@href, 'mailto:'))]");
+}
+if (!website) {
+    website = firstExternalLink("//a[contains(@href, 'http') and not(contains(@href, 'linkedin.com')) and not(contains(@href, 'mailto:'))]");
+}
+if (!website) {
+    const specific = (html.match(/www\.[A-Za-z0-9-]+\.[A-Za-z0-9.-]+/g) || [])
+        .find((url) => !url.includes("linkedin.com") && url.length > 5);
+    if (specific) { website = "http://" + specific; }
+}
+if (!website) {
+    for (const match of html.matchAll(/https?:\/\/(?:www\.)?([A-Za-z0-9-]+\.[A-Za-z0-9.-]+)(?:\/[^\s"'<>)\]]*)?/g)) {
+        if (!match[1].includes("linkedin.com") && match[1].length > 5) { website = "http://" + match[1]; break; }
+    }
+}
+
+return {
+    name: firstText(nameXpaths),
+    title: firstText(titleXpaths),
+    company: firstText(companyXpaths),
+    email: email,
+    website: website || "N/A",
+};
+"""
+
+def clean_website_url(href):
+    """Extract the real URL from LinkedIn redirect links (url=/redirect= parameters)."""
+    if href and "?" in href and ("url=" in href or "redirect=" in href):
+        match = re.search(r'(?:url=|redirect=)(https?://[^&]+)', href)
+        if match:
+            return match.group(1)
+    return href
+
+def extract_profile(driver):
+    """Extract name, title, company, email and website from the current profile page in one call.
+    
+    Returns None if the script fails so the caller can fall back to the per-field helpers.
+    """
+    try:
+        profile = driver.execute_script(PROFILE_EXTRACTION_JS, NAME_XPATHS, TITLE_XPATHS, COMPANY_XPATHS)
+    except Exception as e:
+        print(f"[WARNING] Batched profile extraction failed: {e}")
+        return None
+    
+    if not isinstance(profile, dict):
+        return None
+    
+    profile["website"] = clean_website_url(profile.get("website"))
+    return profile
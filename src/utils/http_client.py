@@ -0,0 +1,114 @@
+"""
+Shared HTTP clients for the enrichment providers (Hunter.io, Snov.io)
+"""
+import time
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.config import PROVIDER_SETTINGS
+from src.utils.rate_limiter import TokenBucket, backoff_delay, parse_retry_after
+
+# Responses worth retrying: rate limited or a transient server error
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class ProviderError(Exception):
+    """A provider call failed without giving an answer; the lead should be retried later, not recorded"""
+
+class RateLimitedError(ProviderError):
+    """The provider still answered 429 after every retry"""
+
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response
+
+class ProviderClient:
+    """Keep-alive, rate-limited HTTP session for one provider"""
+    
+    def __init__(self, name, timeout=15, pool_connections=2, pool_maxsize=10,
+                 rate_per_second=1, burst=None, max_retries=3, backoff_base=1.0, backoff_max=60.0):
+        """Create a session whose connections are reused across calls"""
+        self.name = name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate_per_second, burst)
+        self.session = requests.Session()
+        
+        # One pool per host; pool_maxsize bounds the connections kept alive for concurrent callers
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def request(self, method, url, **kwargs):
+        """Send a request, waiting for the rate limiter and retrying transient failures
+
+        Raises RateLimitedError if the provider is still rate limiting after the last retry.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        
+        for attempt in range(self.max_retries + 1):
+            # Only requests that are actually sent consume a token
+            self.limiter.acquire()
+            
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                logging.warning(f"{self.name} request failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            
+            self.limiter.update_from_headers(response.headers)
+            
+            if response.status_code == 429 and attempt == self.max_retries:
+                raise RateLimitedError(f"{self.name} still rate limited after {self.max_retries} retries",
+                                       response)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+            logging.warning(f"{self.name} returned {response.status_code}, retrying in {delay:.1f}s")
+            
+            if response.status_code == 429:
+                # Hold back every caller sharing this provider, not just this one
+                self.limiter.pause(delay)
+            else:
+                time.sleep(delay)
+        
+        return response
+    
+    def get(self, url, **kwargs):
+        """Send a GET request"""
+        return self.request("GET", url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        """Send a POST request"""
+        return self.request("POST", url, **kwargs)
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(provider):
+    """Return the shared client for a provider, creating it on first use"""
+    with _clients_lock:
+        if provider not in _clients:
+            _clients[provider] = ProviderClient(provider, **PROVIDER_SETTINGS.get(provider, {}))
+        return _clients[provider]
+
+def close_clients():
+    """Close every shared provider client"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
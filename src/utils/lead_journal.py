@@ -0,0 +1,156 @@
+"""
+Append-only journal of LinkedIn scraping progress
+Every collected profile link, finished results page and scraped lead is
+written and fsynced as one JSON line, so a crash loses at most the profile
+in progress and the run can be resumed from the journal
+"""
+import os
+import csv
+import json
+import heapq
+import time
+import logging
+import threading
+
+from config.config import LEAD_JOURNAL_FILE
+
+LEAD_COLUMNS = ["Name", "Title", "Company", "Profile URL", "Email", "Website"]
+
+class LeadJournal:
+    """JSONL journal of links, pages and leads for one scrape"""
+
+    def __init__(self, path=LEAD_JOURNAL_FILE):
+        """Initialize with the journal path (the file is opened on the first write)"""
+        self.path = str(path)
+        self._file = None
+        # Profile workers commit leads from several threads
+        self._lock = threading.Lock()
+
+    def _append(self, entry):
+        """Write one entry and force it to disk before returning"""
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+                if self._ends_mid_line():
+                    # Terminate a line torn by a crash so the next entry starts cleanly
+                    self._file.write("\n")
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _ends_mid_line(self):
+        """True if the journal's last line was cut off before its newline"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def entries(self):
+        """Yield the journal entries in order, skipping a line torn by a crash"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def record_links(self, links):
+        """Journal newly collected profile links"""
+        for link in links:
+            self._append({"type": "link", "url": link})
+
+    def record_page(self, search_url, page):
+        """Journal the results page the search has reached"""
+        self._append({"type": "page", "search_url": search_url, "page": page, "at": time.time()})
+
+    def record_lead(self, lead):
+        """Journal a scraped lead"""
+        self._append(dict(lead, type="lead"))
+
+    def scraped_urls(self):
+        """Return the profile URLs that already have a journaled lead"""
+        return {entry.get("Profile URL") for entry in self.entries() if entry.get("type") == "lead"}
+
+    def pending_links(self):
+        """Return journaled profile links that have no lead yet, in collection order"""
+        scraped = self.scraped_urls()
+        pending = []
+        seen = set()
+        for entry in self.entries():
+            url = entry.get("url")
+            if entry.get("type") == "link" and url not in scraped and url not in seen:
+                pending.append(url)
+                seen.add(url)
+        return pending
+
+    def last_page(self, search_url):
+        """Return the last journaled results page for a search URL, or None"""
+        page = None
+        for entry in self.entries():
+            if entry.get("type") == "page" and entry.get("search_url") == search_url:
+                page = entry.get("page")
+        return page
+
+    def lead_count(self):
+        """Return the number of journaled leads"""
+        return sum(1 for entry in self.entries() if entry.get("type") == "lead")
+
+    def _ordered_leads(self):
+        """Yield (order key, lead) for every journaled lead; leads sort by the position of their profile link"""
+        positions = {}
+        for entry in self.entries():
+            if entry.get("type") == "link":
+                positions.setdefault(entry.get("url"), len(positions))
+        seq = 0
+        for entry in self.entries():
+            if entry.get("type") == "lead":
+                # Leads without a journaled link keep journal order after the linked ones
+                position = positions.get(entry.get("Profile URL"), len(positions) + seq)
+                yield (position, seq), entry
+                seq += 1
+
+    def export_csv(self, csv_path):
+        """Stream the journaled leads into a CSV file in profile link order and return how many were written
+
+        Profile workers journal leads as they finish, so only leads that finished
+        ahead of an earlier profile are held back until it is written.
+        """
+        keys = iter(sorted(key for key, _ in self._ordered_leads()))
+        next_key = next(keys, None)
+        held = []
+        count = 0
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=LEAD_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            for key, entry in self._ordered_leads():
+                heapq.heappush(held, (key, entry))
+                while held and held[0][0] == next_key:
+                    writer.writerow(heapq.heappop(held)[1])
+                    count += 1
+                    next_key = next(keys, None)
+        return count
+
+    def close(self):
+        """Close the journal file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def archive(self, destination=None):
+        """Move the journal out of the way so the next scrape starts a fresh one"""
+        self.close()
+        if not os.path.exists(self.path):
+            return None
+
+        if destination is None:
+            root, ext = os.path.splitext(self.path)
+            destination = f"{root}_{time.strftime('%Y%m%d_%H%M%S')}{ext}"
+        os.makedirs(os.path.dirname(str(destination)) or ".", exist_ok=True)
+        os.replace(self.path, destination)
+        logging.info(f"Archived lead journal to {destination}")
+        return destination
@@ -0,0 +1,319 @@
+"""
+Persistent, indexed store of every lead the pipeline has seen
+Replaces the scraped_profiles.txt list: lookups by profile URL, email or
+(name, domain) are index hits, so nothing has to be loaded at startup
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from config.config import LEAD_STORE_FILE
+from src.utils.network_capture import lead_id_from_url
+
+# Flat list of profile links written by earlier versions of the LinkedIn scraper
+LEGACY_PROFILE_LIST = "output/scraped_profiles.txt"
+
+# Lead statuses in order of progress; a lead never moves backwards
+QUEUED = "queued"
+SCRAPED = "scraped"
+ENRICHED = "enriched"
+STATUS_RANK = {QUEUED: 0, SCRAPED: 1, ENRICHED: 2}
+
+MISSING_VALUES = {"", "n/a", "na", "nan", "none"}
+
+def _clean(value):
+    """Return a stripped string, or None for empty/placeholder values"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return None if value.lower() in MISSING_VALUES else value
+
+def profile_key(url):
+    """Normalize a LinkedIn profile URL; Sales Navigator URLs are keyed by the lead id"""
+    url = _clean(url)
+    if not url:
+        return None
+    # The search token after the lead id changes between sessions, so key on the id alone
+    lead_id = lead_id_from_url(url)
+    if lead_id:
+        return f"sales:{lead_id}"
+    parsed = urlparse(url if "//" in url else f"//{url}")
+    return f"{parsed.netloc.lower().removeprefix('www.')}{parsed.path.rstrip('/')}".lower()
+
+def normalize_email(email):
+    """Lowercase an email address, or None if it isn't one"""
+    email = _clean(email)
+    if not email or "@" not in email:
+        return None
+    return email.lower()
+
+def _name_part(value):
+    """Lowercase a name and keep only letters and digits, or None if nothing is left"""
+    return re.sub(r"[^a-z0-9]", "", (_clean(value) or "").lower()) or None
+
+def name_key(first_name, last_name):
+    """Build a case- and punctuation-insensitive key from a lead's name"""
+    first, last = _name_part(first_name), _name_part(last_name)
+    if not first or not last:
+        return None
+    return f"{first}|{last}"
+
+def normalize_domain(domain=None, website=None, email=None):
+    """Return the lead's company domain from the domain, website or email, in that order"""
+    for value in (domain, website):
+        value = _clean(value)
+        if value:
+            host = urlparse(value if "//" in value else f"//{value}").netloc or value
+            return host.lower().removeprefix("www.").split(":")[0]
+    email = normalize_email(email)
+    if email:
+        return email.rsplit("@", 1)[1]
+    return None
+
+def lead_keys(lead):
+    """Return (profile key, email, name key, domain) for a lead dict in scraper or standard columns"""
+    first_name, last_name = lead.get("first_name"), lead.get("last_name")
+    full_name = _clean(lead.get("Name"))
+    if not _clean(first_name) and full_name:
+        parts = full_name.split()
+        first_name, last_name = parts[0], parts[-1] if len(parts) > 1 else None
+
+    email = normalize_email(lead.get("email") or lead.get("Email") or lead.get("Emails"))
+    domain = normalize_domain(lead.get("domain") or lead.get("Domain"),
+                              lead.get("website") or lead.get("Website"), email)
+    return (profile_key(lead.get("linkedin_url") or lead.get("Profile URL")), email,
+            name_key(first_name, last_name), domain)
+
+def _normalized(df, column, func):
+    """A column normalized by func once per distinct value, or all None if the column is absent"""
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    values = df[column]
+    return values.map({value: func(value) for value in values.dropna().unique()})
+
+def lead_key_frame(df):
+    """Vectorized lead_keys for a DataFrame in standardized columns: profile, email, person and domain per row"""
+    email = _normalized(df, "email", normalize_email)
+    domain = _normalized(df, "domain", normalize_domain)
+    domain = domain.fillna(_normalized(df, "website", normalize_domain))
+    domain = domain.fillna(email.str.rsplit("@", n=1).str[1])
+    person = _normalized(df, "first_name", _name_part) + "|" + _normalized(df, "last_name", _name_part)
+    return pd.DataFrame({
+        "profile": _normalized(df, "linkedin_url", profile_key),
+        "email": email,
+        "person": person,
+        "domain": domain,
+    }, index=df.index)
+
+def dedupe_leads(df, seen=None):
+    """Drop rows that repeat an earlier row's profile URL, email or (name, domain)
+
+    Pass the same seen set across calls to dedupe a file chunk by chunk.
+    """
+    seen = set() if seen is None else seen
+    keep = []
+    for lead in df.to_dict("records"):
+        key, email, person, domain = lead_keys(lead)
+        keys = {k for k in (("profile", key), ("email", email), ("person", person, domain)) if all(k[1:])}
+        keep.append(not (keys & seen))
+        seen |= keys
+    return df[keep]
+
+class LeadStore:
+    """SQLite-backed lead index keyed by profile URL, email and (name, domain)"""
+
+    def __init__(self, db_path=LEAD_STORE_FILE, profile_list=LEGACY_PROFILE_LIST):
+        """Open (or create) the store and import the old scraped profiles list once"""
+        self.db_path = str(db_path)
+        # The scraper, merge step and enrichment stages may share one store across threads
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leads ("
+            "id INTEGER PRIMARY KEY, profile_key TEXT, email TEXT, name_key TEXT, domain TEXT, "
+            "status TEXT, source TEXT, data TEXT, first_seen REAL, last_seen REAL)"
+        )
+        self._conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_leads_profile ON leads (profile_key) "
+            "WHERE profile_key IS NOT NULL"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_email ON leads (email)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_name_domain ON leads (name_key, domain)")
+        self._conn.commit()
+
+        if profile_list:
+            self.migrate_profile_list(profile_list)
+
+    def migrate_profile_list(self, path):
+        """Import a scraped_profiles.txt file as scraped profiles and rename it so it's only read once"""
+        if not os.path.exists(path):
+            return 0
+
+        now = time.time()
+        with open(path, "r") as f, self._lock:
+            # The old scraper skipped every listed profile, so keep treating them as done
+            rows = ((profile_key(line), line.strip(), SCRAPED, "LinkedIn", now, now) for line in f if line.strip())
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO leads (profile_key, data, status, source, first_seen, last_seen) "
+                "VALUES (?, json_object('profile_url', ?), ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            imported = self._conn.total_changes - before
+
+        os.replace(path, f"{path}.migrated")
+        logging.info(f"Imported {imported} profiles from {path} into the lead store")
+        return imported
+
+    def _find_id(self, key, email, person, domain):
+        """Return the id of the stored lead matching any of the keys, checked most specific first"""
+        if key:
+            row = self._conn.execute("SELECT id FROM leads WHERE profile_key = ?", (key,)).fetchone()
+            if row:
+                return row["id"]
+        if email:
+            row = self._conn.execute("SELECT id FROM leads WHERE email = ? LIMIT 1", (email,)).fetchone()
+            if row:
+                return row["id"]
+        if person and domain:
+            row = self._conn.execute(
+                "SELECT id FROM leads WHERE name_key = ? AND domain = ? LIMIT 1", (person, domain)
+            ).fetchone()
+            if row:
+                return row["id"]
+        return None
+
+    def find(self, lead):
+        """Return the stored record (as a dict) matching a lead dict, or None"""
+        with self._lock:
+            lead_id = self._find_id(*lead_keys(lead))
+            if lead_id is None:
+                return None
+            return dict(self._conn.execute("SELECT * FROM leads WHERE id = ?", (lead_id,)).fetchone())
+
+    def is_enriched(self, lead):
+        """True if the lead was already delivered by an earlier enrichment run"""
+        record = self.find(lead)
+        return record is not None and record["status"] == ENRICHED
+
+    def enriched_keys(self):
+        """Return the profile keys, emails and (name|domain) keys of every enriched lead, read in one query"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT profile_key, email, name_key, domain FROM leads WHERE status = ?", (ENRICHED,)
+            ).fetchall()
+        keys = {"profile": set(), "email": set(), "person": set()}
+        for row in rows:
+            if row["profile_key"]:
+                keys["profile"].add(row["profile_key"])
+            if row["email"]:
+                keys["email"].add(row["email"])
+            if row["name_key"] and row["domain"]:
+                keys["person"].add(f"{row['name_key']}|{row['domain']}")
+        return keys
+
+    def enriched_mask(self, df):
+        """Boolean Series marking the rows of a standardized leads DataFrame delivered by an earlier run.
+
+        One query replaces a lookup per row; a row counts as enriched if any of its keys
+        matches an enriched lead.
+        """
+        enriched = self.enriched_keys()
+        keys = lead_key_frame(df)
+        return (keys["profile"].isin(enriched["profile"]) | keys["email"].isin(enriched["email"])
+                | (keys["person"] + "|" + keys["domain"]).isin(enriched["person"]))
+
+    def has_profile(self, profile_url):
+        """True if the profile URL has been scraped before; profiles only queued by a crashed run don't count"""
+        key = profile_key(profile_url)
+        if not key:
+            return False
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM leads WHERE profile_key = ?", (key,)).fetchone()
+        return row is not None and STATUS_RANK.get(row["status"], 0) >= STATUS_RANK[SCRAPED]
+
+    def known_email(self, lead):
+        """Return an email found for this lead's name at its domain in an earlier run, or None"""
+        _, _, person, domain = lead_keys(lead)
+        if not person or not domain:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT email FROM leads WHERE name_key = ? AND domain = ? AND email IS NOT NULL LIMIT 1",
+                (person, domain)
+            ).fetchone()
+        return row["email"] if row else None
+
+    def _upsert(self, key, email, person, domain, status, source, data, now):
+        """Insert a lead or merge it into the stored lead it matches (caller holds the lock)"""
+        lead_id = self._find_id(key, email, person, domain)
+        if lead_id is None:
+            self._conn.execute(
+                "INSERT INTO leads (profile_key, email, name_key, domain, status, source, data, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, email, person, domain, status, source, data, now, now)
+            )
+            return
+
+        current = self._conn.execute("SELECT status FROM leads WHERE id = ?", (lead_id,)).fetchone()["status"]
+        if STATUS_RANK.get(current, 0) > STATUS_RANK.get(status, 0):
+            status = current
+
+        # Keep known values when the new record lacks them; never take another lead's profile key
+        self._conn.execute(
+            "UPDATE leads SET "
+            "profile_key = COALESCE(profile_key, (SELECT ? WHERE NOT EXISTS (SELECT 1 FROM leads WHERE profile_key = ?))), "
+            "email = COALESCE(?, email), name_key = COALESCE(?, name_key), domain = COALESCE(?, domain), "
+            "status = ?, source = COALESCE(?, source), data = COALESCE(?, data), last_seen = ? WHERE id = ?",
+            (key, key, email, person, domain, status, source, data, now, lead_id)
+        )
+
+    def add_lead(self, lead, status=SCRAPED, source=None):
+        """Record a lead dict (scraper or standardized column names)"""
+        self.add_leads([lead], status, source)
+
+    def add_leads(self, leads, status=SCRAPED, source=None):
+        """Record many lead dicts in one transaction"""
+        now = time.time()
+        with self._lock:
+            for lead in leads:
+                self._upsert(
+                    *lead_keys(lead),
+                    status,
+                    source or _clean(lead.get("source")),
+                    json.dumps({k: v for k, v in lead.items() if _clean(v) is not None}, default=str),
+                    now,
+                )
+            self._conn.commit()
+
+    def add_profiles(self, profile_urls, source="LinkedIn"):
+        """Record collected profile links that haven't been scraped yet"""
+        self.add_leads([{"Profile URL": url} for url in profile_urls], status=QUEUED, source=source)
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_lead_store():
+    """Return the process-wide lead store, creating it on first use"""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = LeadStore()
+        return _shared_store
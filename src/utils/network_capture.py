@@ -0,0 +1,146 @@
+"""
+Capture of Sales Navigator API responses over the Chrome DevTools protocol
+The Sales Navigator UI renders its lead lists and profiles from JSON endpoints;
+reading those payloads from Chrome's performance log gives the lead records
+directly, whatever the rendered HTML looks like
+"""
+import re
+import json
+import logging
+
+# Only responses from these endpoints carry lead data
+SEARCH_ENDPOINTS = ("salesApiLeadSearch",)
+PROFILE_ENDPOINTS = ("salesApiProfiles",)
+
+LEAD_ID_PATTERN = re.compile(r"/sales/lead/([^,/?]+)")
+PROFILE_URN_PATTERN = re.compile(r"\(([^,()]+),([^,()]+),([^,()]+)\)")
+
+def enable_performance_logging(options):
+    """Ask Chrome to record network events in the performance log"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+def lead_id_from_url(url):
+    """Return the lead id part of a /sales/lead/ URL, or None"""
+    match = LEAD_ID_PATTERN.search(url or "")
+    return match.group(1) if match else None
+
+def profile_url_from_urn(urn):
+    """Turn a urn:li:fs_salesProfile:(id,auth type,token) into the lead's Sales Navigator URL"""
+    match = PROFILE_URN_PATTERN.search(urn or "")
+    if not match:
+        return None
+    return f"https://www.linkedin.com/sales/lead/{','.join(match.groups())}"
+
+def _current_position(record):
+    """Return the lead's current (or first listed) position"""
+    positions = record.get("currentPositions") or record.get("positions") or []
+    current = [position for position in positions if position.get("current", True)]
+    return (current or positions or [{}])[0]
+
+def parse_lead_record(record):
+    """Convert one lead element of a search or profile payload into a scraper lead dict"""
+    urn = record.get("entityUrn") or record.get("objectUrn") or ""
+    profile_url = profile_url_from_urn(urn)
+    if not profile_url:
+        return None
+
+    name = record.get("fullName") or " ".join(
+        part for part in (record.get("firstName"), record.get("lastName")) if part
+    )
+    position = _current_position(record)
+
+    contact_info = record.get("contactInfo") or {}
+    emails = [item.get("emailAddress") for item in contact_info.get("emails", []) if item.get("emailAddress")]
+    websites = [item.get("url") for item in contact_info.get("websites", []) if item.get("url")]
+
+    return {
+        "Name": name or "N/A",
+        "Title": position.get("title") or record.get("headline") or "N/A",
+        "Company": position.get("companyName") or "N/A",
+        "Profile URL": profile_url,
+        "Email": emails[0] if emails else "N/A",
+        "Website": websites[0] if websites else "N/A",
+    }
+
+def parse_search_payload(payload):
+    """Return the leads listed in a lead search response"""
+    leads = []
+    for record in payload.get("elements", []):
+        lead = parse_lead_record(record)
+        if lead:
+            leads.append(lead)
+    return leads
+
+def parse_profile_payload(payload):
+    """Return the lead described by a profile response (as a one-item list)"""
+    lead = parse_lead_record(payload)
+    return [lead] if lead else []
+
+class SalesApiCapture:
+    """Reads Sales Navigator API responses out of the browser's performance log"""
+
+    def __init__(self, driver):
+        """Initialize with a driver started with enable_performance_logging()"""
+        self.driver = driver
+        # lead id -> lead dict, merged across search and profile responses
+        self.leads = {}
+        self.responses = 0
+        self.errors = 0
+
+    def _response_events(self):
+        """Yield (request id, url) for every finished Sales API response since the last call"""
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+
+            if message.get("method") != "Network.responseReceived":
+                continue
+
+            params = message.get("params", {})
+            url = params.get("response", {}).get("url", "")
+            if "/sales-api/" in url:
+                yield params.get("requestId"), url
+
+    def _response_body(self, request_id):
+        """Fetch and decode a captured response body"""
+        body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        return json.loads(body.get("body") or "{}")
+
+    def collect(self):
+        """Parse every new search/profile response and return the number of leads seen"""
+        found = 0
+        for request_id, url in self._response_events():
+            if any(endpoint in url for endpoint in SEARCH_ENDPOINTS):
+                parser = parse_search_payload
+            elif any(endpoint in url for endpoint in PROFILE_ENDPOINTS):
+                parser = parse_profile_payload
+            else:
+                continue
+
+            try:
+                leads = parser(self._response_body(request_id))
+            except Exception as e:
+                # The body can be evicted before we ask for it; the DOM path covers those leads
+                self.errors += 1
+                logging.debug(f"Could not read Sales API response {url}: {e}")
+                continue
+
+            self.responses += 1
+            for lead in leads:
+                self._merge(lead)
+            found += len(leads)
+        return found
+
+    def _merge(self, lead):
+        """Store a lead, keeping fields already known when the new record lacks them"""
+        lead_id = lead_id_from_url(lead["Profile URL"])
+        existing = self.leads.setdefault(lead_id, {})
+        for key, value in lead.items():
+            if value != "N/A" or key not in existing:
+                existing[key] = value
+
+    def get(self, profile_url):
+        """Return the captured lead for a profile URL, or None"""
+        return self.leads.get(lead_id_from_url(profile_url))
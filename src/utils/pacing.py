@@ -0,0 +1,38 @@
+"""
+Human-like pacing for the browser scrapers
+Random pauses that make the browsing look less automated, kept separate from
+page-load waits so both can be tuned and measured on their own
+"""
+import time
+import random
+
+from config.config import PACING_ENABLED, PACING_SCALE, PACING_DELAYS
+
+class PacingPolicy:
+    """Sleeps a random, configurable amount of time for each kind of action"""
+
+    def __init__(self, delays=None, enabled=PACING_ENABLED, scale=PACING_SCALE):
+        """
+        Args:
+            delays: dict of action name -> (min seconds, max seconds), defaults to PACING_DELAYS
+            enabled: set False to skip every pause (e.g. when debugging)
+            scale: multiplier applied to every pause
+        """
+        self.delays = delays or PACING_DELAYS
+        self.enabled = enabled
+        self.scale = scale
+        self.total_pause = 0.0
+        self.pause_count = 0
+
+    def pause(self, action):
+        """Sleep a random time from the action's range and return the seconds slept"""
+        if not self.enabled:
+            return 0.0
+
+        low, high = self.delays.get(action, (0, 0))
+        delay = random.uniform(low, high) * self.scale
+        if delay > 0:
+            time.sleep(delay)
+            self.total_pause += delay
+            self.pause_count += 1
+        return delay
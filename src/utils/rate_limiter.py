@@ -0,0 +1,107 @@
+"""
+Token-bucket rate limiting for the enrichment provider APIs
+"""
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks callers until a request may be sent"""
+
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate: tokens added per second (sustained requests per second)
+            capacity: maximum burst size, defaults to one second worth of tokens
+        """
+        self.rate = validate_rate(rate)
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        """Add the tokens earned since the last update"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate):
+        """Change the sustained rate (e.g. from a command line override)"""
+        rate = validate_rate(rate)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.paused_until - now
+
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Stop handing out tokens for a while (e.g. after a 429)"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+    def update_from_headers(self, headers):
+        """Pause until the provider's window resets once it reports no remaining quota"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None or not remaining.strip().isdigit() or int(remaining) > 0:
+            return
+
+        reset_after = parse_reset_header(headers.get("X-RateLimit-Reset"))
+        if reset_after:
+            logging.info(f"Rate limit window exhausted, pausing {reset_after:.1f}s")
+            self.pause(reset_after)
+
+def validate_rate(rate):
+    """Return rate if it is a positive number of requests per second, else raise ValueError"""
+    if not isinstance(rate, (int, float)) or rate <= 0:
+        raise ValueError(f"Rate limit must be a positive number of requests per second, got {rate!r}")
+    return rate
+
+def parse_reset_header(value):
+    """Convert a reset header (seconds or epoch timestamp) into seconds from now"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+
+    # Some providers send an epoch timestamp instead of a relative delay
+    if value > 1e9:
+        value -= time.time()
+    return max(0.0, value)
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) into seconds from now"""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt, base=1.0, maximum=60.0):
+    """Exponential backoff with jitter for the given retry attempt (0-based)"""
+    delay = min(maximum, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,130 @@
+"""
+Dependency-aware stage scheduler for the lead generation pipeline
+Each stage declares the stages it depends on and runs as soon as they have
+finished, so independent branches (e.g. LinkedIn and Apollo) overlap
+"""
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+class StageResult:
+    """Outcome and timing of a single pipeline stage"""
+
+    def __init__(self, name):
+        """Initialize an empty result for the named stage"""
+        self.name = name
+        self.value = None
+        self.status = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def duration(self):
+        """Seconds the stage took to run, or 0 if it never started"""
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    @property
+    def succeeded(self):
+        """True if the stage ran without raising"""
+        return self.status == SUCCEEDED
+
+class Stage:
+    """A named unit of pipeline work and the stages whose results it consumes"""
+
+    def __init__(self, name, func, deps=()):
+        """
+        Args:
+            name: unique stage name
+            func: callable receiving the values of its dependencies, in deps order
+            deps: names of the stages that must finish first
+        """
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+
+class StageScheduler:
+    """Runs a DAG of stages, starting each one as soon as its dependencies are done"""
+
+    def __init__(self, max_workers=None):
+        """Initialize an empty graph; max_workers defaults to one thread per stage"""
+        self.max_workers = max_workers
+        self.stages = {}
+
+    def add(self, name, func, deps=()):
+        """Declare a stage; dependencies must already have been added"""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+
+        # Requiring dependencies up front keeps the graph acyclic by construction
+        self.stages[name] = Stage(name, func, deps)
+
+    def run(self):
+        """Run every stage and return a dict of stage name -> StageResult
+
+        A stage whose dependency failed or was skipped is skipped as well.
+        """
+        results = {name: StageResult(name) for name in self.stages}
+        pending = dict(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or max(1, len(self.stages))) as executor:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    dep_results = [results[dep] for dep in stage.deps]
+                    if any(dep.status in (FAILED, SKIPPED) for dep in dep_results):
+                        results[name].status = SKIPPED
+                        logging.warning(f"Skipping stage '{name}': a dependency did not succeed")
+                        del pending[name]
+                    elif all(dep.succeeded for dep in dep_results):
+                        args = [dep.value for dep in dep_results]
+                        running[executor.submit(self._run_stage, stage, args, results[name])] = name
+                        del pending[name]
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+
+        self.log_summary(results)
+        return results
+
+    def _run_stage(self, stage, args, result):
+        """Run one stage and record its value, status and timing"""
+        logging.info(f"Stage '{stage.name}' started")
+        result.started = time.time()
+        try:
+            result.value = stage.func(*args)
+            result.status = SUCCEEDED
+        except Exception as e:
+            result.error = e
+            result.status = FAILED
+            logging.error(f"Stage '{stage.name}' failed: {e}")
+        finally:
+            result.finished = time.time()
+        logging.info(f"Stage '{stage.name}' {result.status} in {result.duration:.1f}s")
+
+    def log_summary(self, results):
+        """Log start offset, duration and status of every stage"""
+        started = [result.started for result in results.values() if result.started is not None]
+        origin = min(started) if started else 0.0
+
+        logging.info("Pipeline stage timings:")
+        for name in self.stages:
+            result = results[name]
+            if result.started is None:
+                logging.info(f"  {name:<15} {result.status}")
+            else:
+                logging.info(f"  {name:<15} {result.status:<10} start +{result.started - origin:7.1f}s  "
+                             f"end +{result.finished - origin:7.1f}s  took {result.duration:7.1f}s")
@@ -0,0 +1,89 @@
+"""
+Resume cursors and cached search URLs for paginated searches
+Stores, per saved search, the next results page to read so a long pull can
+continue after an interruption without re-reading the pages already saved,
+and the search URL with the filters encoded so later runs can skip the filter clicks
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+
+from config.config import APOLLO_CURSOR_FILE, APOLLO_SEARCH_CACHE_FILE
+
+def search_key(filters):
+    """Fingerprint a search's filters (dict of name -> value) so each saved search gets its own cursor"""
+    payload = json.dumps(filters, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def _load_json(path):
+    """Read a JSON object from path, or {} if it is missing or unreadable"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable file {path}: {e}")
+        return {}
+
+def _save_json(path, data):
+    """Write a JSON object atomically so an interruption can't leave a half-written file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+class SearchCursor:
+    """Next page and rows saved so far for each search, kept in a small JSON file"""
+
+    def __init__(self, path=APOLLO_CURSOR_FILE):
+        """Initialize with the cursor file, loading any saved cursors"""
+        self.path = str(path)
+        self.cursors = _load_json(self.path)
+
+    def next_page(self, key):
+        """Return the 1-based page to read next for the search (1 if it has no cursor)"""
+        return self.cursors.get(key, {}).get("page", 1)
+
+    def rows(self, key):
+        """Return how many rows have been saved for the search so far"""
+        return self.cursors.get(key, {}).get("rows", 0)
+
+    def advance(self, key, page, rows):
+        """Record that a page was saved with the given number of rows"""
+        self.cursors[key] = {
+            "page": page + 1,
+            "rows": self.rows(key) + rows,
+            "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        _save_json(self.path, self.cursors)
+
+    def reset(self, key):
+        """Forget the search's cursor so the next pull starts from the first page"""
+        if self.cursors.pop(key, None) is not None:
+            _save_json(self.path, self.cursors)
+
+class SearchURLCache:
+    """Search URL (with the filters encoded in it) for each search, kept in a small JSON file"""
+
+    def __init__(self, path=APOLLO_SEARCH_CACHE_FILE):
+        """Initialize with the cache file, loading any saved URLs"""
+        self.path = str(path)
+        self.searches = _load_json(self.path)
+
+    def get(self, key):
+        """Return the cached URL for the search, or None"""
+        return self.searches.get(key, {}).get("url")
+
+    def save(self, key, url):
+        """Cache the URL a search's filters produced"""
+        self.searches[key] = {"url": url, "saved": time.strftime("%Y-%m-%d %H:%M:%S")}
+        _save_json(self.path, self.searches)
+
+    def forget(self, key):
+        """Drop a cached URL that no longer loads"""
+        if self.searches.pop(key, None) is not None:
+            _save_json(self.path, self.searches)
@@ -0,0 +1,140 @@
+"""
+Content-hash cache for enrichment stage outputs
+Each input row is fingerprinted together with the stage's configuration so a
+re-run only sends new or changed rows through the stage
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from config.config import STAGE_CACHE_DIR, STAGE_CACHE_TTL_DAYS
+
+CACHED_AT_COLUMN = "_cached_at"
+# DataFrame.attrs key listing the rows a stage couldn't get a final answer for
+STAGE_ERRORS_ATTR = "stage_errors"
+
+def mark_stage_error(df, idx):
+    """Record that a stage's provider call failed for a row, so its output is recomputed next run instead of cached"""
+    df.attrs.setdefault(STAGE_ERRORS_ATTR, []).append(idx)
+
+def file_fingerprint(path):
+    """Hash a source file so edits to a stage's code invalidate its cached outputs"""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+class StageCache:
+    """Stores each stage's output rows keyed by a hash of the input row"""
+
+    def __init__(self, cache_dir=STAGE_CACHE_DIR, ttl_days=STAGE_CACHE_TTL_DAYS):
+        """Initialize the cache directory and drop cache files past the TTL"""
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl_days * 24 * 60 * 60
+        # Parallel pipeline branches can run the same stage at once
+        self._lock = threading.Lock()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for path in self.cache_dir.glob("*.pkl"):
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink()
+
+    def config_key(self, name, df, config):
+        """Fingerprint the stage name, input columns and stage configuration"""
+        payload = json.dumps({"stage": name, "columns": sorted(map(str, df.columns)), "config": config or {}},
+                             sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def row_hashes(df):
+        """Hash every row's values (independent of column order and index)"""
+        columns = sorted(df.columns, key=str)
+        return pd.util.hash_pandas_object(df[columns].astype(str), index=False).astype("uint64").values
+
+    def _path(self, name, key):
+        """Return the cache file for a stage and config fingerprint"""
+        return self.cache_dir / f"{name}_{key}.pkl"
+
+    def _load(self, path):
+        """Read a stage's cached rows, dropping the ones past the TTL"""
+        if not path.exists():
+            return pd.DataFrame()
+
+        try:
+            cached = pd.read_pickle(path)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable stage cache {path}: {e}")
+            return pd.DataFrame()
+
+        return cached[cached[CACHED_AT_COLUMN] >= time.time() - self.ttl]
+
+    def _save(self, path, new_rows):
+        """Add freshly computed rows to the cache file"""
+        new_rows = new_rows.copy()
+        new_rows[CACHED_AT_COLUMN] = time.time()
+
+        with self._lock:
+            # Re-read under the lock so rows written by a parallel run aren't lost
+            cached = pd.concat([self._load(path), new_rows])
+            cached = cached[~cached.index.duplicated(keep="last")]
+            tmp_path = path.with_suffix(".tmp")
+            cached.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+
+    def run(self, name, stage, df, config=None, on_reuse=None):
+        """Run a stage on the rows that have no cached output and combine with the cached rows
+
+        The stage must return one output row per input row, in order.
+        on_reuse(reused_df) is called with the cached output rows before the
+        stage runs, e.g. to seed state the stage would have learned from them.
+        Rows the stage marked with mark_stage_error are returned but not cached.
+        """
+        if df.empty:
+            return stage(df)
+
+        path = self._path(name, self.config_key(name, df, config))
+        hashes = self.row_hashes(df)
+
+        with self._lock:
+            cached = self._load(path)
+
+        hit = pd.Series(hashes).isin(cached.index).values
+        reused = cached.loc[hashes[hit]].drop(columns=[CACHED_AT_COLUMN], errors="ignore")
+        reused.index = hit.nonzero()[0]
+        logging.info(f"Stage cache '{name}': reusing {hit.sum()} of {len(df)} rows, "
+                     f"{len(df) - hit.sum()} new or changed")
+
+        if hit.all():
+            result = reused
+        else:
+            if on_reuse and not reused.empty:
+                on_reuse(reused)
+
+            changed = df[~hit].copy()
+            changed.attrs.pop(STAGE_ERRORS_ATTR, None)
+            output = stage(changed)
+            if output is None:
+                return None
+            if len(output) != len(changed):
+                logging.warning(f"Stage '{name}' changed the number of rows; its output can't be cached")
+                return None
+
+            # Transient failures (rate limits, API errors) must be retried on the next run
+            failed = output.index.isin(output.attrs.pop(STAGE_ERRORS_ATTR, []))
+            if failed.any():
+                logging.info(f"Stage cache '{name}': not caching {failed.sum()} rows that hit provider errors")
+
+            output = output.copy()
+            output.index = hashes[~hit]
+            if not failed.all():
+                self._save(path, output[~failed])
+
+            output.index = (~hit).nonzero()[0]
+            result = pd.concat([reused, output]).sort_index()
+
+        result.index = df.index
+        return result
@@ -0,0 +1,139 @@
+"""
+Persistent cache of Hunter.io verification results shared by the enrichment scripts
+"""
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+from config.config import (
+    VERIFICATION_CACHE_FILE,
+    VERIFICATION_CACHE_TTL_DAYS,
+    VERIFICATION_CACHE_MAX_ENTRIES,
+    DOMAIN_CLASS_TTL_DAYS,
+)
+
+class VerificationCache:
+    """SQLite-backed store of email and domain verification results with a TTL"""
+
+    def __init__(self, db_path=VERIFICATION_CACHE_FILE, ttl_days=VERIFICATION_CACHE_TTL_DAYS,
+                 max_entries=VERIFICATION_CACHE_MAX_ENTRIES, domain_ttl_days=DOMAIN_CLASS_TTL_DAYS):
+        """Open (or create) the cache database and drop stale entries"""
+        self.db_path = str(db_path)
+        self.ttl = ttl_days * 24 * 60 * 60
+        self.domain_ttl = domain_ttl_days * 24 * 60 * 60
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # The verifier calls into the cache from several worker threads
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verifications ("
+            "email TEXT PRIMARY KEY, status TEXT, score INTEGER, checked_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_verifications_checked_at ON verifications (checked_at)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS domains ("
+            "domain TEXT PRIMARY KEY, classification TEXT, checked_at REAL)"
+        )
+        self._conn.commit()
+        self.evict()
+
+    @staticmethod
+    def normalize(email):
+        """Normalize an email address into a cache key"""
+        return str(email).strip().lower()
+
+    def get(self, email):
+        """Return the cached (status, score) for an email, or None if missing or expired"""
+        key = self.normalize(email)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, score, checked_at FROM verifications WHERE email = ?", (key,)
+            ).fetchone()
+
+            if row and time.time() - row[2] < self.ttl:
+                self.hits += 1
+                return row[0], row[1]
+
+            self.misses += 1
+            return None
+
+    def set(self, email, status, score):
+        """Store a verification result for an email"""
+        key = self.normalize(email)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verifications (email, status, score, checked_at) VALUES (?, ?, ?, ?)",
+                (key, status, score, time.time())
+            )
+            self._conn.commit()
+
+    def get_domain(self, domain):
+        """Return the cached classification for a domain, or None if missing or expired"""
+        key = self.normalize(domain)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT classification, checked_at FROM domains WHERE domain = ?", (key,)
+            ).fetchone()
+
+        if row and time.time() - row[1] < self.domain_ttl:
+            return row[0]
+        return None
+
+    def set_domain(self, domain, classification):
+        """Store the classification for a domain"""
+        key = self.normalize(domain)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO domains (domain, classification, checked_at) VALUES (?, ?, ?)",
+                (key, classification, time.time())
+            )
+            self._conn.commit()
+
+    def evict(self):
+        """Remove expired entries and trim the cache down to max_entries"""
+        with self._lock:
+            cutoff = time.time() - self.ttl
+            expired = self._conn.execute(
+                "DELETE FROM verifications WHERE checked_at < ?", (cutoff,)
+            ).rowcount
+
+            expired += self._conn.execute(
+                "DELETE FROM domains WHERE checked_at < ?", (time.time() - self.domain_ttl,)
+            ).rowcount
+
+            # Drop the oldest entries if the cache grew past its size limit
+            overflow = self._conn.execute(
+                "DELETE FROM verifications WHERE email IN ("
+                "SELECT email FROM verifications ORDER BY checked_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._conn.commit()
+
+        if expired or overflow:
+            logging.info(f"Verification cache evicted {expired} expired and {overflow} overflow entries")
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_verification_cache():
+    """Return the process-wide verification cache, creating it on first use"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = VerificationCache()
+        return _shared_cache
@@ -0,0 +1,107 @@
+"""
+Readiness waits for the browser scrapers
+Each wait returns as soon as the page is ready instead of sleeping a fixed
+time, and the time spent waiting is tracked separately from pacing delays
+"""
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from config.config import READY_TIMEOUT, SETTLE_TIMEOUT, SETTLE_QUIET_PERIOD, SETTLE_POLL_INTERVAL
+
+# Records the time of the last DOM change inside the watched element
+MUTATION_OBSERVER_JS = """
+const target = arguments[0] ? document.querySelector(arguments[0]) : document.body;
+if (!target) { return false; }
+window.__chaseiqLastMutation = performance.now();
+if (window.__chaseiqObserver) { window.__chaseiqObserver.disconnect(); }
+window.__chaseiqObserver = new MutationObserver(() => { window.__chaseiqLastMutation = performance.now(); });
+window.__chaseiqObserver.observe(target, {childList: true, subtree: true});
+return true;
+"""
+
+# Returns the watched element's height and how long ago its DOM last changed (ms)
+SETTLE_STATE_JS = """
+const target = arguments[0] ? document.querySelector(arguments[0]) : document.body;
+const height = target ? target.scrollHeight : 0;
+const quiet = window.__chaseiqLastMutation === undefined ? null : performance.now() - window.__chaseiqLastMutation;
+return [height, quiet];
+"""
+
+class PageWaiter:
+    """Waits for page readiness conditions and measures the time spent waiting"""
+
+    def __init__(self, driver, timeout=READY_TIMEOUT):
+        """Initialize with the driver and the default timeout in seconds"""
+        self.driver = driver
+        self.timeout = timeout
+        self.total_wait = 0.0
+        self.wait_count = 0
+        self.timeouts = 0
+
+    def _until(self, condition, timeout=None):
+        """Wait for a WebDriverWait condition; returns its value or None on timeout"""
+        start = time.monotonic()
+        try:
+            return WebDriverWait(self.driver, timeout or self.timeout).until(condition)
+        except TimeoutException:
+            self.timeouts += 1
+            return None
+        finally:
+            self.total_wait += time.monotonic() - start
+            self.wait_count += 1
+
+    def document_ready(self, timeout=None):
+        """Wait until the document has finished loading"""
+        return self._until(
+            lambda driver: driver.execute_script("return document.readyState") == "complete", timeout
+        )
+
+    def element(self, locator, timeout=None):
+        """Wait until an element matching the (By, value) locator is present"""
+        return self._until(EC.presence_of_element_located(locator), timeout)
+
+    def url(self, predicate, timeout=None):
+        """Wait until the current URL satisfies predicate(url); returns the URL or None"""
+        return self._until(lambda driver: driver.current_url if predicate(driver.current_url) else False, timeout)
+
+    def stale(self, element, timeout=None):
+        """Wait until an element is detached, e.g. the old results after a page turn"""
+        return self._until(EC.staleness_of(element), timeout)
+
+    def watch_mutations(self, selector=None):
+        """Start recording DOM changes under the selector (the whole body by default)"""
+        return self.driver.execute_script(MUTATION_OBSERVER_JS, selector)
+
+    def settled(self, selector=None, timeout=SETTLE_TIMEOUT, quiet_period=SETTLE_QUIET_PERIOD):
+        """Wait until the element's height is stable and no rows were added for quiet_period seconds
+
+        Call watch_mutations() first; returns the final scroll height.
+        """
+        start = time.monotonic()
+        last_height = None
+        stable_since = start
+
+        while True:
+            height, quiet_ms = self.driver.execute_script(SETTLE_STATE_JS, selector)
+            now = time.monotonic()
+
+            if height != last_height:
+                last_height = height
+                stable_since = now
+
+            # Prefer the observer's view; fall back to height stability if it isn't installed
+            quiet = quiet_ms / 1000 if quiet_ms is not None else now - stable_since
+            if quiet >= quiet_period and now - stable_since >= quiet_period:
+                break
+            if now - start >= timeout:
+                self.timeouts += 1
+                break
+
+            time.sleep(SETTLE_POLL_INTERVAL)
+
+        self.total_wait += time.monotonic() - start
+        self.wait_count += 1
+        return last_height
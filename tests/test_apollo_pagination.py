@@ -0,0 +1,91 @@
+from src import ApolloScraper as apollo
+from src.ApolloScraper import collect_data, with_page
+from src.utils.search_cursor import SearchCursor, search_key
+
+class FakeResultsPage:
+    """Serves a snapshot of `rows` rows for each page number"""
+
+    def __init__(self, pageSizes):
+        self.pageSizes = pageSizes
+        self.page = 1
+
+    def execute_script(self, script, *args):
+        rows = [{"cells": ["", f"Lead{self.page}x{i} Person", "CEO", "Acme", f"l{i}@acme.com", ""], "linkedin": None}
+                for i in range(self.pageSizes[self.page - 1])]
+        return {"headers": [], "rows": rows}
+
+def fake_next_page(browser):
+    browser.page += 1
+    return True
+
+def test_short_last_page_ends_the_pull(monkeypatch):
+    monkeypatch.setattr(apollo, "wait_for_table", lambda browser: None)
+    monkeypatch.setattr(apollo, "next_page", fake_next_page)
+    saved = []
+
+    pages, exhausted = collect_data(FakeResultsPage([25, 25, 7]), False, lambda page, raw, clean: saved.append((page, len(clean))),
+                                    pageCount=5)
+
+    assert (pages, exhausted) == (3, True)
+    assert saved == [(1, 25), (2, 25), (3, 7)]
+
+def test_page_count_and_cursor_resume(monkeypatch, tmp_path):
+    monkeypatch.setattr(apollo, "wait_for_table", lambda browser: None)
+    monkeypatch.setattr(apollo, "next_page", fake_next_page)
+    key = search_key({"JOB_TITLES": "CEO"})
+    cursor = SearchCursor(tmp_path / "cursor.json")
+
+    browser = FakeResultsPage([25] * 6)
+    pages, exhausted = collect_data(browser, False, lambda page, raw, clean: cursor.advance(key, page, len(clean)), pageCount=2)
+    assert (pages, exhausted) == (2, False)
+
+    # A new run picks up the saved cursor from disk
+    resumed = SearchCursor(tmp_path / "cursor.json")
+    assert resumed.next_page(key) == 3 and resumed.rows(key) == 50
+    resumed.reset(key)
+    assert SearchCursor(tmp_path / "cursor.json").next_page(key) == 1
+
+def test_with_page_replaces_the_page_param():
+    url = "https://app.apollo.io/#/people?page=1&personTitles[]=ceo&sortAscending=false"
+    assert with_page(url, 4) == "https://app.apollo.io/#/people?personTitles[]=ceo&sortAscending=false&page=4"
+    assert with_page("https://app.apollo.io/#/people", 2) == "https://app.apollo.io/#/people?page=2"
+
+class FakeTab:
+    def __init__(self, text):
+        self.text = text
+
+def test_filter_tabs_found_by_title():
+    tabs = [FakeTab(text) for text in ["Lists", "Persona", "Email Status\n1", "Job Titles", "Company", "Location", "Employees", "Industry & Keywords"]]
+    assert apollo.filter_tab(tabs, "industry").text == "Industry & Keywords"
+    assert apollo.filter_tab(list(reversed(tabs)), "location").text == "Location"
+
+def test_cached_search_skips_filter_clicks(monkeypatch, tmp_path):
+    from src.utils.search_cursor import SearchURLCache
+
+    class FakeBrowser:
+        current_url = "https://app.apollo.io/#/people?personTitles[]=ceo&page=1"
+        def get(self, url):
+            self.opened = url
+
+    clicks = []
+    monkeypatch.setattr(apollo, "wait_for_table", lambda browser: None)
+    monkeypatch.setattr(apollo, "apply_filters", lambda browser: clicks.append(browser))
+    searches = SearchURLCache(tmp_path / "searches.json")
+
+    apollo.open_search(FakeBrowser(), "key", searches=searches)
+    assert len(clicks) == 1 and SearchURLCache(tmp_path / "searches.json").get("key") == FakeBrowser.current_url
+
+    browser = FakeBrowser()
+    apollo.open_search(browser, "key", page=3, searches=searches)
+    assert len(clicks) == 1
+    assert browser.opened == "https://app.apollo.io/#/people?personTitles[]=ceo&page=3"
+
+def test_each_saved_search_url_gets_its_own_cursor(monkeypatch):
+    monkeypatch.setattr(apollo, "APOLLO_SEARCH_URL", "")
+    filters_key = apollo.apollo_search_key()
+
+    monkeypatch.setattr(apollo, "APOLLO_SEARCH_URL", "https://app.apollo.io/#/people?personTitles[]=ceo")
+    ceo_key = apollo.apollo_search_key()
+    monkeypatch.setattr(apollo, "APOLLO_SEARCH_URL", "https://app.apollo.io/#/people?personTitles[]=cto")
+
+    assert len({filters_key, ceo_key, apollo.apollo_search_key()}) == 3
@@ -0,0 +1,48 @@
+from src import ApolloScraper as apollo
+from src.ApolloScraper import show_all_emails, HIDDEN_EMAIL_ROWS_JS
+from src.utils.pacing import PacingPolicy
+
+class FakeButton:
+    def __init__(self, browser, rowId):
+        self.browser = browser
+        self.rowId = rowId
+
+    def click(self):
+        self.browser.clicked.append(self.rowId)
+        self.browser.polls[self.rowId] = 0
+
+class FakeApolloPage:
+    """Rows reveal after a set number of polls; None never reveals"""
+
+    def __init__(self, revealAfter):
+        self.revealAfter = revealAfter
+        self.clicked = []
+        self.polls = {}
+        self.maxInFlight = 0
+
+    def execute_script(self, script, *args):
+        if script == HIDDEN_EMAIL_ROWS_JS:
+            return list(self.revealAfter)
+        rowIds = args[0]
+        self.maxInFlight = max(self.maxInFlight, len(rowIds))
+        states = {}
+        for rowId in rowIds:
+            self.polls[rowId] += 1
+            after = self.revealAfter[rowId]
+            states[rowId] = 'revealed' if after is not None and self.polls[rowId] >= after else 'pending'
+        return states
+
+    def find_elements(self, by, xpath):
+        return [FakeButton(self, rowId) for rowId in self.revealAfter if f"'{rowId}'" in xpath]
+
+def test_reveals_are_bounded_and_time_out_per_row(monkeypatch):
+    monkeypatch.setattr(apollo, "SETTLE_POLL_INTERVAL", 0.01)
+    page = FakeApolloPage({"table-row-0": 1, "table-row-1": 3, "table-row-2": None,
+                           "table-row-3": 2, "table-row-4": 1})
+
+    results = show_all_emails(page, concurrency=2, timeout=0.1, pacing=PacingPolicy(enabled=False))
+
+    assert page.maxInFlight == 2
+    assert sorted(page.clicked) == sorted(page.revealAfter)
+    assert results == {"table-row-0": "revealed", "table-row-1": "revealed", "table-row-2": "timeout",
+                       "table-row-3": "revealed", "table-row-4": "revealed"}
@@ -0,0 +1,41 @@
+from src.ApolloScraper import parse_table, DEFAULT_CLEAN_HEADERS
+
+def row(name, email, linkedin=None):
+    # Leading checkbox cell, then the columns in the order Apollo shows them
+    return {"cells": ["", name, "CEO", "Acme", email, "555-0100", "", "", "Austin, TX", "50", "Software", ""],
+            "linkedin": linkedin}
+
+HEADERS = ["", "Name", "Job Title", "Company", "Emails", "Phone Numbers", "Links", "Actions",
+           "Contact Location", "# Employees", "Industries", "Keywords"]
+
+def test_header_driven_mapping():
+    snapshot = {"headers": HEADERS, "rows": [
+        row("Jane Q Doe", "jane@acme.com", "https://www.linkedin.com/in/jane"),
+        row("Bob Roe", "bob@gmail.com"),
+        row("Ann Lee", "Access email"),
+    ]}
+
+    raw, clean = parse_table(snapshot, DEFAULT_CLEAN_HEADERS)
+
+    # The personal email row is dropped; the link lands in the Links column
+    assert [r[0] for r in raw] == ["Jane Q Doe", "Ann Lee"]
+    assert raw[0][5] == "https://www.linkedin.com/in/jane" and raw[1][5] == "N/A"
+    assert clean == [["Jane", "Doe", "CEO", "jane@acme.com", "555-0100"],
+                     ["Ann", "Lee", "CEO", "Access email", "555-0100"]]
+
+def test_reordered_columns_follow_headers():
+    headers = ["", "Emails", "Name", "Job Title", "Phone Numbers"]
+    snapshot = {"headers": headers, "rows": [{"cells": ["", "jane@acme.com", "Jane Doe", "CEO", "555"],
+                                              "linkedin": "https://www.linkedin.com/in/jane"}]}
+
+    raw, clean = parse_table(snapshot, ["first_name", "last_name", "title", "email", "phone"])
+    assert clean == [["Jane", "Doe", "CEO", "jane@acme.com", "555"]]
+    # Without a Links header the profile link doesn't overwrite any cell
+    assert raw == [["jane@acme.com", "Jane Doe", "CEO", "555"]]
+
+def test_falls_back_to_known_layout_without_headers():
+    raw, clean = parse_table({"headers": [], "rows": [row("Jane Doe", "jane@acme.com", "https://www.linkedin.com/in/jane")]},
+                             DEFAULT_CLEAN_HEADERS)
+    assert clean == [["Jane", "Doe", "CEO", "jane@acme.com", "555-0100"]]
+    # The link lands in the Links cell (index 6) of the known layout; raw rows drop the leading checkbox cell
+    assert raw[0][5] == "https://www.linkedin.com/in/jane"
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from src.utils.chunked_csv import transform_csv
+from src.SalesNav_CSVCleaner import clean_dataframe
+
+def leads(n):
+    return pd.DataFrame({
+        "Name": [f"Lead{i} Person" if i % 3 else "Cher" for i in range(n)],
+        "Title": ["CEO" if i % 4 else "Engineer" for i in range(n)],
+        "Company": ["Acme Inc"] * n,
+        "Profile URL": [f"https://www.linkedin.com/sales/lead/{i}" for i in range(n)],
+        "Email": [f"lead{i}@acme.com" if i % 2 else "N/A" for i in range(n)],
+        "Website": ["N/A"] * n,
+    })
+
+def test_chunked_transform_matches_whole_file(tmp_path):
+    input_csv = tmp_path / "raw.csv"
+    leads(103).to_csv(input_csv, index=False)
+
+    assert transform_csv(input_csv, tmp_path / "chunked.csv", clean_dataframe, chunksize=10) == (103, 51)
+    transform_csv(input_csv, tmp_path / "whole.csv", clean_dataframe, chunksize=1000)
+
+    assert (tmp_path / "chunked.csv").read_text() == (tmp_path / "whole.csv").read_text()
+
+def test_failed_chunk_leaves_file_unchanged(tmp_path):
+    path = tmp_path / "leads.csv"
+    leads(30).to_csv(path, index=False)
+    before = path.read_text()
+
+    chunks = []
+    def fail_on_second_chunk(chunk):
+        chunks.append(chunk)
+        return None if len(chunks) == 2 else chunk.assign(Email="changed")
+
+    assert transform_csv(path, path, fail_on_second_chunk, chunksize=10) is None
+    assert path.read_text() == before
+    assert list(tmp_path.iterdir()) == [path]
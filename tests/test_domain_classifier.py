@@ -0,0 +1,70 @@
+import os
+import tempfile
+
+from src.domain_classifier import DomainClassifier, DELIVERABLE, CATCH_ALL, DEAD, UNKNOWN
+from src.utils.verification_cache import VerificationCache
+
+class StubResolver:
+    """Resolves MX records from a dict instead of DNS"""
+
+    def __init__(self, records):
+        self.records = records
+        self.lookups = []
+
+    def resolve_mx(self, domain):
+        self.lookups.append(domain)
+        if domain not in self.records:
+            raise TimeoutError(f"lookup timed out for {domain}")
+        return self.records[domain]
+
+def accept_all_probe(email):
+    """Probe that behaves like a catch-all mail server"""
+    return ("accept_all", 70)
+
+def strict_probe(email):
+    """Probe that rejects unknown mailboxes"""
+    return ("invalid", 0)
+
+def test_dead_domain_skips_probe():
+    probes = []
+    resolver = StubResolver({"nomail.example": []})
+    classifier = DomainClassifier(probe=lambda email: probes.append(email), resolver=resolver)
+
+    assert classifier.classify("nomail.example") == DEAD
+    assert probes == []
+
+def test_catch_all_and_deliverable_domains():
+    resolver = StubResolver({"acme.example": ["mx.acme.example"]})
+
+    assert DomainClassifier(probe=accept_all_probe, resolver=resolver).classify("acme.example") == CATCH_ALL
+    assert DomainClassifier(probe=strict_probe, resolver=resolver).classify("ACME.example") == DELIVERABLE
+
+def test_lookup_failures_are_not_cached():
+    resolver = StubResolver({})
+    classifier = DomainClassifier(probe=strict_probe, resolver=resolver)
+
+    assert classifier.classify("flaky.example") == UNKNOWN
+    assert classifier.classify("flaky.example") == UNKNOWN
+    assert resolver.lookups == ["flaky.example", "flaky.example"]
+
+def test_classification_is_cached_between_runs():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = VerificationCache(os.path.join(tmp, "cache.db"))
+        resolver = StubResolver({"acme.example": ["mx.acme.example"]})
+
+        DomainClassifier(probe=accept_all_probe, cache=cache, resolver=resolver).classify("acme.example")
+        second_run = DomainClassifier(probe=strict_probe, cache=cache, resolver=resolver)
+
+        assert second_run.classify("acme.example") == CATCH_ALL
+        assert resolver.lookups == ["acme.example"]
+        cache.close()
+
+def test_classify_without_probe_only_catches_dead_domains():
+    probes = []
+    resolver = StubResolver({"acme.example": ["mx.acme.example"], "nomail.example": []})
+    classifier = DomainClassifier(probe=lambda email: probes.append(email), resolver=resolver)
+
+    assert classifier.classify("acme.example", probe=False) == UNKNOWN
+    assert classifier.classify("acme.example", probe=False) == UNKNOWN
+    assert classifier.classify("nomail.example", probe=False) == DEAD
+    assert probes == [] and resolver.lookups == ["acme.example", "nomail.example"]
@@ -0,0 +1,44 @@
+import time
+import random
+import threading
+
+from src import email_verifier
+from src.email_verifier import verify_emails
+
+def test_results_keep_input_order_with_capped_concurrency(monkeypatch):
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def fake_verify(email):
+        with lock:
+            in_flight.append(email)
+            peak.append(len(in_flight))
+        # Finish out of order so ordering has to come from the gather, not the timing
+        time.sleep(random.uniform(0, 0.03))
+        with lock:
+            in_flight.remove(email)
+        return email.startswith("good")
+
+    monkeypatch.setattr(email_verifier, "verify_email", fake_verify)
+    emails = [f"{'good' if i % 3 else 'bad'}{i}@acme.com" for i in range(20)]
+
+    assert verify_emails(emails, concurrency=3) == [email.startswith("good") for email in emails]
+    assert max(peak) <= 3
+
+def test_rate_limited_verification_is_not_recorded_as_invalid(tmp_path, monkeypatch):
+    import pandas as pd
+    from src.utils import verification_cache
+    from src.utils.http_client import RateLimitedError
+    from src.utils.verification_cache import VerificationCache
+
+    class RateLimitedClient:
+        def get(self, url, params=None):
+            raise RateLimitedError("hunter still rate limited")
+
+    cache = VerificationCache(tmp_path / "cache.db")
+    monkeypatch.setattr(verification_cache, "_shared_cache", cache)
+    monkeypatch.setattr(email_verifier, "get_client", lambda name: RateLimitedClient())
+
+    assert email_verifier.verify_email("jane@acme.com") is None
+    assert cache.get("jane@acme.com") is None
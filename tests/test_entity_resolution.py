@@ -0,0 +1,35 @@
+import pandas as pd
+
+from src.utils.entity_resolution import resolve_entities, similar_names
+
+def lead(first, last, source, email="", domain="", linkedin_url="", phone=""):
+    return {"first_name": first, "last_name": last, "email": email, "domain": domain,
+            "linkedin_url": linkedin_url, "phone": phone, "source": source}
+
+def test_golden_records_merge_fields_across_sources():
+    df = pd.DataFrame([
+        lead("Jane", "Doe", "LinkedIn", domain="acme.com", linkedin_url="https://www.linkedin.com/sales/lead/ACw1,NAME,x"),
+        lead("Bob", "Roe", "LinkedIn", email="bob@acme.com"),
+        lead("Jane", "Doe", "Apollo", email="Jane@Acme.com", phone="555-0100"),
+        lead("Jon", "Smith", "Apollo", domain="acme.com"),
+        lead("John", "Smith", "LinkedIn", email="john@acme.com"),
+        lead("Robert", "Roe", "Apollo", email="BOB@acme.com", phone="555-0199"),
+        lead("Mary", "Smith", "Apollo", domain="acme.com"),
+        lead("Jane", "Doe", "Apollo", email="jane@gmail.com"),
+    ])
+
+    golden = resolve_entities(df)
+
+    assert golden[["first_name", "last_name", "email", "phone", "source", "sources"]].values.tolist() == [
+        # LinkedIn's fields win; Apollo fills the email and phone LinkedIn didn't have
+        ["Jane", "Doe", "Jane@Acme.com", "555-0100", "LinkedIn", "LinkedIn,Apollo"],
+        ["Bob", "Roe", "bob@acme.com", "555-0199", "LinkedIn", "LinkedIn,Apollo"],
+        ["John", "Smith", "john@acme.com", "", "LinkedIn", "LinkedIn,Apollo"],
+        ["Mary", "Smith", "", "", "Apollo", "Apollo"],
+        # A personal address gives no company domain to match on
+        ["Jane", "Doe", "jane@gmail.com", "", "Apollo", "Apollo"],
+    ]
+
+def test_ambiguous_initial_is_not_matched():
+    assert similar_names(["jane", "j"]) == [("jane", "j")]
+    assert similar_names(["jane", "john", "j"]) == []
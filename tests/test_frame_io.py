@@ -0,0 +1,39 @@
+import pytest
+import pandas as pd
+
+pytest.importorskip("pyarrow")
+
+from src.utils.frame_io import write_frame, read_frame, read_columns, intermediate_suffix
+from src.utils.chunked_csv import transform_csv
+
+def test_parquet_round_trip_keeps_types(tmp_path):
+    df = pd.DataFrame({
+        "first_name": ["Jane", None, "Bob"],
+        "email": ["jane@acme.com", "N/A", None],
+        "source": ["LinkedIn", "Apollo", "LinkedIn"],
+        "Email_Verified": [True, False, True],
+    })
+    path = write_frame(df, tmp_path / "merged.parquet")
+
+    assert intermediate_suffix("csv") == ".csv"
+    assert intermediate_suffix("auto") == ".parquet"
+    assert read_columns(path) == list(df.columns)
+
+    read = read_frame(path)
+    assert read["Email_Verified"].dtype == bool
+    assert read["source"].dtype == "category"
+    # Missing strings come back as NaN, like read_csv, so astype(str) cleanup still works
+    assert read["email"].astype(str).tolist() == ["jane@acme.com", "N/A", "nan"]
+    assert read["first_name"].tolist()[0] == "Jane" and pd.isna(read["first_name"][1])
+
+def test_chunked_csv_to_parquet_and_back(tmp_path):
+    source = tmp_path / "leads.csv"
+    pd.DataFrame({
+        "name": [f"Lead {i}" for i in range(25)],
+        "phone": [None] * 10 + ["555-0100"] * 15,
+        "source": ["Apollo"] * 25,
+    }).to_csv(source, index=False)
+
+    assert transform_csv(source, tmp_path / "leads.parquet", lambda chunk: chunk, chunksize=10) == (25, 25)
+    assert transform_csv(tmp_path / "leads.parquet", tmp_path / "back.csv", lambda chunk: chunk, chunksize=7) == (25, 25)
+    assert (tmp_path / "back.csv").read_text() == source.read_text()
@@ -0,0 +1,87 @@
+from src.utils import http_client
+from src.utils.http_client import ProviderClient
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+class FakeSession:
+    """Answers each request with the next scripted response"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+class FakeLimiter:
+    def __init__(self):
+        self.acquired = 0
+        self.pauses = []
+
+    def acquire(self):
+        self.acquired += 1
+
+    def pause(self, seconds):
+        self.pauses.append(seconds)
+
+    def update_from_headers(self, headers):
+        pass
+
+def make_client(responses, monkeypatch, **kwargs):
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    client = ProviderClient("test", **kwargs)
+    client.session = FakeSession(responses)
+    client.limiter = FakeLimiter()
+    return client, sleeps
+
+def test_server_errors_retry_with_growing_backoff(monkeypatch):
+    client, sleeps = make_client([FakeResponse(503), FakeResponse(502), FakeResponse(200)], monkeypatch,
+                                 backoff_base=1.0, max_retries=3)
+
+    assert client.get("https://api.example.com").status_code == 200
+    assert client.session.requests == client.limiter.acquired == 3
+    # Jittered exponential backoff: attempt 0 waits 0.5-1s, attempt 1 waits 1-2s
+    assert 0.5 <= sleeps[0] <= 1.0 and 1.0 <= sleeps[1] <= 2.0
+    assert client.limiter.pauses == []
+
+def test_rate_limit_honours_retry_after_for_every_caller(monkeypatch):
+    client, sleeps = make_client([FakeResponse(429, {"Retry-After": "7"}), FakeResponse(200)], monkeypatch)
+
+    assert client.get("https://api.example.com").status_code == 200
+    # A 429 pauses the shared limiter instead of sleeping only this caller
+    assert client.limiter.pauses == [7.0]
+    assert sleeps == []
+
+def test_client_errors_are_not_retried(monkeypatch):
+    client, sleeps = make_client([FakeResponse(404)], monkeypatch)
+
+    assert client.get("https://api.example.com").status_code == 404
+    assert client.session.requests == 1 and sleeps == []
+
+def test_exhausted_rate_limit_raises_instead_of_returning(monkeypatch):
+    import pytest
+    from src.utils.http_client import RateLimitedError
+
+    client, sleeps = make_client([FakeResponse(429)] * 3, monkeypatch, max_retries=2)
+    with pytest.raises(RateLimitedError):
+        client.get("https://api.example.com")
+    assert client.session.requests == 3
+
+def test_token_bucket_rejects_non_positive_rates():
+    import pytest
+    from src.utils.rate_limiter import TokenBucket
+
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+    bucket = TokenBucket(5)
+    with pytest.raises(ValueError):
+        bucket.set_rate(0)
+    assert bucket.rate == 5
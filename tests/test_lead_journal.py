@@ -0,0 +1,56 @@
+import csv
+
+from src.utils.lead_journal import LeadJournal
+
+def lead(n):
+    return {"Name": f"Lead {n}", "Title": "CEO", "Company": "Acme", "Profile URL": f"https://www.linkedin.com/sales/lead/{n}",
+            "Email": "N/A", "Website": "N/A"}
+
+def test_resume_skips_journaled_leads_and_survives_torn_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = LeadJournal(path)
+    journal.record_links([lead(n)["Profile URL"] for n in range(3)])
+    journal.record_page("search", 2)
+    journal.record_lead(lead(0))
+    journal.close()
+
+    # Simulate a crash in the middle of writing the next entry
+    with open(path, "a") as f:
+        f.write('{"type": "lead", "Name": "Lea')
+
+    resumed = LeadJournal(path)
+    assert resumed.pending_links() == [lead(1)["Profile URL"], lead(2)["Profile URL"]]
+    assert resumed.last_page("search") == 2
+    assert resumed.lead_count() == 1
+
+    resumed.record_lead(lead(1))
+    assert resumed.pending_links() == [lead(2)["Profile URL"]]
+
+def test_export_streams_leads_to_csv(tmp_path):
+    journal = LeadJournal(tmp_path / "journal.jsonl")
+    for n in range(3):
+        journal.record_lead(lead(n))
+
+    csv_path = tmp_path / "leads.csv"
+    assert journal.export_csv(csv_path) == 3
+
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["Name"] for row in rows] == ["Lead 0", "Lead 1", "Lead 2"]
+    assert "type" not in rows[0]
+
+    archived = journal.archive(tmp_path / "archive" / "journal.jsonl")
+    assert archived.exists() and not (tmp_path / "journal.jsonl").exists()
+
+def test_export_restores_link_order_of_leads_finished_out_of_order(tmp_path):
+    journal = LeadJournal(tmp_path / "journal.jsonl")
+    journal.record_links([lead(n)["Profile URL"] for n in range(4)])
+    # Profile workers finish in any order, and profile 2 failed
+    for n in (3, 1, 0):
+        journal.record_lead(lead(n))
+
+    csv_path = tmp_path / "leads.csv"
+    assert journal.export_csv(csv_path) == 3
+
+    with open(csv_path, newline="") as f:
+        assert [row["Name"] for row in csv.DictReader(f)] == ["Lead 0", "Lead 1", "Lead 3"]
@@ -0,0 +1,70 @@
+import pandas as pd
+
+from src.utils.lead_store import LeadStore, dedupe_leads, ENRICHED
+
+def test_migrates_profile_list_and_matches_by_url_email_and_name(tmp_path):
+    profile_list = tmp_path / "scraped_profiles.txt"
+    profile_list.write_text("https://www.linkedin.com/sales/lead/ACw123,NAME_SEARCH,abc\n")
+
+    store = LeadStore(tmp_path / "leads.db", profile_list=profile_list)
+    assert not profile_list.exists()
+    # Same lead id with a different search token is the same profile
+    assert store.has_profile("/sales/lead/ACw123,NAME_SEARCH,xyz")
+    assert not store.has_profile("https://www.linkedin.com/sales/lead/ACw456,NAME_SEARCH,abc")
+
+    store.add_lead({"Name": "Jane Doe", "Profile URL": "https://www.linkedin.com/sales/lead/ACw123,NAME_SEARCH,abc",
+                    "Email": "N/A", "Website": "https://www.acme.com/about"})
+    store.add_leads([{"first_name": "jane", "last_name": "DOE", "domain": "acme.com", "email": "Jane@Acme.com"}],
+                    status=ENRICHED)
+
+    # The enriched row merged into the scraped profile instead of adding a second lead
+    record = store.find({"Profile URL": "/sales/lead/ACw123"})
+    assert record["email"] == "jane@acme.com" and record["status"] == ENRICHED
+    assert store.known_email({"Name": "Jane Doe", "website": "acme.com"}) == "jane@acme.com"
+    assert store.is_enriched({"Email": "JANE@acme.com"})
+    assert not store.is_enriched({"first_name": "John", "last_name": "Doe", "domain": "acme.com"})
+    store.close()
+
+def test_queued_profiles_are_not_skipped_until_scraped(tmp_path):
+    store = LeadStore(tmp_path / "leads.db", profile_list=tmp_path / "missing.txt")
+    url = "https://www.linkedin.com/sales/lead/ACw789,NAME_SEARCH,abc"
+
+    # Collected by a run that crashed before visiting the profile
+    store.add_profiles([url])
+    assert not store.has_profile(url)
+
+    store.add_lead({"Name": "Jane Doe", "Profile URL": url})
+    assert store.has_profile(url)
+    store.close()
+
+def test_dedupe_keeps_first_lead_per_email_or_name_and_domain():
+    df = pd.DataFrame([
+        {"first_name": "Jane", "last_name": "Doe", "email": "jane@acme.com", "domain": "acme.com", "source": "LinkedIn"},
+        {"first_name": "Jane", "last_name": "Doe", "email": "", "domain": "acme.com", "source": "Apollo"},
+        {"first_name": "J", "last_name": "D", "email": "JANE@acme.com", "domain": "", "source": "Apollo"},
+        {"first_name": "John", "last_name": "Doe", "email": "", "domain": "acme.com", "source": "Apollo"},
+    ])
+    assert list(dedupe_leads(df)["first_name"]) == ["Jane", "John"]
+
+def test_enriched_mask_matches_per_lead_lookups(tmp_path):
+    store = LeadStore(tmp_path / "leads.db", profile_list=tmp_path / "missing.txt")
+    store.add_leads([
+        {"first_name": "Jane", "last_name": "Doe", "domain": "acme.com", "email": "jane@acme.com"},
+        {"first_name": "Bob", "last_name": "Roe", "website": "https://www.bar.io", "linkedin_url": "/sales/lead/ACw9,NAME,x"},
+    ], status=ENRICHED)
+    store.add_lead({"first_name": "Ann", "last_name": "Lee", "domain": "acme.com"})
+
+    df = pd.DataFrame([
+        {"first_name": "JANE", "last_name": "doe", "email": "", "domain": "acme.com", "website": "", "linkedin_url": ""},
+        {"first_name": "", "last_name": "", "email": "JANE@acme.com", "domain": "", "website": "", "linkedin_url": ""},
+        {"first_name": "Robert", "last_name": "Roe", "email": "", "domain": "", "website": "",
+         "linkedin_url": "https://www.linkedin.com/sales/lead/ACw9,NAME,y"},
+        {"first_name": "Bob", "last_name": "Roe", "email": "bob@bar.io", "domain": "", "website": "", "linkedin_url": ""},
+        {"first_name": "Ann", "last_name": "Lee", "email": "", "domain": "acme.com", "website": "", "linkedin_url": ""},
+        {"first_name": "Jane", "last_name": "Doe", "email": "", "domain": "other.com", "website": "", "linkedin_url": ""},
+    ])
+
+    mask = store.enriched_mask(df)
+    assert mask.tolist() == [True, True, True, True, False, False]
+    assert mask.tolist() == [store.is_enriched(lead) for lead in df.to_dict("records")]
+    store.close()
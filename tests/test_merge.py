@@ -0,0 +1,45 @@
+import pandas as pd
+
+import main
+from main import merge_dataframes, standardize_leads, find_linkedin_only_emails
+from src.SalesNav_CSVCleaner import clean_dataframe
+from src.ApolloScraper import DEFAULT_CLEAN_HEADERS
+
+def salesnav_lead(title, company, search, website):
+    return {"Name": "Jane Doe", "Title": title, "Company": company, "Email": "N/A", "Website": website,
+            "Profile URL": f"https://www.linkedin.com/sales/lead/ACw1,NAME_SEARCH,{search}"}
+
+def test_merges_cleaned_linkedin_leads_by_profile_url_and_apollo_leads_by_name():
+    # The same profile from two searches, once with a website and once with only a company name
+    linkedin = clean_dataframe(pd.DataFrame([
+        salesnav_lead("CEO", "Acme Inc", "a", "https://www.acme.com"),
+        salesnav_lead("Chief Executive Officer", "Acme Holdings", "b", "N/A"),
+    ]))
+    apollo = pd.DataFrame([["Jane", "Doe", "CEO", "jane@acme.com", "555-0100"]], columns=DEFAULT_CLEAN_HEADERS)
+
+    merged = merge_dataframes(standardize_leads(linkedin, "LinkedIn"), standardize_leads(apollo, "Apollo"))
+
+    assert merged[["first_name", "last_name", "email", "phone", "domain", "linkedin_url", "sources"]].values.tolist() == [
+        ["Jane", "Doe", "jane@acme.com", "555-0100", "acme.com",
+         "https://www.linkedin.com/sales/lead/ACw1,NAME_SEARCH,a", "LinkedIn,Apollo"],
+    ]
+
+def test_only_linkedin_records_without_an_apollo_match_go_to_snov(monkeypatch):
+    looked_up = []
+
+    def fake_find_emails(df, stage_cache=None, lead_store=None):
+        looked_up.extend(df['first_name'])
+        return df.assign(email=[f"{name.lower()}@acme.com" for name in df['first_name']])
+
+    monkeypatch.setattr(main.enrichment, "find_emails", fake_find_emails)
+    monkeypatch.setattr(main, "get_lead_store", lambda: None)
+    merged = pd.DataFrame({
+        "first_name": ["Ann", "Bob", "Cid"],
+        "email": ["", "bob@acme.com", ""],
+        "sources": ["LinkedIn", "LinkedIn,Apollo", "LinkedIn"],
+    })
+
+    result = find_linkedin_only_emails(merged)
+
+    assert looked_up == ["Ann", "Cid"]
+    assert result["email"].tolist() == ["ann@acme.com", "bob@acme.com", "cid@acme.com"]
@@ -0,0 +1,66 @@
+import json
+
+from src.utils.network_capture import SalesApiCapture, parse_search_payload
+
+SEARCH_PAYLOAD = {
+    "elements": [
+        {
+            "entityUrn": "urn:li:fs_salesProfile:(ACwAAA1,NAME_SEARCH,tok1)",
+            "firstName": "Ada",
+            "lastName": "Lovelace",
+            "fullName": "Ada Lovelace",
+            "currentPositions": [{"title": "CTO", "companyName": "Engines Ltd", "current": True}],
+        },
+        {"firstName": "No", "lastName": "Urn"},
+    ]
+}
+
+PROFILE_PAYLOAD = {
+    "entityUrn": "urn:li:fs_salesProfile:(ACwAAA1,NAME_SEARCH,tok1)",
+    "fullName": "Ada Lovelace",
+    "positions": [{"title": "CTO", "companyName": "Engines Ltd", "current": True}],
+    "contactInfo": {"emails": [{"emailAddress": "ada@engines.com"}], "websites": [{"url": "https://engines.com"}]},
+}
+
+class FakeDriver:
+    """Serves a performance log and response bodies like Chrome's DevTools protocol"""
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    def get_log(self, log_type):
+        entries = []
+        for request_id, (url, _) in self.responses.items():
+            message = {"message": {"method": "Network.responseReceived",
+                                   "params": {"requestId": request_id, "response": {"url": url}}}}
+            entries.append({"message": json.dumps(message)})
+        return entries
+
+    def execute_cdp_cmd(self, command, params):
+        return {"body": json.dumps(self.responses[params["requestId"]][1])}
+
+def test_search_payload_yields_leads_with_profile_urls():
+    leads = parse_search_payload(SEARCH_PAYLOAD)
+
+    assert leads == [{
+        "Name": "Ada Lovelace",
+        "Title": "CTO",
+        "Company": "Engines Ltd",
+        "Profile URL": "https://www.linkedin.com/sales/lead/ACwAAA1,NAME_SEARCH,tok1",
+        "Email": "N/A",
+        "Website": "N/A",
+    }]
+
+def test_capture_merges_search_and_profile_responses():
+    driver = FakeDriver({
+        "1": ("https://www.linkedin.com/sales-api/salesApiLeadSearch?q=searchQuery", SEARCH_PAYLOAD),
+        "2": ("https://www.linkedin.com/sales-api/salesApiProfiles/(profileId:ACwAAA1)", PROFILE_PAYLOAD),
+        "3": ("https://www.linkedin.com/sales-api/salesApiNotifications", {}),
+    })
+    capture = SalesApiCapture(driver)
+
+    assert capture.collect() == 2
+    lead = capture.get("https://www.linkedin.com/sales/lead/ACwAAA1,NAME_SEARCH,tok1?_ntb=abc")
+    assert lead["Email"] == "ada@engines.com"
+    assert lead["Website"] == "https://engines.com"
+    assert lead["Company"] == "Engines Ltd"
@@ -0,0 +1,60 @@
+from src.email_pattern_generator import DomainPatternModel, generate_email_patterns
+
+def test_learned_format_is_tried_first():
+    model = DomainPatternModel()
+    assert model.learn("jane.doe@acme.com", "Jane", "Doe") == "first.last"
+    assert model.learn("Bob.Roe@Acme.com", "Bob", "Roe") == "first.last"
+    assert model.learn("aleeds@acme.com", "Ann", "Leeds") == "flast"
+    # Addresses that fit no known format teach nothing
+    assert model.learn("sales@acme.com", "Sam", "Hill") is None
+
+    assert model.best_pattern("ACME.com") == "first.last"
+    assert model.best_pattern("other.com") is None
+
+    candidates = [("first", "max@acme.com"), ("flast", "mpower@acme.com"),
+                  ("first.last", "max.power@acme.com"), ("last", "power@acme.com")]
+    # Most confirmed format first, then the next; unknown formats keep their order
+    assert model.rank("acme.com", candidates) == [candidates[2], candidates[1], candidates[0], candidates[3]]
+
+    assert generate_email_patterns("Max", "Power", "acme.com", model)[:2] == ["max.power@acme.com", "mpower@acme.com"]
+    assert generate_email_patterns("Max", "Power", "other.com", model)[0] == "max@other.com"
+
+def test_catch_all_probe_skipped_for_single_leads_and_not_cached(tmp_path, monkeypatch):
+    import functools
+    import pandas as pd
+    from src import email_pattern_generator as generator
+    from src.utils import verification_cache
+    from src.utils.verification_cache import VerificationCache
+
+    class Resolver:
+        def resolve_mx(self, domain):
+            return [f"mx.{domain}"]
+
+    class Response:
+        status_code = 200
+        def __init__(self, email):
+            self.email = email
+        def json(self):
+            valid = self.email in ("jane.doe@solo.com", "max.power@acme.com", "ann.lee@acme.com")
+            return {"data": {"status": "deliverable" if valid else "invalid", "score": 90 if valid else 0}}
+
+    verified = []
+    class Client:
+        def get(self, url, params=None):
+            verified.append(params["email"])
+            return Response(params["email"])
+
+    cache = VerificationCache(tmp_path / "cache.db")
+    monkeypatch.setattr(verification_cache, "_shared_cache", cache)
+    monkeypatch.setattr(generator, "get_client", lambda name: Client())
+    monkeypatch.setattr(generator, "DomainClassifier", functools.partial(generator.DomainClassifier, resolver=Resolver()))
+
+    df = pd.DataFrame({"first_name": ["Jane", "Max", "Ann"], "last_name": ["Doe", "Power", "Lee"],
+                       "email": ["", "", ""], "domain": ["solo.com", "acme.com", "acme.com"], "company": ["", "", ""]})
+    result = generator.process_dataframe(df)
+
+    assert result["email"].tolist() == ["jane.doe@solo.com", "max.power@acme.com", "ann.lee@acme.com"]
+    probes = [email for email in verified if email.startswith("zz")]
+    # Only acme.com, with two leads to fill, is probed, and the probe isn't cached
+    assert len(probes) == 1 and probes[0].endswith("@acme.com")
+    assert cache.get(probes[0]) is None
@@ -0,0 +1,40 @@
+import random
+import time
+
+from src import scraper as scraper_module
+from src.scraper import ProfileWorkerPool
+
+class FakeScraper:
+    """Stands in for a browser session; fails on URLs containing 'broken'"""
+
+    def __init__(self, user_data_dir=None, cookie_file=None):
+        self.user_data_dir = user_data_dir
+        self.pacing = scraper_module.PacingPolicy(enabled=False)
+
+    def login(self):
+        pass
+
+    def scrape_profile(self, profile_url):
+        time.sleep(random.uniform(0, 0.02))
+        if "broken" in profile_url:
+            return None
+        return {"Profile URL": profile_url}
+
+    def log_timing(self, label):
+        pass
+
+    def cleanup(self, save_history=True):
+        pass
+
+def test_pool_returns_leads_in_input_order(monkeypatch, tmp_path):
+    monkeypatch.setattr(scraper_module, "LinkedInScraper", FakeScraper)
+    monkeypatch.setattr(scraper_module, "WORKER_PROFILE_DIR", str(tmp_path))
+    links = [f"https://www.linkedin.com/sales/lead/{i}" for i in range(12)] + ["https://www.linkedin.com/sales/lead/broken"]
+    streamed = []
+
+    pool = ProfileWorkerPool(workers=3, cookie_files=[], rate_per_minute=60000)
+    results = pool.scrape(links, on_lead=streamed.append)
+
+    assert [lead["Profile URL"] if lead else None for lead in results] == links[:-1] + [None]
+    assert len(streamed) == 12
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["worker_1", "worker_2", "worker_3"]
@@ -0,0 +1,50 @@
+import itertools
+
+import pandas as pd
+
+from src.SalesNav_CSVCleaner import (
+    clean_dataframe, clean_name, extract_role, is_business_email, extract_domain, OUTPUT_COLUMNS
+)
+
+NAMES = ["John Smith", "Dr. Jane A. Doe, MBA", "Bob 'Bobby' Lee Jr", "María José García", "N/A", "", "Cher",
+         "ALICE B. COOPER", "Tom Hanks CPA CFP", "Sam I Am", "Mike MSGB-LMOC Jones", None, "Al \"The Pal\" Capone"]
+TITLES = ["CEO", "Sales Associate", "Executive Assistant to the CEO", "Engineer", None, "Vice President, Sales"]
+EMAILS = ["john@acme.com", "jane@gmail.com", "N/A", None, "a@b", "x@Yahoo.com ", "a@b@c.com"]
+WEBSITES = ["https://www.acme.com", "N/A", None, "https://www.google.com/search?q=x", "https://me.wordpress.com",
+            "http://[bad", "linktr.ee/me"]
+COMPANIES = ["Acme Inc", "N/A", None, "Bar & Co LLC", "!!!"]
+
+def scalar_clean(df):
+    """Reference: the cleaner applied one row at a time with the scalar helpers"""
+    rows = []
+    for index, row in df.iterrows():
+        first_name, last_name = clean_name(str(row["Name"]))
+        role = extract_role(str(row["Title"]))
+        if first_name is None or last_name is None or role is None:
+            continue
+        email = row["Email"] if is_business_email(str(row["Email"])) else "N/A"
+        domain = extract_domain(str(row["Website"]), str(row["Company"]))
+        if email == "N/A" and domain is None:
+            continue
+        rows.append({"index": index, "first_name": first_name, "last_name": last_name, "Role": role,
+                     "Emails": email, "Domain": domain, "Phone": "N/A", "Misc": row["Profile URL"]})
+    return pd.DataFrame(rows, columns=["index"] + OUTPUT_COLUMNS).set_index("index")
+
+def test_vectorized_cleaner_matches_scalar_functions():
+    combos = list(itertools.product(NAMES, TITLES, EMAILS, WEBSITES[:4], COMPANIES[:3]))
+    combos += [(NAMES[0], TITLES[0], EMAILS[2], website, company) for website in WEBSITES for company in COMPANIES]
+    df = pd.DataFrame(combos, columns=["Name", "Title", "Email", "Website", "Company"])
+    df["Profile URL"] = [f"https://www.linkedin.com/sales/lead/{i}" for i in range(len(df))]
+
+    cleaned = clean_dataframe(df)
+    expected = scalar_clean(df)
+
+    assert len(cleaned) > 0
+    assert list(cleaned.index) == list(expected.index)
+    for column in OUTPUT_COLUMNS:
+        assert cleaned[column].tolist() == expected[column].tolist(), column
+
+def test_empty_after_filtering_keeps_output_columns():
+    df = pd.DataFrame([{"Name": "Cher", "Title": "CEO", "Email": "N/A", "Website": "N/A", "Company": "N/A",
+                        "Profile URL": "https://www.linkedin.com/sales/lead/1"}])
+    assert list(clean_dataframe(df).columns) == OUTPUT_COLUMNS
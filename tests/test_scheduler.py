@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+
+from src.utils.scheduler import StageScheduler, SKIPPED, FAILED
+
+def test_dependencies_receive_upstream_values():
+    scheduler = StageScheduler()
+    scheduler.add("a", lambda: 2)
+    scheduler.add("b", lambda: 3)
+    scheduler.add("sum", lambda a, b: a + b, deps=["a", "b"])
+
+    results = scheduler.run()
+
+    assert results["sum"].value == 5
+    assert results["sum"].started >= results["a"].finished
+
+def test_independent_stages_run_concurrently():
+    # Each stage waits for the other to start, which only works if they overlap
+    barrier = threading.Barrier(2, timeout=5)
+    scheduler = StageScheduler()
+    scheduler.add("linkedin", lambda: barrier.wait())
+    scheduler.add("apollo", lambda: barrier.wait())
+
+    results = scheduler.run()
+
+    assert results["linkedin"].succeeded
+    assert results["apollo"].succeeded
+
+def test_failure_skips_dependents_only():
+    def boom():
+        raise RuntimeError("scraper crashed")
+
+    scheduler = StageScheduler()
+    scheduler.add("linkedin", boom)
+    scheduler.add("apollo", lambda: "apollo.csv")
+    scheduler.add("clean", lambda csv: csv, deps=["linkedin"])
+    scheduler.add("enrich", lambda csv: csv.upper(), deps=["apollo"])
+
+    results = scheduler.run()
+
+    assert results["linkedin"].status == FAILED
+    assert results["clean"].status == SKIPPED
+    assert results["enrich"].value == "APOLLO.CSV"
+
+def test_unknown_dependency_is_rejected():
+    scheduler = StageScheduler()
+    with pytest.raises(ValueError):
+        scheduler.add("merge", lambda df: df, deps=["missing"])
@@ -0,0 +1,81 @@
+import types
+
+import pandas as pd
+
+from src import enrichment
+
+from src.utils.stage_cache import StageCache, mark_stage_error
+
+def make_stage(calls):
+    """Stage that records which rows it saw and uppercases the email column"""
+    def stage(df):
+        calls.append(list(df['email']))
+        df = df.copy()
+        df['email'] = df['email'].str.upper()
+        return df
+    return stage
+
+def test_unchanged_rows_are_served_from_cache(tmp_path):
+    cache = StageCache(cache_dir=tmp_path)
+    df = pd.DataFrame({'first_name': ['Ada', 'Alan'], 'email': ['ada@x.com', 'alan@y.com']})
+    calls = []
+
+    first = cache.run("verify", make_stage(calls), df)
+    second = cache.run("verify", make_stage(calls), df)
+
+    assert calls == [['ada@x.com', 'alan@y.com']]
+    assert list(second['email']) == list(first['email']) == ['ADA@X.COM', 'ALAN@Y.COM']
+
+def test_only_changed_rows_are_recomputed_in_input_order(tmp_path):
+    cache = StageCache(cache_dir=tmp_path)
+    calls = []
+    cache.run("verify", make_stage(calls), pd.DataFrame({'email': ['a@x.com', 'b@x.com']}))
+
+    result = cache.run("verify", make_stage(calls),
+                       pd.DataFrame({'email': ['c@x.com', 'a@x.com', 'b@x.com']}, index=[7, 8, 9]))
+
+    assert calls[-1] == ['c@x.com']
+    assert list(result['email']) == ['C@X.COM', 'A@X.COM', 'B@X.COM']
+    assert list(result.index) == [7, 8, 9]
+
+def test_config_change_invalidates_cache(tmp_path):
+    cache = StageCache(cache_dir=tmp_path)
+    df = pd.DataFrame({'email': ['a@x.com']})
+    calls = []
+
+    cache.run("verify", make_stage(calls), df, config={"code": "v1"})
+    cache.run("verify", make_stage(calls), df, config={"code": "v2"})
+
+    assert len(calls) == 2
+
+def test_rows_marked_as_errors_are_retried_next_run(tmp_path):
+    cache = StageCache(cache_dir=tmp_path)
+    df = pd.DataFrame({'email': ['a@x.com', 'b@x.com']})
+    calls = []
+
+    def flaky_stage(frame):
+        calls.append(list(frame['email']))
+        for idx, email in frame['email'].items():
+            if email == 'b@x.com' and len(calls) == 1:
+                mark_stage_error(frame, idx)
+        return frame
+
+    cache.run("verify", flaky_stage, df)
+    result = cache.run("verify", flaky_stage, df)
+
+    assert calls == [['a@x.com', 'b@x.com'], ['b@x.com']]
+    assert list(result['email']) == ['a@x.com', 'b@x.com']
+    assert 'stage_errors' not in result.attrs
+
+def test_changing_stage_settings_invalidates_cached_rows(tmp_path, monkeypatch):
+    cache = StageCache(cache_dir=tmp_path)
+    module = types.SimpleNamespace(__file__=__file__)
+    df = pd.DataFrame({'email': ['a@x.com']})
+    calls = []
+
+    enrichment.run_cached_stage("pattern", make_stage(calls), df, module, cache)
+    enrichment.run_cached_stage("pattern", make_stage(calls), df, module, cache)
+    monkeypatch.setattr(enrichment, "CATCH_ALL_PROBE_MIN_LEADS", 5)
+    enrichment.run_cached_stage("pattern", make_stage(calls), df, module, cache)
+
+    assert calls == [['a@x.com'], ['a@x.com']]
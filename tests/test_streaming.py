@@ -0,0 +1,32 @@
+import time
+import random
+
+from src import streaming
+from src.streaming import StreamingEnricher
+
+def lead(i, title="CEO"):
+    return {"Name": f"Lead{i} Person", "Title": title, "Company": "Acme Inc",
+            "Profile URL": f"https://www.linkedin.com/sales/lead/{i}", "Email": "N/A", "Website": "acme.com"}
+
+def fake_enrich(df, pattern_model=None, lead_store=None, find=True, patterns=True, verify=True):
+    # Finish out of order so the output order has to come from the sequence numbers
+    time.sleep(random.uniform(0, 0.02))
+    df = df.copy()
+    df['email'] = df['first_name'].str.lower() + "@acme.com"
+    df['Email_Verified'] = True
+    return df
+
+def test_streamed_leads_come_out_enriched_in_scrape_order(monkeypatch):
+    monkeypatch.setattr(streaming, "enrich_dataframe", fake_enrich)
+    enricher = StreamingEnricher(workers=3, queue_size=2)
+    enricher.start()
+
+    for i in range(10):
+        enricher.submit(lead(i, title="Engineer" if i == 4 else "CEO"))
+    result = enricher.close()
+
+    expected = [i for i in range(10) if i != 4]
+    assert result['linkedin_url'].tolist() == [f"https://www.linkedin.com/sales/lead/{i}" for i in expected]
+    assert result['email'].tolist() == [f"lead{i}@acme.com" for i in expected]
+    assert result['Email_Verified'].all() and (result['source'] == "LinkedIn").all()
+    assert (enricher.submitted, enricher.dropped, enricher.failed) == (10, 1, 0)
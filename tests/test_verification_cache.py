@@ -0,0 +1,61 @@
+import time
+
+from src import email_verifier, email_pattern_generator
+from src.utils import verification_cache
+from src.utils.verification_cache import VerificationCache
+
+DAY = 24 * 60 * 60
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache = VerificationCache(tmp_path / "cache.db", ttl_days=1)
+    cache.set("Jane@Acme.com ", "deliverable", 95)
+    cache.set_domain("acme.com", "normal")
+
+    assert cache.get("jane@acme.com") == ("deliverable", 95)
+    assert (cache.hits, cache.misses) == (1, 0)
+
+    now = time.time()
+    monkeypatch.setattr(verification_cache.time, "time", lambda: now + 2 * DAY)
+    assert cache.get("jane@acme.com") is None
+    assert cache.misses == 1
+    # Domain classifications keep their own, longer TTL
+    assert cache.get_domain("acme.com") == "normal"
+
+def test_evict_drops_expired_and_oldest_entries(tmp_path, monkeypatch):
+    cache = VerificationCache(tmp_path / "cache.db", ttl_days=1, max_entries=2)
+    now = time.time()
+    for offset, email in enumerate(["old@acme.com", "a@acme.com", "b@acme.com", "c@acme.com"]):
+        monkeypatch.setattr(verification_cache.time, "time", lambda t=now + offset: t)
+        cache.set(email, "deliverable", 90)
+
+    # Let the first entry expire, then evict: one expired, one overflow
+    monkeypatch.setattr(verification_cache.time, "time", lambda: now + DAY + 0.5)
+    cache.evict()
+    emails = [row[0] for row in cache._conn.execute("SELECT email FROM verifications ORDER BY email")]
+    assert emails == ["b@acme.com", "c@acme.com"]
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {"data": {"status": "deliverable", "score": 97}}
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None):
+        self.calls += 1
+        return FakeResponse()
+
+def test_verifier_and_pattern_generator_share_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(verification_cache, "_shared_cache", VerificationCache(tmp_path / "cache.db"))
+    client = CountingClient()
+    monkeypatch.setattr(email_verifier, "get_client", lambda name: client)
+    monkeypatch.setattr(email_pattern_generator, "get_client", lambda name: client)
+
+    assert email_verifier.verify_email("jane.doe@acme.com")
+    # The pattern generator reuses the verifier's result instead of calling Hunter again
+    assert email_pattern_generator.verify_email("Jane.Doe@acme.com")
+    assert email_pattern_generator.fetch_verification("jane.doe@acme.com") == ("deliverable", 97)
+    assert client.calls == 1
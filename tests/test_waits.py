@@ -0,0 +1,38 @@
+from src.utils.waits import PageWaiter
+from src.utils.pacing import PacingPolicy
+
+class FakeDriver:
+    """Returns a scripted sequence of (height, ms since last mutation) settle states"""
+
+    def __init__(self, states):
+        self.states = list(states)
+
+    def execute_script(self, script, *args):
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+def test_settled_returns_once_rows_stop_arriving():
+    driver = FakeDriver([[100, 0], [200, 0], [300, 5000]])
+    waiter = PageWaiter(driver)
+
+    height = waiter.settled(timeout=5, quiet_period=0.2)
+
+    assert height == 300
+    assert waiter.timeouts == 0
+    assert waiter.total_wait < 2
+
+def test_settled_gives_up_after_timeout():
+    driver = FakeDriver([[100, 0]])
+    waiter = PageWaiter(driver)
+
+    waiter.settled(timeout=0.3, quiet_period=0.2)
+
+    assert waiter.timeouts == 1
+
+def test_pacing_is_tracked_and_can_be_disabled():
+    pacing = PacingPolicy(delays={"profile": (0.01, 0.02)})
+    assert 0.01 <= pacing.pause("profile") <= 0.02
+    assert pacing.pause_count == 1
+
+    disabled = PacingPolicy(delays={"profile": (1, 2)}, enabled=False)
+    assert disabled.pause("profile") == 0.0
+    assert disabled.total_pause == 0.0